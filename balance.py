@@ -0,0 +1,210 @@
+# balance.py
+"""
+Monte-Carlo balance runner.
+
+Simulates many headless battles (see battle_sim.BattleSim) for every
+(party level, enemy type) cell and prints win rate, rounds to win, HP lost
+and XP/gold per battle. Work is split into chunks and spread over a
+process pool, so a full sweep uses every CPU core.
+
+    python balance.py                          # all enemy types, levels 1-20
+    python balance.py -n 100000 --levels 1-5 --enemies Slime,Bat
+    python balance.py --group-size 3 --policy attack
+"""
+
+import argparse
+import os
+import time
+from multiprocessing import Pool
+
+import battle_sim as bs
+from enemies import ENEMY_BLUEPRINTS
+
+POLICIES = {
+    "auto": bs.auto_policy,
+    "attack": bs.attack_policy,
+}
+
+CHUNK_SIZE = 2000  # battles per worker task
+STARTING_POTIONS = 3
+
+
+def simulate_chunk(task):
+    """
+    Run `count` battles for one cell and return summed stats.
+
+    task = (level, enemy_type, group_size, count, seed, policy_name)
+    Returns a dict of totals that merge_totals() can add together.
+    """
+    level, enemy_type, group_size, count, seed, policy_name = task
+    policy = POLICIES[policy_name]
+
+    totals = {
+        "battles": 0,
+        "wins": 0,
+        "losses": 0,
+        "draws": 0,
+        "win_rounds": 0,
+        "hp_lost": 0.0,
+        "xp": 0,
+        "gold": 0,
+    }
+
+    for i in range(count):
+        party = bs.create_party(level)
+        enemies = [bs.create_enemy(enemy_type, level) for _ in range(group_size)]
+        sim = bs.BattleSim(
+            party, enemies, seed=seed + i, inventory={"Potion": STARTING_POTIONS}
+        )
+        max_hp = sum(m.max_hp for m in party)
+
+        # Track HP before rewards: a level-up on victory fully heals
+        hp_left = max_hp
+
+        def track_hp(sim):
+            nonlocal hp_left
+            if sim.phase == "PARTY":
+                hp_left = sum(m.hp for m in sim.party)
+
+        winner = sim.run(policy, before_step=track_hp)
+
+        totals["battles"] += 1
+        if winner == "HERO":
+            totals["wins"] += 1
+            totals["win_rounds"] += sim.round
+            totals["xp"] += sim.xp
+            totals["gold"] += sim.gold
+            totals["hp_lost"] += (max_hp - hp_left) / max_hp
+        elif winner == "ENEMY":
+            totals["losses"] += 1
+            totals["hp_lost"] += 1.0
+        else:
+            totals["draws"] += 1
+            totals["hp_lost"] += (max_hp - sum(m.hp for m in party)) / max_hp
+
+    return (level, enemy_type), totals
+
+
+def merge_totals(into: dict, other: dict):
+    for key, value in other.items():
+        into[key] = into.get(key, 0) + value
+
+
+def build_tasks(levels, enemy_types, group_size, battles, seed, policy_name):
+    """Split every cell's `battles` into CHUNK_SIZE pieces with distinct seeds."""
+    tasks = []
+    cell_seed = seed
+    for level in levels:
+        for enemy_type in enemy_types:
+            done = 0
+            while done < battles:
+                count = min(CHUNK_SIZE, battles - done)
+                tasks.append(
+                    (level, enemy_type, group_size, count, cell_seed + done, policy_name)
+                )
+                done += count
+            cell_seed += battles
+    return tasks
+
+
+def run_sweep(levels, enemy_types, group_size=1, battles=1000, seed=0,
+              policy_name="auto", workers=None):
+    """Run the whole sweep and return {(level, enemy_type): totals}."""
+    tasks = build_tasks(levels, enemy_types, group_size, battles, seed, policy_name)
+    cells = {}
+
+    with Pool(processes=workers) as pool:
+        for key, totals in pool.imap_unordered(simulate_chunk, tasks):
+            merge_totals(cells.setdefault(key, {}), totals)
+
+    return cells
+
+
+def format_report(cells, levels, enemy_types) -> str:
+    header = (
+        f"{'Lv':>3}  {'Enemy':<15} {'Battles':>8} {'Win%':>7} "
+        f"{'Rounds':>7} {'HP lost':>8} {'XP':>7} {'Gold':>7}"
+    )
+    lines = [header, "-" * len(header)]
+
+    for level in levels:
+        for enemy_type in enemy_types:
+            t = cells[(level, enemy_type)]
+            n = t["battles"]
+            wins = t["wins"]
+            rounds = t["win_rounds"] / wins if wins else 0.0
+            lines.append(
+                f"{level:>3}  {enemy_type:<15} {n:>8} {100.0 * wins / n:>6.1f}% "
+                f"{rounds:>7.2f} {100.0 * t['hp_lost'] / n:>7.1f}% "
+                f"{t['xp'] / n:>7.1f} {t['gold'] / n:>7.1f}"
+            )
+
+    return "\n".join(lines)
+
+
+def parse_levels(text: str):
+    """'1-20' -> [1..20], '1,5,10' -> [1, 5, 10]."""
+    levels = []
+    for part in text.split(","):
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            levels.extend(range(int(lo), int(hi) + 1))
+        else:
+            levels.append(int(part))
+    return levels
+
+
+def main():
+    all_types = [bp["type"] for bp in ENEMY_BLUEPRINTS]
+
+    parser = argparse.ArgumentParser(description="Monte-Carlo combat balance sweep.")
+    parser.add_argument("-n", "--battles", type=int, default=1000,
+                        help="battles per (level, enemy) cell")
+    parser.add_argument("--levels", default="1-20", help="e.g. 1-20 or 1,5,10")
+    parser.add_argument("--enemies", default=",".join(all_types),
+                        help="comma-separated enemy types")
+    parser.add_argument("--group-size", type=int, default=1,
+                        help="enemies of the chosen type per battle")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="auto")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(),
+                        help="worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    if args.battles < 1:
+        parser.error("--battles must be at least 1")
+    if args.group_size < 1:
+        parser.error("--group-size must be at least 1")
+    try:
+        levels = parse_levels(args.levels)
+    except ValueError:
+        parser.error(f"--levels: expected e.g. 1-20 or 1,5,10, got {args.levels!r}")
+    if not levels or any(level < 1 for level in levels):
+        parser.error("--levels must all be at least 1")
+    enemy_types = [name.strip() for name in args.enemies.split(",") if name.strip()]
+    unknown = [name for name in enemy_types if name not in all_types]
+    if unknown:
+        parser.error(
+            f"unknown enemy type(s): {', '.join(unknown)} "
+            f"(choose from {', '.join(all_types)})"
+        )
+
+    start = time.perf_counter()
+    cells = run_sweep(
+        levels,
+        enemy_types,
+        group_size=args.group_size,
+        battles=args.battles,
+        seed=args.seed,
+        policy_name=args.policy,
+        workers=args.workers,
+    )
+    elapsed = time.perf_counter() - start
+
+    print(format_report(cells, levels, enemy_types))
+    total = sum(t["battles"] for t in cells.values())
+    print(f"\n{total} battles in {elapsed:.1f}s ({total / elapsed:.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# battle_log.py
+"""
+Battle message log.
+
+BattleLog keeps the whole battle's history in a fixed-capacity ring buffer
+(the oldest lines drop off once it is full), so adding a line never
+allocates a new list. The battle screen shows a window of it that can be
+scrolled back; draw() renders a line's surface the first time that line is
+on screen and reuses it until it scrolls out of view.
+"""
+
+LOG_CAPACITY = 256  # lines kept per battle
+
+
+class BattleLog:
+    """Fixed-capacity ring buffer of log lines with a scrollback view."""
+
+    def __init__(self, capacity: int = LOG_CAPACITY):
+        self.capacity = capacity
+        self._lines = [None] * capacity
+        self._count = 0  # total lines ever added; line i lives at i % capacity
+        self.scroll = 0  # lines scrolled back from the newest
+        self._surfaces = {}  # line number -> rendered surface (on-screen only)
+        self._surface_key = None  # (font, color) the cached surfaces used
+
+    def __len__(self):
+        return min(self._count, self.capacity)
+
+    def __iter__(self):
+        first = self._count - len(self)
+        for n in range(first, self._count):
+            yield self._lines[n % self.capacity]
+
+    @property
+    def total(self) -> int:
+        """Lines added since the last clear (changes whenever a line is added)."""
+        return self._count
+
+    def __getitem__(self, index):
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("log index out of range")
+        return self._lines[(self._count - size + index) % self.capacity]
+
+    def append(self, text: str):
+        self._lines[self._count % self.capacity] = text
+        self._count += 1
+        if self.scroll:
+            # Keep a scrolled-back view on the same lines
+            self.scroll = min(self.scroll + 1, len(self))
+
+    def clear(self):
+        self._lines = [None] * self.capacity
+        self._count = 0
+        self.scroll = 0
+        self._surfaces.clear()
+
+    # --- Scrollback ---
+
+    def scroll_by(self, delta: int, visible: int):
+        """Scroll `delta` lines back (positive) or forward (negative)."""
+        max_scroll = max(0, len(self) - visible)
+        self.scroll = max(0, min(max_scroll, self.scroll + delta))
+
+    def visible_range(self, visible: int):
+        """Line numbers (start, stop) shown in a window of `visible` lines."""
+        first = self._count - len(self)
+        scroll = min(self.scroll, max(0, len(self) - visible))
+        stop = self._count - scroll
+        return max(first, stop - visible), stop
+
+    # --- Drawing ---
+
+    def draw(self, surface, font, color, x, y, visible: int, line_height: int):
+        """Blit the visible window at (x, y); returns how many lines were drawn."""
+        key = (font, color)
+        if key != self._surface_key:
+            self._surfaces.clear()
+            self._surface_key = key
+
+        start, stop = self.visible_range(visible)
+        cache = self._surfaces
+        for n in [n for n in cache if n < start or n >= stop]:
+            del cache[n]
+
+        for row, n in enumerate(range(start, stop)):
+            line = cache.get(n)
+            if line is None:
+                text = self._lines[n % self.capacity]
+                line = cache[n] = font.render(text, True, color)
+            surface.blit(line, (x, y + row * line_height))
+        return stop - start
@@ -0,0 +1,1262 @@
+# battle_sim.py
+"""
+Headless battle rules and simulation.
+
+Everything here is pure Python (no pygame), so it can be imported without a
+display: the damage formulas, status effects, enemy spawning, rewards, XP
+distribution and the BattleSim object that holds the state of one battle.
+combat.py drives a BattleSim for the interactive battle screen.
+"""
+
+import batch_damage
+import game_data as gd
+import rng_streams
+from enemies import (
+    encounter_sampler,
+    get_blueprint,
+    reindex_blueprints,
+)
+from enemies import choose_action as choose_enemy_action
+from rng_streams import RNGService
+from status_effects import (
+    add_status,
+    describe_event,
+    has_status,
+    tick_group,
+)
+
+# Default streams for callers that don't bring their own rng (reseeded in
+# place by rng_streams.seed_all, so these references stay valid)
+_damage_rng = rng_streams.stream("damage")
+_status_rng = rng_streams.stream("status")
+_loot_rng = rng_streams.stream("loot")
+_encounter_rng = rng_streams.stream("encounter")
+
+
+def _discard(text):
+    """Default message sink for headless battles."""
+
+
+# --- Entity class definition ---
+class Entity:
+    """A combatant (hero or enemy).
+
+    Fixed layout: every field is declared in __slots__ so there is no
+    per-instance __dict__ and attribute access is a direct slot lookup.
+    """
+
+    __slots__ = (
+        "name",
+        "max_hp",
+        "hp",
+        "max_mp",
+        "mp",
+        "attack",
+        "magic",
+        "defense",
+        "speed",
+        "statuses",
+        "defending",
+        # Per-entity progression
+        "level",
+        "xp",
+        "xp_to_next",
+        "job",
+        # Equipment
+        "equipped_weapon",
+        "base_attack",
+        "weapon_bonus",
+        "weapon_name",
+        # Enemy rewards
+        "xp_value",
+        "gold_min",
+        "gold_max",
+        "drops",
+        # Per-battle performance counters
+        "battle_damage_dealt",
+        "battle_damage_taken",
+        "battle_kills",
+        "battle_status_inflicted",
+    )
+
+    def __init__(self, name, max_hp, max_mp, attack, magic, defense, speed):
+        self.name = name
+        self.max_hp = max_hp
+        self.hp = max_hp
+        self.max_mp = max_mp
+        self.mp = max_mp
+        self.attack = attack
+        self.magic = magic
+        self.defense = defense
+        self.speed = speed
+
+        self.statuses = {}  # name -> status_effects.Status
+        self.defending = False
+
+        # Per-entity progression
+        self.level = 1
+        self.xp = 0
+        self.xp_to_next = 20
+        self.job = "Hero"  # Default job
+
+        # Equipment (base_attack is cached the first time a weapon is synced)
+        self.equipped_weapon = None
+        self.base_attack = None
+        self.weapon_bonus = 0
+        self.weapon_name = None
+
+        # Enemy rewards (party members keep the defaults)
+        self.xp_value = 5
+        self.gold_min = 1
+        self.gold_max = 3
+        self.drops = ()
+
+        # Per-battle performance counters
+        self.battle_damage_dealt = 0
+        self.battle_damage_taken = 0
+        self.battle_kills = 0
+        self.battle_status_inflicted = 0
+
+    def is_alive(self):
+        return self.hp > 0
+
+    def __repr__(self):
+        return f"<Entity {self.name} HP {self.hp}/{self.max_hp}>"
+
+    def clone(self):
+        """A copy with its own (empty) status dict; other fields are shared."""
+        # Spelled out (rather than looping over __slots__) because this is the
+        # enemy spawn path; keep in step with __slots__ above.
+        e = Entity.__new__(Entity)
+        e.name = self.name
+        e.max_hp = self.max_hp
+        e.hp = self.hp
+        e.max_mp = self.max_mp
+        e.mp = self.mp
+        e.attack = self.attack
+        e.magic = self.magic
+        e.defense = self.defense
+        e.speed = self.speed
+        e.defending = self.defending
+        e.level = self.level
+        e.xp = self.xp
+        e.xp_to_next = self.xp_to_next
+        e.job = self.job
+        e.equipped_weapon = self.equipped_weapon
+        e.base_attack = self.base_attack
+        e.weapon_bonus = self.weapon_bonus
+        e.weapon_name = self.weapon_name
+        e.xp_value = self.xp_value
+        e.gold_min = self.gold_min
+        e.gold_max = self.gold_max
+        e.drops = self.drops
+        e.battle_damage_dealt = self.battle_damage_dealt
+        e.battle_damage_taken = self.battle_damage_taken
+        e.battle_kills = self.battle_kills
+        e.battle_status_inflicted = self.battle_status_inflicted
+        e.statuses = {}
+        return e
+
+
+SKILLS = [
+    # ===== HERO SKILLS =====
+    {
+        "name": "Power Slash",
+        "user": "Hero",
+        "level_req": 2,
+        "mp_cost": 4,
+        "target": "single",
+        "type": "physical",
+        "mult": 1.6,
+        "hits": 1,
+        "lifesteal": 0.0,
+        "execute_threshold": None,
+        "execute_mult": 1.0,
+        "desc": "Heavy physical strike to one foe.",
+    },
+    {
+        "name": "Shield Breaker",
+        "user": "Hero",
+        "level_req": 4,
+        "mp_cost": 5,
+        "target": "single",
+        "type": "physical",
+        "mult": 1.4,
+        "hits": 1,
+        "lifesteal": 0.0,
+        "execute_threshold": None,
+        "execute_mult": 1.0,
+        "inflict": "Weaken",
+        "inflict_chance": 0.7,
+        "status_power": 0,
+        "status_duration": 3,
+        "desc": "Strike that weakens the foe's attacks.",
+    },
+    {
+        "name": "Shadow Step",
+        "user": "Hero",
+        "level_req": 8,
+        "mp_cost": 6,
+        "target": "single",
+        "type": "physical",
+        "mult": 1.4,
+        "hits": 2,
+        "lifesteal": 0.0,
+        "execute_threshold": None,
+        "execute_mult": 1.0,
+        "desc": "Quick precise strikes, hits twice.",
+    },
+    {
+        "name": "Dragon Fang",
+        "user": "Hero",
+        "level_req": 13,
+        "mp_cost": 9,
+        "target": "single",
+        "type": "physical",
+        "mult": 2.2,
+        "hits": 1,
+        "lifesteal": 0.0,
+        "execute_threshold": 0.30,  # extra damage below 30% HP
+        "execute_mult": 2.0,
+        "desc": "Ferocious finisher, stronger on weakened foes.",
+    },
+    # ===== WARRIOR SKILLS =====
+    {
+        "name": "Cleave",
+        "user": "Warrior",
+        "level_req": 3,
+        "mp_cost": 4,
+        "target": "all",
+        "type": "physical",
+        "mult": 1.1,
+        "hits": 1,
+        "lifesteal": 0.0,
+        "execute_threshold": None,
+        "execute_mult": 1.0,
+        "desc": "Wide swing that hits all enemies.",
+    },
+    {
+        "name": "Guard Stance",
+        "user": "Warrior",
+        "level_req": 5,
+        "mp_cost": 3,
+        "target": "single",
+        "type": "physical",
+        "mult": 0.0,
+        "hits": 0,
+        "lifesteal": 0.0,
+        "execute_threshold": None,
+        "execute_mult": 1.0,
+        "inflict": "Weaken",
+        "inflict_chance": 0.0,
+        "status_power": 0,
+        "status_duration": 0,
+        "desc": "Focus on defense (use Defend command instead for now).",
+    },
+    {
+        "name": "Blood Wave",
+        "user": "Warrior",
+        "level_req": 7,
+        "mp_cost": 8,
+        "target": "all",
+        "type": "magic",  # dark physical-ish magic
+        "mult": 1.3,
+        "hits": 1,
+        "lifesteal": 0.25,
+        "execute_threshold": None,
+        "execute_mult": 1.0,
+        "inflict": "Bleed",
+        "inflict_chance": 0.9,
+        "status_power": 4,
+        "status_duration": 3,
+        "desc": "Crimson wave that bleeds all foes and restores some HP.",
+    },
+    {
+        "name": "War Cry",
+        "user": "Warrior",
+        "level_req": 11,
+        "mp_cost": 6,
+        "target": "all",
+        "type": "magic",
+        "mult": 0.0,
+        "hits": 0,
+        "lifesteal": 0.0,
+        "execute_threshold": None,
+        "execute_mult": 1.0,
+        "inflict": "Weaken",
+        "inflict_chance": 0.8,
+        "status_power": 0,
+        "status_duration": 3,
+        "desc": "Battle roar that weakens enemies' attacks.",
+    },
+    # ===== MAGE SKILLS =====
+    {
+        "name": "Soul Flame",
+        "user": "Mage",
+        "level_req": 2,
+        "mp_cost": 5,
+        "target": "single",
+        "type": "magic",
+        "mult": 1.8,
+        "hits": 1,
+        "lifesteal": 0.0,
+        "execute_threshold": None,
+        "execute_mult": 1.0,
+        "inflict": "Poison",
+        "inflict_chance": 0.8,
+        "status_power": 3,
+        "status_duration": 3,
+        "desc": "Flame that burns and poisons a target.",
+    },
+    {
+        "name": "Frost Lance",
+        "user": "Mage",
+        "level_req": 4,
+        "mp_cost": 6,
+        "target": "single",
+        "type": "magic",
+        "mult": 1.9,
+        "hits": 1,
+        "lifesteal": 0.0,
+        "execute_threshold": None,
+        "execute_mult": 1.0,
+        "desc": "Piercing ice strike with high damage.",
+    },
+    {
+        "name": "Nightfall",
+        "user": "Mage",
+        "level_req": 7,
+        "mp_cost": 10,
+        "target": "all",
+        "type": "magic",
+        "mult": 1.5,
+        "hits": 1,
+        "lifesteal": 0.0,
+        "execute_threshold": None,
+        "execute_mult": 1.0,
+        "inflict": "Weaken",
+        "inflict_chance": 0.6,
+        "status_power": 0,
+        "status_duration": 3,
+        "desc": "Darkness falls, sometimes weakening all foes.",
+    },
+    {
+        "name": "Crimson Eclipse",
+        "user": "Mage",
+        "level_req": 12,
+        "mp_cost": 16,
+        "target": "all",
+        "type": "magic",
+        "mult": 2.1,
+        "hits": 1,
+        "lifesteal": 0.4,
+        "execute_threshold": None,
+        "execute_mult": 1.0,
+        "inflict": "Curse",
+        "inflict_chance": 0.5,
+        "status_power": 0,
+        "status_duration": 3,
+        "desc": "Devastating spell that may curse and heals the caster.",
+    },
+]
+
+
+# --- Equipment helpers ---
+
+
+def is_weapon_item(item_id: str) -> bool:
+    """Check if an item_id is a weapon."""
+    data = gd.ITEMS.get(item_id)
+    return bool(data and data.get("type") == "weapon")
+
+
+def get_weapon_attack_bonus(item_id: str) -> int:
+    """Get the attack bonus from a weapon item."""
+    data = gd.ITEMS.get(item_id)
+    if not data:
+        return 0
+    return int(data.get("attack_bonus", 0))
+
+
+def get_weapon_magic_bonus(item_id: str) -> int:
+    """Get the magic bonus from a weapon item."""
+    data = gd.ITEMS.get(item_id)
+    if not data:
+        return 0
+    return int(data.get("magic_bonus", 0))
+
+
+def get_equipped_weapon(actor) -> str | None:
+    """Return currently equipped weapon item_id or None."""
+    return getattr(actor, "equipped_weapon", None)
+
+
+def equip_weapon(actor, new_item_id: str | None):
+    """
+    Equip a new weapon on this actor.
+
+    - Removes the old weapon's ATK/MAG bonus from stats.
+    - Adds the new weapon's ATK/MAG bonus.
+    - Sets actor.equipped_weapon = new_item_id.
+    """
+    if new_item_id is not None and not is_weapon_item(new_item_id):
+        # Not actually a weapon; ignore.
+        return
+
+    current = get_equipped_weapon(actor)
+    if current == new_item_id:
+        return  # nothing to change
+
+    # Remove old bonuses
+    if current is not None:
+        actor.attack -= get_weapon_attack_bonus(current)
+        actor.magic -= get_weapon_magic_bonus(current)
+
+    # Add new bonuses
+    if new_item_id is not None:
+        actor.attack += get_weapon_attack_bonus(new_item_id)
+        actor.magic += get_weapon_magic_bonus(new_item_id)
+
+    actor.equipped_weapon = new_item_id
+
+
+# --- Party creation ---
+
+# name, job, stats, starting weapon
+PARTY_TEMPLATE = [
+    ("Hero", "Hero", dict(max_hp=100, max_mp=30, attack=12, magic=8, defense=5, speed=10), "Bronze Sword"),
+    ("Warrior", "Warrior", dict(max_hp=80, max_mp=20, attack=15, magic=6, defense=4, speed=9), "Bronze Axe"),
+    ("Mage", "Mage", dict(max_hp=70, max_mp=40, attack=8, magic=14, defense=3, speed=11), "Wooden Staff"),
+]
+
+
+def create_party(level: int = 1):
+    """Build a fresh [Hero, Warrior, Mage] party at `level` with starting weapons."""
+    members = []
+    for name, job, stats, weapon in PARTY_TEMPLATE:
+        m = Entity(name, **stats)
+        m.job = job
+        m.xp_to_next = 10
+        equip_weapon(m, weapon)
+
+        # Fast-forward to the requested level using the normal curve
+        while m.level < level:
+            m.level += 1
+            m.xp_to_next += 10
+            if job == "Hero":
+                _apply_level_up_stats(m)
+        m.hp = m.max_hp
+        m.mp = m.max_mp
+
+        members.append(m)
+    return members
+
+
+def get_actor_skills(actor: Entity):
+    """Return all skills this actor is allowed to use (ignoring level)."""
+    job = getattr(actor, "job", "Hero")
+    available = []
+    for s in SKILLS:
+        user = s.get("user", "Any")
+        if user in ("Any", job):
+            available.append(s)
+    return available
+
+
+def _apply_level_up_stats(actor: Entity):
+    """Stat growth for one level (only the Hero's stats grow)."""
+    actor.max_hp += 10
+    actor.max_mp += 3
+    actor.attack += 4
+    actor.magic += 3
+    actor.defense += 2
+
+
+def level_up_if_needed(actor: Entity, say=_discard):
+    """
+    Check if this actor should level up based on their own XP.
+    Only the main Hero gets stat increases; others just unlock skills.
+    """
+    leveled_up = False
+
+    while actor.xp >= actor.xp_to_next:
+        actor.xp -= actor.xp_to_next
+        actor.level += 1
+        actor.xp_to_next += 10  # simple curve
+
+        # Only Hero's stats grow
+        is_hero = actor.job == "Hero"
+        if is_hero:
+            _apply_level_up_stats(actor)
+
+        # Full heal on level-up
+        actor.hp = actor.max_hp
+        actor.mp = actor.max_mp
+
+        say(f"{actor.name} reached level {actor.level}!")
+        if is_hero:
+            say("Hero's stats increased and HP/MP restored!")
+        else:
+            say("HP/MP restored!")
+
+        leveled_up = True
+
+    return leveled_up
+
+
+# --- Damage formulas ---
+
+
+def calculate_physical_damage(
+    attacker: Entity, defender: Entity, rng=_damage_rng
+) -> int:
+    base = attacker.attack + rng.randint(-2, 2)
+
+    # Non-damage status: Weaken reduces outgoing physical damage
+    if has_status(attacker, "Weaken"):
+        base = int(base * 0.6)  # 40% reduction
+
+    mitigated = base - defender.defense
+
+    if defender.defending:
+        mitigated = mitigated // 2
+
+    return max(1, mitigated)
+
+
+def calculate_magic_damage(
+    attacker: Entity, defender: Entity, rng=_damage_rng
+) -> int:
+    base = attacker.magic + rng.randint(-3, 3)
+
+    # Weaken + Curse both hurt magic damage
+    if has_status(attacker, "Weaken"):
+        base = int(base * 0.7)
+    if has_status(attacker, "Curse"):
+        base = int(base * 0.7)
+
+    mitigated = base - defender.defense // 2
+    return max(3, mitigated)
+
+
+# --- Status effect helpers ---
+
+
+def process_statuses(group, say=_discard):
+    """Tick statuses on every living entity in `group` (damage over time, etc.)."""
+    for event in tick_group(group):
+        say(describe_event(event))
+
+
+def maybe_apply_status_from_skill(
+    skill: dict, target: Entity, source: Entity = None, rng=_status_rng, say=_discard
+):
+    """Roll chance to apply a status from a skill to a target.
+
+    If `source` is provided, increment its `battle_status_inflicted` counter
+    when the status is successfully applied.
+    """
+    if target is None or not target.is_alive():
+        return
+
+    name = skill.get("inflict")
+    if not name:
+        return
+
+    chance = skill.get("inflict_chance", 0.0)
+    duration = skill.get("status_duration", 0)
+    power = skill.get("status_power", 0)
+
+    if duration <= 0 or chance <= 0.0:
+        return
+
+    if rng.random() <= chance:
+        add_status(target, name, duration, power)
+        say(f"{target.name} is afflicted with {name.lower()}!")
+        if source is not None:
+            source.battle_status_inflicted += 1
+
+
+# --- Enemy factory ---
+
+# (enemy_type, level) -> scaled prototype Entity; spawning clones these
+_enemy_prototypes = {}
+
+
+def _build_enemy(enemy_type: str, level: int) -> Entity:
+    """Build a fresh enemy from its blueprint and scale it to `level`."""
+    bp = get_blueprint(enemy_type)
+    max_hp, max_mp, attack, magic, defense, speed = bp["stats"]
+
+    e = Entity(bp["type"], max_hp, max_mp, attack, magic, defense, speed)
+    e.xp_value = bp["xp"]
+    e.gold_min, e.gold_max = bp["gold"]
+    e.drops = tuple(bp["drops"])
+
+    # --- Scale enemy by Hero's level so they don't fall behind ---
+    scale = max(0, level - 1)  # no bonus at level 1
+    if scale > 0:
+        e.max_hp += 5 * scale
+        e.hp = e.max_hp
+        e.attack += 1 * scale
+        e.defense += 1 * (scale // 2)
+
+    return e
+
+
+def create_enemy(enemy_type: str, level: int = 1) -> Entity:
+    """Spawn an enemy of `enemy_type` scaled to the party's `level`.
+
+    The scaled stats are built once per (type, level) and cloned afterwards.
+    """
+    key = (enemy_type, level)
+    proto = _enemy_prototypes.get(key)
+    if proto is None:
+        proto = _enemy_prototypes[key] = _build_enemy(enemy_type, level)
+    return proto.clone()
+
+
+def clear_enemy_cache():
+    """Forget cached prototypes (call after editing enemies.ENEMY_BLUEPRINTS)."""
+    _enemy_prototypes.clear()
+    reindex_blueprints()
+
+
+def pick_enemy_group(level: int = 1, rng=_encounter_rng):
+    """Choose a random group of 1–3 enemies, gated by hero level."""
+    sampler = encounter_sampler(level)
+
+    # Random group size between 1 and 3
+    group_size = rng.randint(1, 3)
+    return [create_enemy(sampler.draw(rng), level) for _ in range(group_size)]
+
+
+def pick_enemy_groups(level: int, count: int, rng=_encounter_rng):
+    """Pre-draw `count` encounters at `level` as lists of enemy type names.
+
+    Only the types are drawn; spawn with create_enemy() when a fight starts.
+    (For NumPy-sized batches use encounter_sampler(level).table.draw_many.)
+    """
+    sampler = encounter_sampler(level)
+    types = sampler.types
+    draw = sampler.table.draw
+    rand = rng.random
+
+    groups = []
+    for _ in range(count):
+        group_size = 1 + int(rand() * 3)
+        groups.append([types[draw(rng)] for _ in range(group_size)])
+    return groups
+
+
+# --- Rewards ---
+
+
+def grant_rewards_for_group(group, rng=_loot_rng):
+    """Compute total XP, gold, and item drops for a defeated enemy group."""
+    total_xp = 0
+    total_gold = 0
+    drops = []
+
+    for e in group:
+        total_xp += e.xp_value
+
+        gmin = e.gold_min
+        gmax = max(gmin, e.gold_max)
+        total_gold += rng.randint(gmin, gmax)
+
+        for item_id, chance in e.drops:
+            if rng.random() <= chance:
+                drops.append(item_id)
+
+    return total_xp, total_gold, drops
+
+
+def distribute_xp_among_party(members, total_xp: int, say=_discard):
+    """Distribute `total_xp` to the living `members` using an
+    80/20 split: 80% baseline evenly among living members, 20% as a
+    performance bonus (damage dealt, kills, statuses inflicted).
+
+    Returns the per-member results sorted by performance score (MVP first).
+    """
+    living = [m for m in members if m.is_alive()]
+    if not living:
+        return []
+
+    baseline = int(total_xp * 0.8)
+    bonus_pool = total_xp - baseline
+
+    base_share = baseline // len(living)
+    base_remainder = baseline - base_share * len(living)
+
+    # Compute performance scores
+    scores = []
+    total_score = 0
+    for m in living:
+        score = (
+            m.battle_damage_dealt
+            + m.battle_kills * 15
+            + m.battle_status_inflicted * 8
+        )
+        scores.append(score)
+        total_score += score
+
+    # Allocate XP
+    results = []
+    # Pre-calc bonus shares (may be zero if nobody scored)
+    bonus_shares = [0] * len(living)
+    if total_score > 0 and bonus_pool > 0:
+        for i, s in enumerate(scores):
+            bonus_shares[i] = int(bonus_pool * (s / total_score))
+
+        # Fix rounding remainder by giving to highest scorers
+        assigned = sum(bonus_shares)
+        remain = bonus_pool - assigned
+        if remain > 0:
+            idxs = sorted(range(len(living)), key=lambda i: scores[i], reverse=True)
+            for j in range(remain):
+                bonus_shares[idxs[j % len(idxs)]] += 1
+
+    for i, m in enumerate(living):
+        # Snapshot BEFORE awarding XP so we can animate correctly
+        level_before = m.level
+        xp_before = m.xp
+        xp_to_next_before = m.xp_to_next
+
+        xp_gain = base_share + (1 if i < base_remainder else 0) + bonus_shares[i]
+
+        m.xp += xp_gain
+        level_up_if_needed(m, say)
+
+        results.append(
+            {
+                "name": m.name,
+                "xp": xp_gain,
+                "level_before": level_before,
+                "level_after": m.level,
+                "score": scores[i],
+                "xp_before": xp_before,
+                "xp_to_next_before": xp_to_next_before,
+            }
+        )
+
+    # Sort by performance score (MVP at top)
+    return sorted(results, key=lambda r: r["score"], reverse=True)
+
+
+def _track_hit(source: Entity, target: Entity, dmg: int):
+    """Update per-battle performance counters after `source` hits `target`."""
+    source.battle_damage_dealt += dmg
+    target.battle_damage_taken += dmg
+    if target.hp == 0:
+        source.battle_kills += 1
+
+
+def reset_for_battle(members):
+    """Restore HP/MP and clear per-battle counters on every member."""
+    for member in members:
+        member.hp = member.max_hp
+        member.mp = member.max_mp
+        member.defending = False
+        member.statuses.clear()
+        member.battle_damage_dealt = 0
+        member.battle_damage_taken = 0
+        member.battle_kills = 0
+        member.battle_status_inflicted = 0
+
+
+# --- Battle simulation ---
+
+MAGIC_COST = 5  # MP cost of the basic "Magic" command (Fire)
+RUN_CHANCE = 0.5
+MAX_ROUNDS = 200  # run() calls the battle a DRAW after this many rounds
+
+
+class BattleSim:
+    """
+    One battle's state, steppable without a display.
+
+    party / enemies are lists of Entity objects (mutated in place).
+    phase is "PARTY" (waiting on party member `current`), "ENEMY" or "END".
+    winner is None while the battle runs, then "HERO", "ENEMY", "ESCAPE"
+    (or "DRAW" if run() hits its round limit).
+
+    seed / rng: the battle's rng_streams.RNGService (built from `seed`, or a
+    random seed, when not given). Damage, status, loot and battle rolls each
+    use their own stream, so the same seed and the same party choices replay
+    the battle exactly; self.seed records the master seed.
+
+    on_message(text) receives every battle-log line.
+    on_damage(enemy, amount) fires whenever a party member damages an enemy.
+    on_action(actor_index, choice, target, arg) fires before each party
+    command is resolved (used by replay.BattleRecorder).
+
+    Raises ValueError if there are no enemies: the party would have nothing
+    to act on and the battle could never end.
+    """
+
+    def __init__(
+        self,
+        party,
+        enemies,
+        seed=None,
+        rng=None,
+        inventory=None,
+        on_message=None,
+        on_damage=None,
+        on_action=None,
+    ):
+        if not enemies:
+            raise ValueError("a battle needs at least one enemy")
+        self.party = party
+        self.enemies = enemies
+        # One RNGService per battle; each kind of roll has its own stream
+        self.rngs = rng if rng is not None else RNGService(seed)
+        self.seed = self.rngs.master_seed
+        self.damage_rng = self.rngs.damage
+        self.status_rng = self.rngs.status
+        self.loot_rng = self.rngs.loot
+        self.battle_rng = self.rngs.battle
+        self.inventory = inventory if inventory is not None else {}
+        self.say = on_message or _discard
+        self.on_damage = on_damage
+        self.on_action = on_action
+
+        self.phase = "PARTY"
+        self.winner = None
+        self.round = 1
+        self.turns = 0  # party actions taken
+        self.acted = set()
+        self.current = 0
+
+        # Filled in on victory
+        self.xp = 0
+        self.gold = 0
+        self.drops = []
+        self.results = []
+
+        self._start_round()
+
+    # --- queries ---
+
+    def living_party(self):
+        return [m for m in self.party if m.is_alive()]
+
+    def living_enemies(self):
+        return [e for e in self.enemies if e.is_alive()]
+
+    def first_alive_enemy(self):
+        for e in self.enemies:
+            if e.is_alive():
+                return e
+        return None
+
+    def active_member(self):
+        return self.party[self.current]
+
+    def is_over(self) -> bool:
+        return self.winner is not None
+
+    # --- flow ---
+
+    def _start_round(self):
+        """Hand the turn to the first living party member."""
+        self.acted.clear()
+        for i, m in enumerate(self.party):
+            if m.is_alive():
+                self.current = i
+                break
+        self.phase = "PARTY"
+
+    def _end(self, winner: str):
+        self.winner = winner
+        self.phase = "END"
+
+    def _advance_turn(self, last_index: int):
+        """Move to the next living member who hasn't acted, else to the enemies."""
+        self.acted.add(last_index)
+
+        for offset in range(1, len(self.party) + 1):
+            idx = (last_index + offset) % len(self.party)
+            if self.party[idx].is_alive() and idx not in self.acted:
+                self.current = idx
+                self.phase = "PARTY"
+                return
+
+        self.acted.clear()
+        self.phase = "ENEMY"
+
+    def _hit(self, actor: Entity, target: Entity, dmg: int):
+        target.hp = max(0, target.hp - dmg)
+        if self.on_damage is not None:
+            self.on_damage(target, dmg)
+        _track_hit(actor, target, dmg)
+
+    # --- party actions ---
+
+    def hero_action(self, actor: Entity, choice: str, target=None, arg=None):
+        """
+        Resolve one party member's command.
+
+        choice: "Attack", "Magic", "SKILL", "ITEM", "Defend" or "Run".
+        arg: the skill dict for "SKILL", the item_id for "ITEM".
+        """
+        if self.phase == "END":
+            return
+
+        say = self.say
+        rng = self.damage_rng
+        actor_idx = self.party.index(actor)
+        self.turns += 1
+        if self.on_action is not None:
+            self.on_action(actor_idx, choice, target, arg)
+
+        # If this hero is stunned, they lose their turn
+        if has_status(actor, "Stun"):
+            say(f"{actor.name} is stunned and can't move!")
+            actor.defending = False
+
+            # Still tick enemy statuses, then move turn forward
+            process_statuses(self.enemies, say)
+            self._advance_turn(actor_idx)
+            return
+
+        if choice in ("Attack", "Magic") and target is None:
+            target = self.first_alive_enemy()
+            if target is None:
+                return  # no enemies to hit
+
+        if choice == "Attack":
+            dmg = calculate_physical_damage(actor, target, rng)
+            say(f"{actor.name} attacks {target.name} for {dmg} damage!")
+            self._hit(actor, target, dmg)
+            actor.defending = False
+
+        elif choice == "Magic":
+            if actor.mp < MAGIC_COST:
+                say(f"{actor.name} tried to cast a spell, but is out of MP!")
+            else:
+                actor.mp -= MAGIC_COST
+                dmg = calculate_magic_damage(actor, target, rng)
+                say(f"{actor.name} casts Fire on {target.name} for {dmg} damage!")
+                self._hit(actor, target, dmg)
+            actor.defending = False
+
+        elif choice == "SKILL":
+            self._use_skill(actor, arg, target)
+            actor.defending = False
+
+        elif choice == "ITEM":
+            if arg is None:
+                say("No item selected.")
+            else:
+                # the turn is consumed whether or not the item did anything
+                self.use_item(actor, arg, target if target is not None else actor)
+            actor.defending = False
+
+        elif choice == "Defend":
+            actor.defending = True
+            say(f"{actor.name} braces for impact!")
+
+        elif choice == "Run":
+            if self.battle_rng.random() < RUN_CHANCE:
+                say(f"{actor.name} successfully escaped!")
+                self._end("ESCAPE")
+                return
+            say(f"{actor.name} tried to run, but couldn't escape!")
+            actor.defending = False
+
+        # After the hero acts, tick enemy status effects
+        process_statuses(self.enemies, say)
+
+        if not self.living_enemies():
+            self._victory()
+            return
+
+        self._advance_turn(actor_idx)
+
+    def _use_skill(self, actor: Entity, skill, target):
+        say = self.say
+        rng = self.damage_rng
+
+        if skill is None:
+            say("No skill selected.")
+            return
+        if actor.level < skill["level_req"]:
+            # Skill unlocks are based on the acting character's level
+            say(f"{actor.name} hasn't learned {skill['name']} yet!")
+            return
+        if actor.mp < skill["mp_cost"]:
+            say(f"Not enough MP to use {skill['name']}!")
+            return
+
+        actor.mp -= skill["mp_cost"]
+
+        hits = skill.get("hits", 1)
+        lifesteal_frac = skill.get("lifesteal", 0.0)
+        exec_thresh = skill.get("execute_threshold", None)
+        exec_mult = skill.get("execute_mult", 1.0)
+
+        def base_damage(e):
+            if skill["type"] == "physical":
+                return calculate_physical_damage(actor, e, rng)
+            return calculate_magic_damage(actor, e, rng)
+
+        def skill_damage(e, base):
+            # Execute bonus
+            if exec_thresh is not None and e.max_hp > 0:
+                if e.hp / e.max_hp <= exec_thresh:
+                    base = int(base * exec_mult)
+
+            return int(base * skill["mult"])
+
+        total_damage_done = 0
+
+        # --- AoE skills: hit all living enemies once ---
+        if skill["target"] == "all":
+            targets = self.living_enemies()
+            # One batch call for every target's base damage
+            bases = batch_damage.damage_for_targets(actor, targets, skill["type"], rng)
+
+            for e, base in zip(targets, bases):
+                dmg = skill_damage(e, base)
+                total_damage_done += dmg
+                say(f"{actor.name} uses {skill['name']} on {e.name} for {dmg} damage!")
+                self._hit(actor, e, dmg)
+                maybe_apply_status_from_skill(skill, e, actor, self.status_rng, say)
+
+        else:
+            # --- Single-target skills (support multi-hit) ---
+            for hit in range(hits):
+                if target is None or not target.is_alive():
+                    target = self.first_alive_enemy()
+                    if target is None:
+                        break  # nobody left to hit
+
+                dmg = skill_damage(target, base_damage(target))
+                total_damage_done += dmg
+
+                if hits > 1:
+                    say(
+                        f"{actor.name}'s {skill['name']} hits {target.name} "
+                        f"for {dmg} damage! (hit {hit + 1})"
+                    )
+                else:
+                    say(
+                        f"{actor.name} uses {skill['name']} on {target.name} "
+                        f"for {dmg} damage!"
+                    )
+
+                self._hit(actor, target, dmg)
+                # apply status on each hit/target
+                maybe_apply_status_from_skill(skill, target, actor, self.status_rng, say)
+
+        # --- Lifesteal healing ---
+        if lifesteal_frac > 0 and total_damage_done > 0:
+            heal = int(total_damage_done * lifesteal_frac)
+            if heal > 0:
+                old_hp = actor.hp
+                actor.hp = min(actor.max_hp, actor.hp + heal)
+                actual = actor.hp - old_hp
+                if actual > 0:
+                    say(f"{actor.name} absorbs {actual} HP!")
+
+    def use_item(self, user: Entity, item_id: str, target: Entity) -> bool:
+        """Apply an item from self.inventory. Returns True if it was used up."""
+        say = self.say
+
+        if self.inventory.get(item_id, 0) <= 0:
+            say("No more of that item!")
+            return False
+
+        item = gd.ITEMS.get(item_id)
+        if not item:
+            say("Nothing happens...")
+            return False
+
+        name = item.get("name", item_id)
+        hp_restore = item.get("hp_restore", 0)
+        mp_restore = item.get("mp_restore", 0)
+
+        # Check if target is valid
+        if not target.is_alive():
+            say(f"{target.name} cannot use items right now.")
+            return False
+
+        # Apply HP restoration
+        if hp_restore > 0:
+            old_hp = target.hp
+            target.hp = min(target.max_hp, target.hp + hp_restore)
+            healed = target.hp - old_hp
+
+            if healed <= 0:
+                say(f"{target.name} is already at full HP.")
+                # Still consume the item even if no healing occurred
+
+            say(f"{user.name} uses {name} on {target.name}, restoring {healed} HP!")
+
+        # Apply MP restoration
+        if mp_restore > 0:
+            old_mp = target.mp
+            target.mp = min(target.max_mp, target.mp + mp_restore)
+            restored = target.mp - old_mp
+
+            if restored > 0:
+                say(f"{target.name} restored {restored} MP!")
+
+        # If item does nothing
+        if hp_restore == 0 and mp_restore == 0:
+            say(f"{user.name} uses {name}, but nothing special happens...")
+
+        # Consume 1 item
+        qty = self.inventory[item_id] - 1
+        if qty <= 0:
+            self.inventory.pop(item_id, None)
+        else:
+            self.inventory[item_id] = qty
+
+        return True
+
+    def _victory(self):
+        say = self.say
+        say("All enemies are defeated!")
+
+        self.xp, self.gold, self.drops = grant_rewards_for_group(self.enemies, self.loot_rng)
+        say(f"Party gains {self.xp} XP!")
+        if self.gold > 0:
+            say(f"Found {self.gold} G!")
+
+        if self.drops:
+            names = [gd.ITEMS[i]["name"] if i in gd.ITEMS else i for i in self.drops]
+            say("Loot: " + ", ".join(names))
+
+        self.results = distribute_xp_among_party(self.party, self.xp, say)
+        self._end("HERO")
+
+    # --- enemy actions ---
+
+    def enemy_phase(self):
+        """Each alive enemy acts in turn, then a new round begins."""
+        if self.phase == "END":
+            return
+
+        say = self.say
+        rng = self.battle_rng
+
+        for e in self.enemies:
+            if not e.is_alive():
+                continue
+
+            living = self.living_party()
+            if not living:
+                break
+
+            # If an enemy is stunned, they lose their action
+            if has_status(e, "Stun"):
+                say(f"{e.name} is stunned and cannot act!")
+                continue
+
+            # pick a random living party member to target
+            target = rng.choice(living)
+
+            self._enemy_act(e, target, choose_enemy_action(e.name, rng))
+
+        # After all enemies act, tick party status effects (poison, bleed, etc.)
+        process_statuses(self.party, say)
+
+        # Reset defending after enemy phase
+        for member in self.party:
+            member.defending = False
+
+        if not self.living_party():
+            say("The party has fallen...")
+            self._end("ENEMY")
+        else:
+            self.round += 1
+            self._start_round()
+
+    def _enemy_act(self, e: Entity, target: Entity, action):
+        """Carry out one compiled enemies.EnemyAction."""
+        if action.damage is not None:
+            if action.damage == "physical":
+                dmg = calculate_physical_damage(e, target, self.damage_rng)
+            else:
+                dmg = calculate_magic_damage(e, target, self.damage_rng)
+            dmg += action.bonus
+            target.hp = max(0, target.hp - dmg)
+            self.say(action.message.format(user=e.name, target=target.name, dmg=dmg))
+        else:
+            self.say(action.message.format(user=e.name, target=target.name, dmg=0))
+
+        if action.inflict is not None:
+            if action.chance >= 1.0 or self.status_rng.random() < action.chance:
+                add_status(target, action.inflict, action.duration, action.power)
+                if action.status_message:
+                    self.say(action.status_message.format(target=target.name))
+
+        if action.damage is not None:
+            _track_hit(e, target, dmg)
+
+    # --- driving ---
+
+    def step(self, policy):
+        """Advance by one party action or one enemy phase."""
+        if self.phase != "END" and self.first_alive_enemy() is None:
+            # e.g. a group that was already dead: nothing left to act on
+            self._victory()
+        elif self.phase == "PARTY":
+            actor = self.active_member()
+            choice, target, arg = policy(self, actor)
+            self.hero_action(actor, choice, target, arg)
+        elif self.phase == "ENEMY":
+            self.enemy_phase()
+        return self.winner
+
+    def run(self, policy=None, max_rounds: int = MAX_ROUNDS, before_step=None):
+        """
+        Play the battle to completion. Returns the winner.
+        before_step(sim), if given, is called before every step.
+        """
+        if policy is None:
+            policy = attack_policy
+        while self.winner is None:
+            if self.round > max_rounds:
+                self._end("DRAW")
+                break
+            if before_step is not None:
+                before_step(self)
+            self.step(policy)
+        return self.winner
+
+
+# --- Policies ---
+# A policy is policy(sim, actor) -> (choice, target, arg).
+
+
+def attack_policy(sim: BattleSim, actor: Entity):
+    """Always use a basic Attack on the first living enemy."""
+    return "Attack", sim.first_alive_enemy(), None
+
+
+def auto_policy(sim: BattleSim, actor: Entity):
+    """
+    A reasonable autopilot:
+    heal with a Potion when low, otherwise use the strongest affordable skill,
+    falling back to Magic for casters and Attack for everyone else.
+    """
+    if actor.hp < actor.max_hp * 0.3 and sim.inventory.get("Potion", 0) > 0:
+        return "ITEM", actor, "Potion"
+
+    usable = [
+        s
+        for s in get_actor_skills(actor)
+        if actor.level >= s["level_req"] and actor.mp >= s["mp_cost"]
+    ]
+    if usable:
+        best = max(usable, key=lambda s: s["mult"] * s.get("hits", 1))
+        return "SKILL", sim.first_alive_enemy(), best
+
+    if actor.magic > actor.attack and actor.mp >= MAGIC_COST:
+        return "Magic", sim.first_alive_enemy(), None
+
+    return "Attack", sim.first_alive_enemy(), None
@@ -0,0 +1,77 @@
+# collision_grid.py
+"""
+Packed solidity grid for tilemaps.
+
+A CollisionGrid is compiled once from a tilemap (a list of strings, one
+character per tile) into a bytearray with one byte per tile: 1 = solid.
+Queries work in pixels, so nothing has to look at the map strings during
+play:
+
+    blocks_rect(x, y, w, h)   does the box overlap any solid tile?
+    solid_at(px, py)          is the tile under this point solid?
+
+The grid can be any size, so a town spanning several screens can be one
+grid with each screen's coordinates offset into it. Tiles outside the
+grid are open.
+
+    grid = CollisionGrid.from_rows(TOWN_MAP, SOLID_TILES, TILE_SIZE)
+    if not grid.blocks_rect(left, top, PLAYER_SIZE, PLAYER_SIZE): ...
+"""
+
+
+class CollisionGrid:
+    """One byte per tile (1 = solid), row-major."""
+
+    def __init__(self, width: int, height: int, tile_size: int):
+        self.width = width  # in tiles
+        self.height = height
+        self.tile_size = tile_size
+        self.cells = bytearray(width * height)
+
+    @classmethod
+    def from_rows(cls, rows, solid_chars, tile_size: int):
+        """
+        Compile a tilemap. Rows may differ in length; missing tiles at the
+        end of a short row are open.
+        """
+        width = max((len(row) for row in rows), default=0)
+        grid = cls(width, len(rows), tile_size)
+        cells = grid.cells
+        for ty, row in enumerate(rows):
+            base = ty * width
+            for tx, ch in enumerate(row):
+                if ch in solid_chars:
+                    cells[base + tx] = 1
+        return grid
+
+    def is_solid(self, tx: int, ty: int) -> bool:
+        """Is the tile at tile coordinates (tx, ty) solid?"""
+        if 0 <= tx < self.width and 0 <= ty < self.height:
+            return self.cells[ty * self.width + tx] == 1
+        return False
+
+    def solid_at(self, px: float, py: float) -> bool:
+        """Is the tile under pixel (px, py) solid?"""
+        size = self.tile_size
+        return self.is_solid(int(px // size), int(py // size))
+
+    def blocks_rect(self, x: float, y: float, w: int, h: int) -> bool:
+        """Does the box (x, y, w, h) in pixels overlap any solid tile?"""
+        size = self.tile_size
+        left = int(x)
+        top = int(y)
+        # right/bottom are exclusive: touching a wall is not overlapping it
+        tx0 = max(0, left // size)
+        tx1 = min(self.width - 1, (left + w - 1) // size)
+        ty0 = max(0, top // size)
+        ty1 = min(self.height - 1, (top + h - 1) // size)
+        if tx0 > tx1 or ty0 > ty1:
+            return False
+
+        cells = self.cells
+        width = self.width
+        for ty in range(ty0, ty1 + 1):
+            base = ty * width
+            if cells.find(1, base + tx0, base + tx1 + 1) != -1:
+                return True
+        return False
@@ -1,19 +1,33 @@
+import os
 import pygame
 import sys
-import random
 
+import battle_sim
 import game_data as gd
 import inventory_state as inv
+import item_catalog
 import party_state as party_data
+import rng_streams
+import text_cache
 from inventory_state import add_item, remove_item
 from party_state import party
-
-pygame.init()
+from battle_log import BattleLog
+from glyph_atlas import draw_hud_text, render_text
+from replay import BattleRecorder
+from battle_sim import (
+    BattleSim,
+    Entity,
+    equip_weapon,
+    get_actor_skills,
+)
 
 # --- Display Setup ---
+# Nothing here opens a window: run_battle() / play_replay() call
+# init_display(), so importing this module (e.g. from world.py or a
+# balance script) leaves the caller's display alone.
 WIDTH, HEIGHT = 1024, 640
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("JRPG Combat Prototype")
+CAPTION = "JRPG Combat Prototype"
+screen = None  # the battle window's surface, set by init_display()
 clock = pygame.time.Clock()
 
 # --- Colors ---
@@ -25,10 +39,38 @@ GREEN = (80, 200, 120)
 RED = (200, 80, 80)
 LOCKED = (130, 130, 130)
 
-# --- Fonts ---
-font_big = pygame.font.Font(None, 64)
-font_med = pygame.font.Font(None, 32)
-font_small = pygame.font.Font(None, 24)
+# --- Fonts (loaded by init_fonts()) ---
+font_big = None
+font_med = None
+font_small = None
+
+
+def init_fonts():
+    """Load the battle fonts once."""
+    global font_big, font_med, font_small
+    if font_big is not None:
+        return
+    pygame.font.init()
+    font_big = pygame.font.Font(None, 64)
+    font_med = pygame.font.Font(None, 32)
+    font_small = pygame.font.Font(None, 24)
+
+
+def init_display():
+    """
+    Make the current window the battle window: open one if there is none,
+    resize it to the battle layout if needed, and load the fonts.
+    Returns the display surface.
+    """
+    global screen
+    pygame.init()  # no-op for modules that are already initialized
+    surface = pygame.display.get_surface()
+    if surface is None or surface.get_size() != (WIDTH, HEIGHT):
+        surface = pygame.display.set_mode((WIDTH, HEIGHT))
+    screen = surface
+    pygame.display.set_caption(CAPTION)
+    init_fonts()
+    return screen
 
 
 # --- Damage popup constants ---
@@ -40,6 +82,7 @@ damage_popups = []
 
 # --- Post-battle results ---
 post_battle_results = None
+post_battle_xp = 0
 post_battle_gold = 0
 post_battle_items = []  # list of item_ids dropped this battle
 end_step = 0
@@ -51,40 +94,6 @@ inventory_scroll = 0
 INVENTORY_VISIBLE_MAX = 10  # how many items to show at once
 
 
-# --- Entity class definition ---
-class Entity:
-    """A combatant (hero or enemy)."""
-
-    def __init__(self, name, max_hp, max_mp, attack, magic, defense, speed):
-        self.name = name
-        self.max_hp = max_hp
-        self.hp = max_hp
-        self.max_mp = max_mp
-        self.mp = max_mp
-        self.attack = attack
-        self.magic = magic
-        self.defense = defense
-        self.speed = speed
-
-        self.statuses = []
-        self.defending = False
-
-        # Per-entity progression
-        self.level = 1
-        self.xp = 0
-        self.xp_to_next = 20
-        self.job = "Hero"  # Default job
-
-        # Per-battle performance counters
-        self.battle_damage_dealt = 0
-        self.battle_damage_taken = 0
-        self.battle_kills = 0
-        self.battle_status_inflicted = 0
-
-    def is_alive(self):
-        return self.hp > 0
-
-
 def sync_party_equipment_from_inventory():
     """Update each party member's attack based on equipped weapons."""
     # Map party name -> object for convenience
@@ -92,14 +101,14 @@ def sync_party_equipment_from_inventory():
 
     for char_name, weapon_name in inv.equipped_weapons.items():
         member = name_to_member.get(char_name)
-        weapon = inv.WEAPONS.get(weapon_name)
+        weapon = item_catalog.get(weapon_name)
 
         if member is None or weapon is None:
             continue
 
-        bonus = weapon.get("atk_bonus", 0)
+        bonus = weapon.get("attack_bonus", 0)
         # Ensure base_attack exists
-        if not hasattr(member, "base_attack"):
+        if member.base_attack is None:
             member.base_attack = member.attack
 
         member.weapon_bonus = bonus
@@ -152,208 +161,7 @@ def get_enemy_popup_position(idx):
 # --- Item definitions (for loot & later inventory GUI) ---
 # item_id is the dict key; "name" is what we show to the player.
 # Items are now defined in game_data.ITEMS
-
-SKILLS = [
-    # ===== HERO SKILLS =====
-    {
-        "name": "Power Slash",
-        "user": "Hero",
-        "level_req": 2,
-        "mp_cost": 4,
-        "target": "single",
-        "type": "physical",
-        "mult": 1.6,
-        "hits": 1,
-        "lifesteal": 0.0,
-        "execute_threshold": None,
-        "execute_mult": 1.0,
-        "desc": "Heavy physical strike to one foe.",
-    },
-    {
-        "name": "Shield Breaker",
-        "user": "Hero",
-        "level_req": 4,
-        "mp_cost": 5,
-        "target": "single",
-        "type": "physical",
-        "mult": 1.4,
-        "hits": 1,
-        "lifesteal": 0.0,
-        "execute_threshold": None,
-        "execute_mult": 1.0,
-        "inflict": "Weaken",
-        "inflict_chance": 0.7,
-        "status_power": 0,
-        "status_duration": 3,
-        "desc": "Strike that weakens the foe's attacks.",
-    },
-    {
-        "name": "Shadow Step",
-        "user": "Hero",
-        "level_req": 8,
-        "mp_cost": 6,
-        "target": "single",
-        "type": "physical",
-        "mult": 1.4,
-        "hits": 2,
-        "lifesteal": 0.0,
-        "execute_threshold": None,
-        "execute_mult": 1.0,
-        "desc": "Quick precise strikes, hits twice.",
-    },
-    {
-        "name": "Dragon Fang",
-        "user": "Hero",
-        "level_req": 13,
-        "mp_cost": 9,
-        "target": "single",
-        "type": "physical",
-        "mult": 2.2,
-        "hits": 1,
-        "lifesteal": 0.0,
-        "execute_threshold": 0.30,  # extra damage below 30% HP
-        "execute_mult": 2.0,
-        "desc": "Ferocious finisher, stronger on weakened foes.",
-    },
-    # ===== WARRIOR SKILLS =====
-    {
-        "name": "Cleave",
-        "user": "Warrior",
-        "level_req": 3,
-        "mp_cost": 4,
-        "target": "all",
-        "type": "physical",
-        "mult": 1.1,
-        "hits": 1,
-        "lifesteal": 0.0,
-        "execute_threshold": None,
-        "execute_mult": 1.0,
-        "desc": "Wide swing that hits all enemies.",
-    },
-    {
-        "name": "Guard Stance",
-        "user": "Warrior",
-        "level_req": 5,
-        "mp_cost": 3,
-        "target": "single",
-        "type": "physical",
-        "mult": 0.0,
-        "hits": 0,
-        "lifesteal": 0.0,
-        "execute_threshold": None,
-        "execute_mult": 1.0,
-        "inflict": "Weaken",
-        "inflict_chance": 0.0,
-        "status_power": 0,
-        "status_duration": 0,
-        "desc": "Focus on defense (use Defend command instead for now).",
-    },
-    {
-        "name": "Blood Wave",
-        "user": "Warrior",
-        "level_req": 7,
-        "mp_cost": 8,
-        "target": "all",
-        "type": "magic",  # dark physical-ish magic
-        "mult": 1.3,
-        "hits": 1,
-        "lifesteal": 0.25,
-        "execute_threshold": None,
-        "execute_mult": 1.0,
-        "inflict": "Bleed",
-        "inflict_chance": 0.9,
-        "status_power": 4,
-        "status_duration": 3,
-        "desc": "Crimson wave that bleeds all foes and restores some HP.",
-    },
-    {
-        "name": "War Cry",
-        "user": "Warrior",
-        "level_req": 11,
-        "mp_cost": 6,
-        "target": "all",
-        "type": "magic",
-        "mult": 0.0,
-        "hits": 0,
-        "lifesteal": 0.0,
-        "execute_threshold": None,
-        "execute_mult": 1.0,
-        "inflict": "Weaken",
-        "inflict_chance": 0.8,
-        "status_power": 0,
-        "status_duration": 3,
-        "desc": "Battle roar that weakens enemies' attacks.",
-    },
-    # ===== MAGE SKILLS =====
-    {
-        "name": "Soul Flame",
-        "user": "Mage",
-        "level_req": 2,
-        "mp_cost": 5,
-        "target": "single",
-        "type": "magic",
-        "mult": 1.8,
-        "hits": 1,
-        "lifesteal": 0.0,
-        "execute_threshold": None,
-        "execute_mult": 1.0,
-        "inflict": "Poison",
-        "inflict_chance": 0.8,
-        "status_power": 3,
-        "status_duration": 3,
-        "desc": "Flame that burns and poisons a target.",
-    },
-    {
-        "name": "Frost Lance",
-        "user": "Mage",
-        "level_req": 4,
-        "mp_cost": 6,
-        "target": "single",
-        "type": "magic",
-        "mult": 1.9,
-        "hits": 1,
-        "lifesteal": 0.0,
-        "execute_threshold": None,
-        "execute_mult": 1.0,
-        "desc": "Piercing ice strike with high damage.",
-    },
-    {
-        "name": "Nightfall",
-        "user": "Mage",
-        "level_req": 7,
-        "mp_cost": 10,
-        "target": "all",
-        "type": "magic",
-        "mult": 1.5,
-        "hits": 1,
-        "lifesteal": 0.0,
-        "execute_threshold": None,
-        "execute_mult": 1.0,
-        "inflict": "Weaken",
-        "inflict_chance": 0.6,
-        "status_power": 0,
-        "status_duration": 3,
-        "desc": "Darkness falls, sometimes weakening all foes.",
-    },
-    {
-        "name": "Crimson Eclipse",
-        "user": "Mage",
-        "level_req": 12,
-        "mp_cost": 16,
-        "target": "all",
-        "type": "magic",
-        "mult": 2.1,
-        "hits": 1,
-        "lifesteal": 0.4,
-        "execute_threshold": None,
-        "execute_mult": 1.0,
-        "inflict": "Curse",
-        "inflict_chance": 0.5,
-        "status_power": 0,
-        "status_duration": 3,
-        "desc": "Devastating spell that may curse and heals the caster.",
-    },
-]
+# Skills, damage formulas, statuses and enemy types live in battle_sim.py
 
 
 def spawn_enemy_damage_popup(enemy, amount, color=YELLOW):
@@ -370,6 +178,7 @@ def spawn_enemy_damage_popup(enemy, amount, color=YELLOW):
             "y": y,
             "text": str(amount),
             "color": color,
+            "surface": render_text(font_med, color, str(amount)),
             "timer": POPUP_TIME,
             "vy": POPUP_VY,
         }
@@ -385,57 +194,6 @@ def update_damage_popups():
     damage_popups = [p for p in damage_popups if p["timer"] > 0]
 
 
-def use_item_in_battle(user: Entity, item_id: str, target: Entity) -> bool:
-    """Apply an item effect in battle. Returns True if the turn is consumed."""
-    if inv.inventory.get(item_id, 0) <= 0:
-        add_message("No more of that item!")
-        return False
-
-    item = gd.ITEMS.get(item_id)
-    if not item:
-        add_message("Nothing happens...")
-        return False
-
-    name = item.get("name", item_id)
-    hp_restore = item.get("hp_restore", 0)
-    mp_restore = item.get("mp_restore", 0)
-
-    # Check if target is valid
-    if not target.is_alive():
-        add_message(f"{target.name} cannot use items right now.")
-        return False
-
-    # Apply HP restoration
-    if hp_restore > 0:
-        old_hp = target.hp
-        target.hp = min(target.max_hp, target.hp + hp_restore)
-        healed = target.hp - old_hp
-
-        if healed <= 0:
-            add_message(f"{target.name} is already at full HP.")
-            # Still consume the item even if no healing occurred
-
-        add_message(f"{user.name} uses {name} on {target.name}, restoring {healed} HP!")
-
-    # Apply MP restoration
-    if mp_restore > 0:
-        old_mp = target.mp
-        target.mp = min(target.max_mp, target.mp + mp_restore)
-        restored = target.mp - old_mp
-
-        if restored > 0:
-            add_message(f"{target.name} restored {restored} MP!")
-
-    # If item does nothing
-    if hp_restore == 0 and mp_restore == 0:
-        add_message(f"{user.name} uses {name}, but nothing special happens...")
-
-    # Consume 1 item using game_data's remove function
-    gd.remove_item(item_id, 1)
-
-    return True
-
-
 # Enemies will be a list of Entity objects
 enemies = []
 
@@ -445,73 +203,8 @@ enemies = []
 
 def get_inventory_items():
     """Return a sorted list of (item_id, qty) that the party actually has."""
-    items = []
-    for item_id, qty in inv.inventory.items():
-        if qty > 0 and item_id in gd.ITEMS:
-            items.append((item_id, qty))
-
-    # sort by item name for a stable menu
-    items.sort(key=lambda pair: gd.ITEMS[pair[0]]["name"])
-    return items
-
-
-# --- Equipment helpers ---
-
-
-def is_weapon_item(item_id: str) -> bool:
-    """Check if an item_id is a weapon."""
-    data = gd.ITEMS.get(item_id)
-    return bool(data and data.get("type") == "weapon")
-
-
-def get_weapon_attack_bonus(item_id: str) -> int:
-    """Get the attack bonus from a weapon item."""
-    data = gd.ITEMS.get(item_id)
-    if not data:
-        return 0
-    return int(data.get("attack_bonus", 0))
-
-
-def get_weapon_magic_bonus(item_id: str) -> int:
-    """Get the magic bonus from a weapon item."""
-    data = gd.ITEMS.get(item_id)
-    if not data:
-        return 0
-    return int(data.get("magic_bonus", 0))
-
-
-def get_equipped_weapon(actor) -> str | None:
-    """Return currently equipped weapon item_id or None."""
-    return getattr(actor, "equipped_weapon", None)
-
-
-def equip_weapon(actor, new_item_id: str | None):
-    """
-    Equip a new weapon on this actor.
-
-    - Removes the old weapon's ATK/MAG bonus from stats.
-    - Adds the new weapon's ATK/MAG bonus.
-    - Sets actor.equipped_weapon = new_item_id.
-    """
-    if new_item_id is not None and not is_weapon_item(new_item_id):
-        # Not actually a weapon; ignore.
-        return
-
-    current = get_equipped_weapon(actor)
-    if current == new_item_id:
-        return  # nothing to change
-
-    # Remove old bonuses
-    if current is not None:
-        actor.attack -= get_weapon_attack_bonus(current)
-        actor.magic -= get_weapon_magic_bonus(current)
-
-    # Add new bonuses
-    if new_item_id is not None:
-        actor.attack += get_weapon_attack_bonus(new_item_id)
-        actor.magic += get_weapon_magic_bonus(new_item_id)
-
-    actor.equipped_weapon = new_item_id
+    # sorted by item name for a stable menu
+    return item_catalog.owned(inv.inventory, by_name=True)
 
 
 # --- Party creation (moved here after equip_weapon is defined) ---
@@ -520,7 +213,7 @@ hero.job = "Hero"
 hero.level = 1
 hero.xp = 0
 hero.xp_to_next = 10
-hero.statuses = []
+hero.statuses = {}
 hero.equipped_weapon = None
 
 ally1 = Entity("Warrior", max_hp=80, max_mp=20, attack=15, magic=6, defense=4, speed=9)
@@ -528,7 +221,7 @@ ally1.job = "Warrior"
 ally1.level = 1
 ally1.xp = 0
 ally1.xp_to_next = 10
-ally1.statuses = []
+ally1.statuses = {}
 ally1.equipped_weapon = None
 
 ally2 = Entity("Mage", max_hp=70, max_mp=40, attack=8, magic=14, defense=3, speed=11)
@@ -536,7 +229,7 @@ ally2.job = "Mage"
 ally2.level = 1
 ally2.xp = 0
 ally2.xp_to_next = 10
-ally2.statuses = []
+ally2.statuses = {}
 ally2.equipped_weapon = None
 
 party = [hero, ally1, ally2]
@@ -577,7 +270,9 @@ def get_command_options(actor: Entity):
 # --- Battle state ---
 # States: PLAYER_CHOICE, SKILL_MENU, ITEM_MENU, TARGET_SELECT, ITEM_TARGET, ENEMY_TURN, END, PAUSE_MENU
 battle_state = "PLAYER_CHOICE"
-message_log = []
+message_log = BattleLog()  # whole battle; PageUp/PageDown scroll back
+LOG_VISIBLE_LINES = 4
+LOG_LINE_HEIGHT = 18
 winner = None
 
 # Pause menu state
@@ -598,402 +293,25 @@ item_scroll = 0  # for scrolling the item list later
 ITEM_VISIBLE_MAX = 5  # how many items to show at once
 
 current_hero_index = 0  # which party member is currently acting
-party_acted_this_round = set()
-
-ally_target_index = 0  # which ally we're targeting with an item
-
-# Hero = physical finisher, Warrior = big AoE / bleed, Mage = nasty magic & debuffs.
-
-
-def get_actor_skills(actor: Entity):
-    """Return all skills this actor is allowed to use (ignoring level)."""
-    job = getattr(actor, "job", "Hero")
-    available = []
-    for s in SKILLS:
-        user = s.get("user", "Any")
-        if user in ("Any", job):
-            available.append(s)
-    return available
 
+# Rules/turn state for the current battle (see battle_sim.BattleSim)
+sim = None
 
-def level_up_if_needed(actor: Entity):
-    """
-    Check if this actor should level up based on their own XP.
-    Only the main Hero gets stat increases; others just unlock skills.
-    """
-    leveled_up = False
-
-    while actor.xp >= actor.xp_to_next:
-        actor.xp -= actor.xp_to_next
-        actor.level += 1
-        actor.xp_to_next += 10  # simple curve
-
-        # Only Hero's stats grow
-        if actor is hero or getattr(actor, "job", "") == "Hero":
-            actor.max_hp += 10
-            actor.max_mp += 3
-            actor.attack += 4
-            actor.magic += 3
-            actor.defense += 2
-
-        # Full heal on level-up
-        actor.hp = actor.max_hp
-        actor.mp = actor.max_mp
-
-        add_message(f"{actor.name} reached level {actor.level}!")
-        if actor is hero:
-            add_message("Hero's stats increased and HP/MP restored!")
-        else:
-            add_message("HP/MP restored!")
+# Replay of the current battle; saved to LAST_REPLAY_PATH when it ends
+recorder = None
+LAST_REPLAY_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "replays", "last_battle.rpl"
+)
+REPLAY_STEP_FRAMES = 48  # frames between commands at 1x playback
 
-        leveled_up = True
+ally_target_index = 0  # which ally we're targeting with an item
 
-    return leveled_up
+# Hero = physical finisher, Warrior = big AoE / bleed, Mage = nasty magic & debuffs.
 
 
 def add_message(text: str):
-    """Add a line to the battle log (max 6 lines)."""
-    global message_log
+    """Add a line to the battle log."""
     message_log.append(text)
-    if len(message_log) > 6:
-        message_log = message_log[-6:]
-
-
-def calculate_physical_damage(attacker: Entity, defender: Entity) -> int:
-    base = attacker.attack + random.randint(-2, 2)
-
-    # Non-damage status: Weaken reduces outgoing physical damage
-    if has_status(attacker, "Weaken"):
-        base = int(base * 0.6)  # 40% reduction
-
-    mitigated = base - defender.defense
-
-    if defender.defending:
-        mitigated = mitigated // 2
-
-    return max(1, mitigated)
-
-
-def calculate_magic_damage(attacker: Entity, defender: Entity) -> int:
-    base = attacker.magic + random.randint(-3, 3)
-
-    # Weaken + Curse both hurt magic damage
-    if has_status(attacker, "Weaken"):
-        base = int(base * 0.7)
-    if has_status(attacker, "Curse"):
-        base = int(base * 0.7)
-
-    mitigated = base - defender.defense // 2
-    return max(3, mitigated)
-
-
-# --- Status effect helpers ---
-
-
-def add_status(target: Entity, name: str, duration: int, power: int = 0):
-    """Apply or refresh a status on a target."""
-    for s in target.statuses:
-        if s["name"] == name:
-            s["duration"] = max(s["duration"], duration)
-            s["power"] = max(s["power"], power)
-            return
-
-    target.statuses.append(
-        {
-            "name": name,
-            "duration": duration,
-            "power": power,
-        }
-    )
-
-
-def has_status(entity: Entity, name: str) -> bool:
-    """Return True if this entity has a status with the given name."""
-    return any(s["name"] == name for s in entity.statuses)
-
-
-def get_status_codes(entity: Entity) -> str:
-    """Return a short comma-separated code string like 'PSN, BLD'."""
-    if not entity.statuses:
-        return ""
-
-    abbrev_map = {
-        "Poison": "PSN",
-        "Bleed": "BLD",
-        "Weaken": "WKN",
-        "Stun": "STN",
-        "Curse": "CRS",
-    }
-
-    codes = []
-    for s in entity.statuses:
-        code = abbrev_map.get(s["name"], s["name"][:3].upper())
-        if code not in codes:
-            codes.append(code)
-
-    return ", ".join(codes)
-
-
-def process_statuses_on_enemies():
-    """Tick statuses on all enemies (damage over time, etc.)."""
-    global enemies
-
-    for e in enemies:
-        if not e.is_alive():
-            continue
-
-        remaining_statuses = []
-        for s in e.statuses:
-            name = s["name"]
-            duration = s["duration"]
-            power = s["power"]
-
-            # Damage-over-time statuses
-            if name == "Poison":
-                dmg = max(1, power)
-                e.hp = max(0, e.hp - dmg)
-                add_message(f"{e.name} suffers {dmg} poison damage!")
-
-            elif name == "Bleed":
-                dmg = max(1, power)
-                e.hp = max(0, e.hp - dmg)
-                add_message(f"{e.name} bleeds for {dmg} damage!")
-
-            # Decrease duration and keep if still active
-            duration -= 1
-            if duration > 0 and e.is_alive():
-                s["duration"] = duration
-                remaining_statuses.append(s)
-            else:
-                if e.is_alive():
-                    add_message(f"{e.name} is no longer affected by {name.lower()}.")
-
-        e.statuses = remaining_statuses
-
-
-def process_statuses_on_party():
-    """Tick statuses on all living party members (damage over time, etc.)."""
-    for member in party:
-        if not member.is_alive():
-            continue
-
-        remaining_statuses = []
-        for s in member.statuses:
-            name = s["name"]
-            duration = s["duration"]
-            power = s["power"]
-
-            if name == "Poison":
-                dmg = max(1, power)
-                member.hp = max(0, member.hp - dmg)
-                add_message(f"{member.name} suffers {dmg} poison damage!")
-
-            elif name == "Bleed":
-                dmg = max(1, power)
-                member.hp = max(0, member.hp - dmg)
-                add_message(f"{member.name} bleeds for {dmg} damage!")
-
-            duration -= 1
-            if duration > 0 and member.is_alive():
-                s["duration"] = duration
-                remaining_statuses.append(s)
-            else:
-                if member.is_alive():
-                    add_message(
-                        f"{member.name} is no longer affected by {name.lower()}."
-                    )
-
-        member.statuses = remaining_statuses
-
-
-def maybe_apply_status_from_skill(skill: dict, target: Entity, source: Entity = None):
-    """Roll chance to apply a status from a skill to a target.
-
-    If `source` is provided, increment its `battle_status_inflicted` counter
-    when the status is successfully applied.
-    """
-    if target is None or not target.is_alive():
-        return
-
-    name = skill.get("inflict")
-    if not name:
-        return
-
-    chance = skill.get("inflict_chance", 0.0)
-    duration = skill.get("status_duration", 0)
-    power = skill.get("status_power", 0)
-
-    if duration <= 0 or chance <= 0.0:
-        return
-
-    if random.random() <= chance:
-        add_status(target, name, duration, power)
-        add_message(f"{target.name} is afflicted with {name.lower()}!")
-        if source is not None:
-            setattr(
-                source,
-                "battle_status_inflicted",
-                getattr(source, "battle_status_inflicted", 0) + 1,
-            )
-
-        # --- Enemy spawn definitions (level gating + rarity) ---
-
-
-ENEMY_BLUEPRINTS = [
-    # type,              min_level, weight (higher = more common)
-    {"type": "Slime", "min_level": 1, "weight": 40},
-    {"type": "Bat", "min_level": 2, "weight": 30},
-    {"type": "Cultist", "min_level": 3, "weight": 25},
-    {"type": "Ghoul", "min_level": 4, "weight": 20},
-    {"type": "Vampire Thrall", "min_level": 6, "weight": 15},
-    {"type": "Shadow Fiend", "min_level": 8, "weight": 10},
-]
-
-# Simple per-enemy loot table: enemy name -> list of (item_id, drop_chance)
-ENEMY_LOOT_TABLE = {
-    "Slime": [
-        ("potion", 0.30),  # 30% chance for 1 Potion
-    ],
-    "Bat": [
-        ("potion", 0.15),
-    ],
-    "Cultist": [
-        ("potion", 0.40),
-    ],
-    "Ghoul": [
-        ("potion", 0.20),
-    ],
-    "Vampire Thrall": [
-        ("potion", 0.50),
-    ],
-    "Shadow Fiend": [
-        ("potion", 0.60),
-    ],
-}
-
-# --- Multiple enemy types ---
-
-
-def create_enemy(enemy_type: str) -> Entity:
-    """Factory for different enemy types."""
-    if enemy_type == "Slime":
-        e = Entity(
-            "Slime",
-            max_hp=35,
-            max_mp=0,
-            attack=8,
-            magic=0,
-            defense=2,
-            speed=5,
-        )
-        e.xp_value = 10
-        e.gold_min = 3
-        e.gold_max = 6
-        e.drops = [("Potion", 0.20)]  # 20% chance for a Potion
-
-    elif enemy_type == "Bat":
-        # Fast, fragile, slightly trickier damage
-        e = Entity(
-            "Bat",
-            max_hp=25,
-            max_mp=0,
-            attack=9,
-            magic=0,
-            defense=1,
-            speed=14,
-        )
-        e.xp_value = 14
-        e.gold_min = 5
-        e.gold_max = 9
-        e.drops = [("Potion", 0.10)]
-
-    elif enemy_type == "Cultist":
-        # Tougher, hits a little harder
-        e = Entity(
-            "Cultist",
-            max_hp=45,
-            max_mp=10,
-            attack=11,
-            magic=0,
-            defense=3,
-            speed=8,
-        )
-        e.xp_value = 20
-        e.gold_min = 8
-        e.gold_max = 15
-        e.drops = [("Potion", 0.25)]
-
-    elif enemy_type == "Ghoul":
-        # Chunky HP, decent attack, kinda slow
-        e = Entity(
-            "Ghoul",
-            max_hp=60,
-            max_mp=0,
-            attack=12,
-            magic=0,
-            defense=3,
-            speed=7,
-        )
-        e.xp_value = 28
-        e.gold_min = 10
-        e.gold_max = 20
-        e.drops = [("Potion", 0.15)]
-
-    elif enemy_type == "Vampire Thrall":
-        # Faster, stronger, “elite” feeling
-        e = Entity(
-            "Vampire Thrall",
-            max_hp=55,
-            max_mp=5,
-            attack=14,
-            magic=5,
-            defense=4,
-            speed=12,
-        )
-        e.xp_value = 35
-        e.gold_min = 15
-        e.gold_max = 25
-        e.drops = [("Potion", 0.30)]
-
-    elif enemy_type == "Shadow Fiend":
-        e = Entity(
-            "Shadow Fiend",
-            max_hp=40,
-            max_mp=15,
-            attack=9,
-            magic=16,
-            defense=2,
-            speed=13,
-        )
-        e.xp_value = 40
-        e.gold_min = 20
-        e.gold_max = 30
-        e.drops = [("Potion", 0.35)]
-
-    else:
-        e = Entity(
-            "Unknown",
-            max_hp=30,
-            max_mp=0,
-            attack=7,
-            magic=0,
-            defense=2,
-            speed=5,
-        )
-        e.xp_value = 8
-        e.gold_min = 3
-        e.gold_max = 6
-        e.drops = []
-
-    # --- Scale enemy by Hero's level so they don't fall behind ---
-    scale = max(0, get_party_main_level() - 1)  # no bonus at level 1
-    if scale > 0:
-        e.max_hp += 5 * scale
-        e.hp = e.max_hp
-        e.attack += 1 * scale
-        e.defense += 1 * (scale // 2)
-
-    return e
 
 
 def get_party_main_level() -> int:
@@ -1007,72 +325,7 @@ def get_party_main_level() -> int:
 
 def pick_enemy_group():
     """Choose a random group of 1–3 enemies, gated by hero level."""
-    group = []
-
-    # Random group size between 1 and 3
-    group_size = random.randint(1, 3)
-
-    # Which enemy types are allowed at this level?
-    candidates = [
-        bp for bp in ENEMY_BLUEPRINTS if get_party_main_level() >= bp["min_level"]
-    ]
-    if not candidates:
-        # Failsafe: always at least Slime
-        candidates = [ENEMY_BLUEPRINTS[0]]
-
-    weights = [bp["weight"] for bp in candidates]
-
-    for _ in range(group_size):
-        bp = random.choices(candidates, weights=weights, k=1)[0]
-        group.append(create_enemy(bp["type"]))
-
-    return group
-
-
-def grant_loot_for_group(group):
-    """Return (gold_gain, item_drops_list) for a defeated enemy group.
-
-    item_drops_list: list of item_id strings that were dropped
-    """
-    gold_gain = 0
-    item_drops = []
-
-    for e in group:
-        gmin = getattr(e, "gold_min", 1)
-        gmax = getattr(e, "gold_max", 3)
-        if gmax < gmin:
-            gmax = gmin
-        gold_gain += random.randint(gmin, gmax)
-
-        # look up loot table for this enemy's name
-        loot_entries = ENEMY_LOOT_TABLE.get(e.name, [])
-        for item_id, chance in loot_entries:
-            if random.random() <= chance:
-                item_drops.append(item_id)
-
-    return gold_gain, item_drops
-
-
-def grant_rewards_for_group(group):
-    """Compute total XP, gold, and item drops for a defeated enemy group."""
-    total_xp = 0
-    total_gold = 0
-    drops = []
-
-    for e in group:
-        total_xp += getattr(e, "xp_value", 5)
-
-        gmin = getattr(e, "gold_min", 1)
-        gmax = getattr(e, "gold_max", 3)
-        if gmax < gmin:
-            gmax = gmin
-        total_gold += random.randint(gmin, gmax)
-
-        for item_id, chance in getattr(e, "drops", []):
-            if random.random() <= chance:
-                drops.append(item_id)
-
-    return total_xp, total_gold, drops
+    return battle_sim.pick_enemy_group(get_party_main_level())
 
 
 def apply_gold_and_loot(gold_amount: int, items: list[str]):
@@ -1082,81 +335,14 @@ def apply_gold_and_loot(gold_amount: int, items: list[str]):
         add_item(item_id)
 
 
-def distribute_xp_among_party(total_xp: int):
-    """Distribute `total_xp` to the living party members using an
-    80/20 split: 80% baseline evenly among living members, 20% as a
-    performance bonus (damage dealt, kills, statuses inflicted).
-
-    Sets the global `post_battle_results` list for display by the UI
-    and initializes `results_anim_state` used to animate the results.
-    """
-    global post_battle_results, results_anim_state
+def _init_results_animation():
+    """Set up `results_anim_state` from `post_battle_results`."""
+    global results_anim_state
 
-    living = [m for m in party if m.is_alive()]
-    if not living:
-        post_battle_results = []
+    if not post_battle_results:
         results_anim_state = None
         return
 
-    baseline = int(total_xp * 0.8)
-    bonus_pool = total_xp - baseline
-
-    base_share = baseline // len(living)
-    base_remainder = baseline - base_share * len(living)
-
-    # Compute performance scores
-    scores = []
-    total_score = 0
-    for m in living:
-        dmg = getattr(m, "battle_damage_dealt", 0)
-        kills = getattr(m, "battle_kills", 0)
-        statuses = getattr(m, "battle_status_inflicted", 0)
-        score = dmg + (kills * 15) + (statuses * 8)
-        scores.append(score)
-        total_score += score
-
-    # Allocate XP
-    results = []
-    # Pre-calc bonus shares (may be zero if nobody scored)
-    bonus_shares = [0] * len(living)
-    if total_score > 0 and bonus_pool > 0:
-        for i, s in enumerate(scores):
-            bonus_shares[i] = int(bonus_pool * (s / total_score))
-
-        # Fix rounding remainder by giving to highest scorers
-        assigned = sum(bonus_shares)
-        remain = bonus_pool - assigned
-        if remain > 0:
-            idxs = sorted(range(len(living)), key=lambda i: scores[i], reverse=True)
-            for j in range(remain):
-                bonus_shares[idxs[j % len(idxs)]] += 1
-
-    for i, m in enumerate(living):
-        # Snapshot BEFORE awarding XP so we can animate correctly
-        level_before = m.level
-        xp_before = m.xp
-        xp_to_next_before = m.xp_to_next
-
-        xp_gain = base_share + (1 if i < base_remainder else 0) + bonus_shares[i]
-
-        m.xp += xp_gain
-        level_up_if_needed(m)
-
-        results.append(
-            {
-                "name": m.name,
-                "xp": xp_gain,
-                "level_before": level_before,
-                "level_after": m.level,
-                "score": scores[i],
-                "xp_before": xp_before,
-                "xp_to_next_before": xp_to_next_before,
-            }
-        )
-
-    # Sort by performance score (MVP at top)
-    post_battle_results = sorted(results, key=lambda r: r["score"], reverse=True)
-
     # --- Initialize animation state for odometer + bar fill ---
     results_anim_state = []
     for r in post_battle_results:
@@ -1235,13 +421,6 @@ def all_enemies_dead():
     return all(not e.is_alive() for e in enemies)
 
 
-def get_first_alive_enemy():
-    for e in enemies:
-        if e.is_alive():
-            return e
-    return None
-
-
 def get_next_alive_index(current):
     """Get the next alive enemy index (wraps around)."""
     if not enemies:
@@ -1266,27 +445,6 @@ def get_prev_alive_index(current):
     return current
 
 
-def living_party_members():
-    """Return a list of all living party members."""
-    return [m for m in party if m.is_alive()]
-
-
-def all_party_dead():
-    return all(not m.is_alive() for m in party)
-
-
-def get_next_living_hero_index(current):
-    """Next living hero index (wraps around)."""
-    if not party:
-        return 0
-    n = len(party)
-    for i in range(1, n + 1):
-        idx = (current + i) % n
-        if party[idx].is_alive():
-            return idx
-    return current
-
-
 def get_active_hero():
     """Convenience: who is currently acting."""
     return party[current_hero_index]
@@ -1294,371 +452,70 @@ def get_active_hero():
 
 def hero_take_action(actor, choice, target=None):
     """Resolve the hero's chosen action for the given party member."""
-    global battle_state, winner, enemies, selected_skill, selected_item
-
-    actor_idx = party.index(actor)
-
-    # If this hero is stunned, they lose their turn
-    if has_status(actor, "Stun"):
-        add_message(f"{actor.name} is stunned and can't move!")
-        actor.defending = False
-
-        # Still tick enemy statuses, then move turn forward
-        process_statuses_on_enemies()
-        if battle_state != "END":
-            _advance_turn_after_hero(actor_idx)
-        return
-
-    # Resolve target for normal Attack/Magic (SKILL resolves differently)
-    if choice in ("Attack", "Magic", "SKILL"):
-        if choice != "SKILL" and target is None:
-            target = get_first_alive_enemy()
-        if choice != "SKILL" and target is None:
-            return  # no enemies to hit
-
-    if choice == "Attack":
-        dmg = calculate_physical_damage(actor, target)
-        target.hp = max(0, target.hp - dmg)
-        add_message(f"{actor.name} attacks {target.name} for {dmg} damage!")
-        spawn_enemy_damage_popup(target, dmg)
-        # Track performance
-        actor.battle_damage_dealt = getattr(actor, "battle_damage_dealt", 0) + dmg
-        target.battle_damage_taken = getattr(target, "battle_damage_taken", 0) + dmg
-        if target.hp == 0:
-            actor.battle_kills = getattr(actor, "battle_kills", 0) + 1
-        actor.defending = False
-
-    elif choice == "Magic":
-        cost = 5
-        if actor.mp < cost:
-            add_message(f"{actor.name} tried to cast a spell, but is out of MP!")
-        else:
-            actor.mp -= cost
-            dmg = calculate_magic_damage(actor, target)
-            target.hp = max(0, target.hp - dmg)
-            add_message(f"{actor.name} casts Fire on {target.name} for {dmg} damage!")
-            spawn_enemy_damage_popup(target, dmg)
-            # Track performance
-            actor.battle_damage_dealt = getattr(actor, "battle_damage_dealt", 0) + dmg
-            target.battle_damage_taken = getattr(target, "battle_damage_taken", 0) + dmg
-            if target.hp == 0:
-                actor.battle_kills = getattr(actor, "battle_kills", 0) + 1
-        actor.defending = False
-
-    elif choice == "SKILL":
-        skill = selected_skill
-        if skill is None:
-            add_message("No skill selected.")
-        elif actor.level < skill["level_req"]:
-            # Skill unlocks are based on the acting character's level
-            add_message(f"{actor.name} hasn't learned {skill['name']} yet!")
-        elif actor.mp < skill["mp_cost"]:
-            add_message(f"Not enough MP to use {skill['name']}!")
-        else:
-            actor.mp -= skill["mp_cost"]
-
-            hits = skill.get("hits", 1)
-            lifesteal_frac = skill.get("lifesteal", 0.0)
-            exec_thresh = skill.get("execute_threshold", None)
-            exec_mult = skill.get("execute_mult", 1.0)
-
-            total_damage_done = 0
-
-            # --- AoE skills: hit all living enemies once ---
-            if skill["target"] == "all":
-                for e in enemies:
-                    if not e.is_alive():
-                        continue
-
-                    # choose base damage type
-                    if skill["type"] == "physical":
-                        base = calculate_physical_damage(actor, e)
-                    else:
-                        base = calculate_magic_damage(actor, e)
-
-                    # execute bonus (per target)
-                    if exec_thresh is not None and e.max_hp > 0:
-                        if e.hp / e.max_hp <= exec_thresh:
-                            base = int(base * exec_mult)
-
-                    dmg = int(base * skill["mult"])
-                    e.hp = max(0, e.hp - dmg)
-                    total_damage_done += dmg
-
-                    add_message(
-                        f"{actor.name} uses {skill['name']} on {e.name} for {dmg} damage!"
-                    )
-                    spawn_enemy_damage_popup(e, dmg)
-                    # Track performance per target
-                    actor.battle_damage_dealt = (
-                        getattr(actor, "battle_damage_dealt", 0) + dmg
-                    )
-                    e.battle_damage_taken = getattr(e, "battle_damage_taken", 0) + dmg
-                    if e.hp == 0:
-                        actor.battle_kills = getattr(actor, "battle_kills", 0) + 1
-                    maybe_apply_status_from_skill(skill, e, actor)
+    global selected_skill, selected_item
 
-            else:
-                # --- Single-target skills (support multi-hit) ---
-                if target is None or not target.is_alive():
-                    target = get_first_alive_enemy()
-
-                for hit in range(hits):
-                    if target is None or not target.is_alive():
-                        target = get_first_alive_enemy()
-                        if target is None:
-                            break  # nobody left to hit
-
-                    if skill["type"] == "physical":
-                        base = calculate_physical_damage(actor, target)
-                    else:
-                        base = calculate_magic_damage(actor, target)
-
-                    # Execute bonus
-                    if exec_thresh is not None and target.max_hp > 0:
-                        if target.hp / target.max_hp <= exec_thresh:
-                            base = int(base * exec_mult)
-
-                    dmg = int(base * skill["mult"])
-                    target.hp = max(0, target.hp - dmg)
-                    total_damage_done += dmg
-
-                    if hits > 1:
-                        add_message(
-                            f"{actor.name}'s {skill['name']} hits {target.name} "
-                            f"for {dmg} damage! (hit {hit + 1})"
-                        )
-                    else:
-                        add_message(
-                            f"{actor.name} uses {skill['name']} on {target.name} "
-                            f"for {dmg} damage!"
-                        )
-
-                    spawn_enemy_damage_popup(target, dmg)
-                    # Track performance per hit/target
-                    actor.battle_damage_dealt = (
-                        getattr(actor, "battle_damage_dealt", 0) + dmg
-                    )
-                    target.battle_damage_taken = (
-                        getattr(target, "battle_damage_taken", 0) + dmg
-                    )
-                    if target.hp == 0:
-                        actor.battle_kills = getattr(actor, "battle_kills", 0) + 1
-                    # apply status on each hit/target
-                    maybe_apply_status_from_skill(skill, target, actor)
-
-            # --- Lifesteal healing ---
-            if lifesteal_frac > 0 and total_damage_done > 0:
-                heal = int(total_damage_done * lifesteal_frac)
-                if heal > 0:
-                    old_hp = actor.hp
-                    actor.hp = min(actor.max_hp, actor.hp + heal)
-                    actual = actor.hp - old_hp
-                    if actual > 0:
-                        add_message(f"{actor.name} absorbs {actual} HP!")
-
-        actor.defending = False
+    arg = None
+    if choice == "SKILL":
+        arg = selected_skill
         selected_skill = None
-
     elif choice == "ITEM":
-        item_id = selected_item
-        if item_id is None:
-            add_message("No item selected.")
-        else:
-            if target is None:
-                target = actor  # fallback: use on self
-            used = use_item_in_battle(actor, item_id, target)
-            # whether or not we want to refund the turn on failure
-            # is a design choice; for now, the turn is still consumed.
-        actor.defending = False
+        arg = selected_item
         selected_item = None
 
-    elif choice == "Defend":
-        actor.defending = True
-        add_message(f"{actor.name} braces for impact!")
-
-    elif choice == "Run":
-        if random.random() < 0.5:
-            add_message(f"{actor.name} successfully escaped!")
-            battle_state = "END"
-            winner = "ESCAPE"
-            return
-        else:
-            add_message(f"{actor.name} tried to run, but couldn't escape!")
-        actor.defending = False
-
-    # After the hero acts, tick enemy status effects
-    process_statuses_on_enemies()
-
-    # Check if all enemies died
-    if all_enemies_dead() and battle_state != "END":
-        add_message("All enemies are defeated!")
-
-        global post_battle_gold, post_battle_items
+    sim.hero_action(actor, choice, target, arg)
+    _sync_from_sim()
 
-        total_xp, total_gold, drops = grant_rewards_for_group(enemies)
-        add_message(f"Party gains {total_xp} XP!")
-        if total_gold > 0:
-            add_message(f"Found {total_gold} G!")
 
-        if drops:
-            names = [gd.ITEMS[i]["name"] for i in drops]
-            add_message("Loot: " + ", ".join(names))
+def enemy_take_action():
+    """Each alive enemy acts in turn."""
+    sim.enemy_phase()
+    _sync_from_sim()
 
-        distribute_xp_among_party(total_xp)
-        apply_gold_and_loot(total_gold, drops)
 
-        # Store for results UI - convert drops list to (item_id, qty) tuples
-        post_battle_gold = total_gold
-        post_battle_items = []
-        item_counts = {}
-        for item_id in drops:
-            item_counts[item_id] = item_counts.get(item_id, 0) + 1
-        for item_id, qty in item_counts.items():
-            post_battle_items.append((item_id, qty))
+def _sync_from_sim(bank_rewards=True):
+    """Mirror the BattleSim's turn state into the battle screen's globals."""
+    global battle_state, winner, current_hero_index, menu_index
 
+    if sim.phase == "END":
+        if battle_state != "END" and sim.winner == "HERO":
+            _on_victory(bank_rewards)
         battle_state = "END"
-        winner = "HERO"
-
-        # start END state at phase 0: Victory! screen
-        global end_step
-        end_step = 0
+        winner = sim.winner
         return
 
-    if battle_state != "END":
-        _advance_turn_after_hero(actor_idx)
-
-
-def _advance_turn_after_hero(last_actor_index):
-    """
-    Move to the next living hero who hasn't acted this round.
-    If everyone has acted, go to ENEMY_TURN.
-    """
-    global battle_state, current_hero_index, party_acted_this_round, menu_index
-
-    party_acted_this_round.add(last_actor_index)
-
-    # find next living hero who has NOT acted yet
-    for offset in range(1, len(party) + 1):
-        idx = (last_actor_index + offset) % len(party)
-        if party[idx].is_alive() and idx not in party_acted_this_round:
-            current_hero_index = idx
-            menu_index = 0  # start them on their main command
-            battle_state = "PLAYER_CHOICE"
-            return
-
-    # nobody left this round -> enemies act next
-    party_acted_this_round.clear()
-    battle_state = "ENEMY_TURN"
-
-
-def enemy_take_action():
-    """Each alive enemy acts in turn."""
-    global battle_state, winner, current_hero_index, party_acted_this_round
-
-    # Each enemy gets one action
-    for e in enemies:
-        if not e.is_alive():
-            continue
-
-        if not living_party_members():
-            break
-
-        # If an enemy is stunned, they lose their action
-        if has_status(e, "Stun"):
-            add_message(f"{e.name} is stunned and cannot act!")
-            continue
+    if sim.phase == "ENEMY":
+        battle_state = "ENEMY_TURN"
+        return
 
-        # pick a random living party member to target
-        target = random.choice(living_party_members())
-
-        if e.name == "Slime":
-            # Simple physical attack
-            dmg = calculate_physical_damage(e, target)
-            target.hp = max(0, target.hp - dmg)
-            add_message(f"{e.name} slaps {target.name} for {dmg} damage!")
-            # Track simple enemy performance
-            e.battle_damage_dealt = getattr(e, "battle_damage_dealt", 0) + dmg
-            target.battle_damage_taken = getattr(target, "battle_damage_taken", 0) + dmg
-
-        elif e.name == "Bat":
-            roll = random.random()
-            if roll < 0.30:
-                # Poisonous bite that can inflict poison
-                dmg = calculate_physical_damage(e, target)
-                target.hp = max(0, target.hp - dmg)
-                add_message(
-                    f"{e.name} sinks its fangs into {target.name} for {dmg} damage!"
-                )
-                # 60% chance to inflict poison
-                if random.random() < 0.60:
-                    add_status(target, "Poison", duration=3, power=2)
-                    add_message(f"{target.name} is afflicted with poison!")
-                e.battle_damage_dealt = getattr(e, "battle_damage_dealt", 0) + dmg
-                target.battle_damage_taken = (
-                    getattr(target, "battle_damage_taken", 0) + dmg
-                )
-            else:
-                dmg = calculate_physical_damage(e, target)
-                target.hp = max(0, target.hp - dmg)
-                add_message(f"{e.name} bites {target.name} for {dmg} damage!")
-                e.battle_damage_dealt = getattr(e, "battle_damage_dealt", 0) + dmg
-                target.battle_damage_taken = (
-                    getattr(target, "battle_damage_taken", 0) + dmg
-                )
+    if current_hero_index != sim.current or battle_state != "PLAYER_CHOICE":
+        menu_index = 0  # start them on their main command
+    current_hero_index = sim.current
+    battle_state = "PLAYER_CHOICE"
 
-        elif e.name == "Cultist":
-            roll = random.random()
-            if roll < 0.35:
-                # Blood hex that causes bleeding
-                dmg = calculate_physical_damage(e, target)
-                target.hp = max(0, target.hp - dmg)
-                add_message(
-                    f"{e.name} casts a blood hex on {target.name} for {dmg} damage!"
-                )
-                # 70% chance to inflict bleed
-                if random.random() < 0.70:
-                    add_status(target, "Bleed", duration=3, power=3)
-                    add_message(f"{target.name} starts bleeding!")
-                e.battle_damage_dealt = getattr(e, "battle_damage_dealt", 0) + dmg
-                target.battle_damage_taken = (
-                    getattr(target, "battle_damage_taken", 0) + dmg
-                )
 
-            elif roll < 0.60:
-                # Shadow bind that stuns
-                add_message(f"{e.name} binds {target.name} in shadowy chains!")
-                add_status(target, "Stun", duration=1, power=0)
+def _on_victory(bank_rewards=True):
+    """Bank the sim's rewards and set up the results screen."""
+    global post_battle_results, post_battle_xp, post_battle_gold, post_battle_items
+    global end_step
 
-            else:
-                dmg = calculate_physical_damage(e, target) + 1
-                target.hp = max(0, target.hp - dmg)
-                add_message(f"{e.name} strikes {target.name} for {dmg} damage!")
-                e.battle_damage_dealt = getattr(e, "battle_damage_dealt", 0) + dmg
-                target.battle_damage_taken = (
-                    getattr(target, "battle_damage_taken", 0) + dmg
-                )
+    if bank_rewards:
+        apply_gold_and_loot(sim.gold, sim.drops)
 
-    # After all enemies act, tick party status effects (poison, bleed, etc.)
-    process_statuses_on_party()
+    post_battle_results = sim.results
+    _init_results_animation()
 
-    # Reset defending after enemy phase
-    for member in party:
-        member.defending = False
+    # Store for results UI - convert drops list to (item_id, qty) tuples
+    post_battle_xp = sim.xp
+    post_battle_gold = sim.gold
+    post_battle_items = []
+    item_counts = {}
+    for item_id in sim.drops:
+        item_counts[item_id] = item_counts.get(item_id, 0) + 1
+    for item_id, qty in item_counts.items():
+        post_battle_items.append((item_id, qty))
 
-    if all_party_dead():
-        add_message("The party has fallen...")
-        battle_state = "END"
-        winner = "ENEMY"
-    else:
-        # New round: start from first living party member
-        party_acted_this_round.clear()
-        for i, m in enumerate(party):
-            if m.is_alive():
-                current_hero_index = i
-                break
-        menu_index = 0
-        battle_state = "PLAYER_CHOICE"
+    # start END state at phase 0: Victory! screen
+    end_step = 0
 
 
 def draw_health_bar(x, y, width, height, current, maximum):
@@ -1668,21 +525,62 @@ def draw_health_bar(x, y, width, height, current, maximum):
     pygame.draw.rect(screen, GREEN, (x, y, int(width * ratio), height))
 
 
-def draw_battle_screen():
-    screen.fill(BLACK)
+# --- Battle screen layout ---
+# Top "stage" area – enemies on left, heroes on right
+BATTLE_FIELD_RECT = pygame.Rect(16, 16, WIDTH - 32, HEIGHT - 240)  # room for bottom UI
 
-    # ---------- MAIN BATTLE FIELD (top half) ----------
-    # Top "stage" area – enemies on left, heroes on right
-    field_height = HEIGHT - 240  # leaves room for bottom UI
-    field_rect = pygame.Rect(16, 16, WIDTH - 32, field_height)
+_field = BATTLE_FIELD_RECT
+_slot_spacing = 90  # vertical spacing between slots
+ENEMY_SLOTS = [
+    (_field.x + 120, _field.centery + dy) for dy in (-_slot_spacing, 0, _slot_spacing)
+]
+HERO_SLOTS = [
+    (_field.right - 120, _field.centery + dy)
+    for dy in (-_slot_spacing, 0, _slot_spacing)
+]
 
-    # Stage border
-    pygame.draw.rect(screen, WHITE, field_rect, 2)
+# Battle log: top of the field, between the two sides
+BATTLE_LOG_RECT = pygame.Rect(
+    _field.x + 220,
+    _field.y + 8,
+    _field.width - 440,
+    LOG_VISIBLE_LINES * LOG_LINE_HEIGHT + 10,
+)
+
+# Bottom bar: left = party info, right = command/skill menu
+_bottom_y = _field.bottom + 12
+BATTLE_BOTTOM_RECT = pygame.Rect(16, _bottom_y, WIDTH - 32, HEIGHT - _bottom_y - 16)
+BATTLE_SPLIT_X = BATTLE_BOTTOM_RECT.x + int(BATTLE_BOTTOM_RECT.width * 0.60)
+BATTLE_PARTY_RECT = pygame.Rect(
+    BATTLE_BOTTOM_RECT.x + 10,
+    BATTLE_BOTTOM_RECT.y + 10,
+    BATTLE_SPLIT_X - BATTLE_BOTTOM_RECT.x - 14,
+    BATTLE_BOTTOM_RECT.height - 20,
+)
+BATTLE_MENU_RECT = pygame.Rect(
+    BATTLE_SPLIT_X + 10,
+    BATTLE_BOTTOM_RECT.y + 10,
+    BATTLE_BOTTOM_RECT.right - BATTLE_SPLIT_X - 20,
+    BATTLE_BOTTOM_RECT.height - 20,
+)
+
+_stage_layer = None
+
+
+def get_stage_layer():
+    """Everything on the battle screen that never changes, drawn once."""
+    global _stage_layer
+    if _stage_layer is not None:
+        return _stage_layer
+
+    stage = pygame.Surface((WIDTH, HEIGHT))
+    stage.fill(BLACK)
+    field_rect = BATTLE_FIELD_RECT
 
     # Simple layered background to feel like a 2D stage
-    pygame.draw.rect(screen, (20, 20, 50), field_rect)  # dark base
+    pygame.draw.rect(stage, (20, 20, 50), field_rect)  # dark base
     pygame.draw.rect(
-        screen,
+        stage,
         (35, 35, 80),
         (
             field_rect.x,
@@ -1692,7 +590,7 @@ def draw_battle_screen():
         ),
     )
     pygame.draw.rect(
-        screen,
+        stage,
         (10, 10, 30),
         (
             field_rect.x,
@@ -1702,23 +600,29 @@ def draw_battle_screen():
         ),
     )
 
-    # --- Slot positions for 3v3 layout ---
-    mid_y = field_rect.centery
-    spacing = 90  # vertical spacing between slots
-
-    enemy_x = field_rect.x + 120  # left side for enemies
-    hero_x = field_rect.right - 120  # right side for heroes
-
-    enemy_slots = [
-        (enemy_x, mid_y - spacing),
-        (enemy_x, mid_y),
-        (enemy_x, mid_y + spacing),
-    ]
-    hero_slots = [
-        (hero_x, mid_y - spacing),
-        (hero_x, mid_y),
-        (hero_x, mid_y + spacing),
-    ]
+    # Battle log panel
+    pygame.draw.rect(stage, (10, 10, 30), BATTLE_LOG_RECT)
+    pygame.draw.rect(stage, GRAY, BATTLE_LOG_RECT, 1)
+
+    # Bottom bar frame and split
+    bottom_rect = BATTLE_BOTTOM_RECT
+    pygame.draw.rect(stage, WHITE, bottom_rect, 2)
+    pygame.draw.line(
+        stage,
+        WHITE,
+        (BATTLE_SPLIT_X, bottom_rect.y),
+        (BATTLE_SPLIT_X, bottom_rect.bottom),
+        2,
+    )
+
+    if pygame.display.get_surface() is not None:
+        stage = stage.convert()
+    _stage_layer = stage
+    return stage
+
+
+def _draw_enemies():
+    enemy_slots = ENEMY_SLOTS
 
     # ---------- ENEMIES (left side, up to 3) ----------
     for idx, e in enumerate(enemies):
@@ -1735,16 +639,20 @@ def draw_battle_screen():
         pygame.draw.rect(screen, color, sprite_rect)
 
         # Name under the enemy
-        name_text = font_small.render(e.name, True, WHITE)
+        name_text = text_cache.render(font_small, e.name, True, WHITE)
         name_rect = name_text.get_rect(center=(x, y + 42))
         screen.blit(name_text, name_rect)
 
         # Target cursor when selecting
         if battle_state == "TARGET_SELECT" and idx == target_index and e.is_alive():
-            arrow_text = font_small.render("▶", True, YELLOW)
+            arrow_text = text_cache.render(font_small, "▶", True, YELLOW)
             arrow_rect = arrow_text.get_rect(midright=(sprite_rect.left - 8, y))
             screen.blit(arrow_text, arrow_rect)
 
+
+def _draw_heroes():
+    hero_slots = HERO_SLOTS
+
     # ---------- HEROES (right side, up to 3) ----------
     for idx, h in enumerate(party):
         if idx >= 3:
@@ -1767,45 +675,40 @@ def draw_battle_screen():
             pygame.draw.rect(screen, YELLOW, sprite_rect, 3)
 
         # Name under hero
-        name_text = font_small.render(h.name, True, WHITE)
+        name_text = text_cache.render(font_small, h.name, True, WHITE)
         name_rect = name_text.get_rect(center=(x, y + 42))
         screen.blit(name_text, name_rect)
 
-    # ---------- DAMAGE POPUPS (float over battlefield) ----------
-    for p in damage_popups:
-        txt = font_med.render(p["text"], True, p["color"])
-        rect = txt.get_rect(center=(int(p["x"]), int(p["y"])))
-        screen.blit(txt, rect)
-
-    # ---------- BOTTOM BAR (Party + Commands) ----------
-    bottom_y = field_rect.bottom + 12
-    bottom_height = HEIGHT - bottom_y - 16
-    bottom_rect = pygame.Rect(16, bottom_y, WIDTH - 32, bottom_height)
-    pygame.draw.rect(screen, WHITE, bottom_rect, 2)
-
-    # Vertical split: left = party info, right = command/skill menu
-    split_x = bottom_rect.x + int(bottom_rect.width * 0.60)
-    pygame.draw.line(
+
+def _draw_battle_log():
+    # ---------- BATTLE LOG (top of the field, between the two sides) ----------
+    log_rect = BATTLE_LOG_RECT
+    prev_clip = screen.get_clip()
+    screen.set_clip(log_rect.clip(prev_clip))  # long lines get cut off
+    message_log.draw(
         screen,
+        font_small,
         WHITE,
-        (split_x, bottom_rect.y),
-        (split_x, bottom_rect.bottom),
-        2,
+        log_rect.x + 8,
+        log_rect.y + 5,
+        LOG_VISIBLE_LINES,
+        LOG_LINE_HEIGHT,
     )
+    screen.set_clip(prev_clip)
+    if message_log.scroll:
+        more = text_cache.render(font_small, f"↓ {message_log.scroll}", True, YELLOW)
+        screen.blit(more, more.get_rect(topright=(log_rect.right, log_rect.bottom + 2)))
 
-    # Content areas
-    party_rect = pygame.Rect(
-        bottom_rect.x + 10,
-        bottom_rect.y + 10,
-        split_x - bottom_rect.x - 14,
-        bottom_rect.height - 20,
-    )
-    menu_rect = pygame.Rect(
-        split_x + 10,
-        bottom_rect.y + 10,
-        bottom_rect.right - split_x - 20,
-        bottom_rect.height - 20,
-    )
+
+def _draw_damage_popups():
+    # ---------- DAMAGE POPUPS (float over battlefield) ----------
+    for p in damage_popups:
+        rect = p["surface"].get_rect(center=(int(p["x"]), int(p["y"])))
+        screen.blit(p["surface"], rect)
+
+
+def _draw_party_panel():
+    party_rect = BATTLE_PARTY_RECT
 
     # ---------- PARTY BOX (bottom-left, per-character info only) ----------
     # No overall "Party LV" line – just each member's info.
@@ -1824,30 +727,40 @@ def draw_battle_screen():
             name_color = YELLOW
 
         # Name
-        name_text = font_small.render(h.name, True, name_color)
+        name_text = text_cache.render(font_small, h.name, True, name_color)
         screen.blit(name_text, (party_rect.x, y))
 
         # Personal level under the name
-        lv_text = font_small.render(f"(LV {h.level})", True, WHITE)
-        screen.blit(lv_text, (party_rect.x + 18, y + 14))
+        draw_hud_text(
+            ("battle_lv", idx),
+            screen,
+            font_small,
+            WHITE,
+            f"(LV {h.level})",
+            (party_rect.x + 18, y + 14),
+        )
 
         stats_x = party_rect.x + 150
 
         # HP + MP line
-        hp_mp_line = font_small.render(
-            f"HP {h.hp}/{h.max_hp}   MP {h.mp}/{h.max_mp}",
-            True,
+        draw_hud_text(
+            ("battle_hp_mp", idx),
+            screen,
+            font_small,
             WHITE,
+            f"HP {h.hp}/{h.max_hp}   MP {h.mp}/{h.max_mp}",
+            (stats_x, y + 10),
         )
-        screen.blit(hp_mp_line, (stats_x, y + 10))
 
         # XP line (per character)
-        xp_line = font_small.render(
-            f"XP {h.xp}/{h.xp_to_next}",
-            True,
+        draw_hud_text(
+            ("battle_xp", idx),
+            screen,
+            font_small,
             WHITE,
+            f"XP {h.xp}/{h.xp_to_next}",
+            (stats_x, y + 26),
         )
-        screen.blit(xp_line, (stats_x, y + 26))
 
         # HP bar under stats
         bar_y = y + 40
@@ -1856,11 +769,15 @@ def draw_battle_screen():
 
         # Arrow when selecting an ally for an item
         if battle_state == "ITEM_TARGET" and idx == ally_target_index and h.is_alive():
-            arrow_text = font_small.render("▶", True, YELLOW)
+            arrow_text = text_cache.render(font_small, "▶", True, YELLOW)
             screen.blit(arrow_text, (party_rect.x - 14, y + 8))
 
+
+def _draw_command_menu():
+    menu_rect = BATTLE_MENU_RECT
+
     # ---------- COMMAND MENU (bottom-right) ----------
-    title = font_small.render("Commands", True, WHITE)
+    title = text_cache.render(font_small, "Commands", True, WHITE)
     screen.blit(title, (menu_rect.x, menu_rect.y))
 
     actor = get_active_hero()
@@ -1870,7 +787,7 @@ def draw_battle_screen():
         color = WHITE
         if battle_state == "PLAYER_CHOICE" and i == menu_index:
             color = YELLOW
-        text = font_small.render(option, True, color)
+        text = text_cache.render(font_small, option, True, color)
         screen.blit(text, (menu_rect.x + 10, menu_rect.y + 24 + i * 22))
 
     # keep MENU_OPTIONS in sync with the actual order
@@ -1885,12 +802,14 @@ def draw_battle_screen():
         actor = get_active_hero()
         skills = get_actor_skills(actor)
 
-        title = font_small.render("Skills", True, WHITE)
+        title = text_cache.render(font_small, "Skills", True, WHITE)
         screen.blit(title, (menu_rect.x + 8, menu_rect.y + 4))
 
         if not skills:
             # This class literally has no defined skills
-            msg = font_small.render("No skills for this character yet.", True, WHITE)
+            msg = text_cache.render(
+                font_small, "No skills for this character yet.", True, WHITE
+            )
             screen.blit(msg, (menu_rect.x + 10, menu_rect.y + 28))
         else:
             start = skill_scroll
@@ -1906,15 +825,15 @@ def draw_battle_screen():
                     color = YELLOW if skill_i == skill_index else WHITE
 
                 label = f"{skill['name']} (MP {skill['mp_cost']})"
-                text = font_small.render(label, True, color)
+                text = text_cache.render(font_small, label, True, color)
                 screen.blit(text, (menu_rect.x + 10, menu_rect.y + 24 + draw_i * 20))
 
             # scroll arrows
             if skill_scroll > 0:
-                up_text = font_small.render("↑", True, WHITE)
+                up_text = text_cache.render(font_small, "↑", True, WHITE)
                 screen.blit(up_text, (menu_rect.right - 18, menu_rect.y + 22))
             if end < len(skills):
-                dn_text = font_small.render("↓", True, WHITE)
+                dn_text = text_cache.render(font_small, "↓", True, WHITE)
                 screen.blit(
                     dn_text,
                     (
@@ -1930,11 +849,11 @@ def draw_battle_screen():
 
         items = get_inventory_items()
 
-        title = font_small.render("Items", True, WHITE)
+        title = text_cache.render(font_small, "Items", True, WHITE)
         screen.blit(title, (menu_rect.x + 8, menu_rect.y + 4))
 
         if not items:
-            msg = font_small.render("No items.", True, WHITE)
+            msg = text_cache.render(font_small, "No items.", True, WHITE)
             screen.blit(msg, (menu_rect.x + 10, menu_rect.y + 28))
         else:
             start = item_scroll
@@ -1945,15 +864,16 @@ def draw_battle_screen():
                 item_name = gd.ITEMS[item_id]["name"]
                 label = f"{item_name} x{qty}"
                 color = YELLOW if item_i == item_index else WHITE
-                text = font_small.render(label, True, color)
+                text = text_cache.render(font_small, label, True, color)
                 screen.blit(text, (menu_rect.x + 10, menu_rect.y + 24 + draw_i * 20))
 
             # scroll arrows
             if item_scroll > 0:
-                up_text = font_small.render("↑", True, WHITE)
+                up_text = text_cache.render(font_small, "↑", True, WHITE)
                 screen.blit(up_text, (menu_rect.right - 18, menu_rect.y + 22))
             if end < len(items):
-                dn_text = font_small.render(
+                dn_text = text_cache.render(
+                    font_small,
                     "↓",
                     True,
                     WHITE,
@@ -1966,6 +886,8 @@ def draw_battle_screen():
                     ),
                 )
 
+
+def _draw_pause_overlay():
     # ---------- PAUSE MENU OVERLAY ----------
     if battle_state == "PAUSE_MENU":
         overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
@@ -1984,7 +906,7 @@ def draw_battle_screen():
         pygame.draw.rect(screen, (15, 15, 35), panel_rect)
         pygame.draw.rect(screen, WHITE, panel_rect, 2)
 
-        title = font_med.render("Paused", True, WHITE)
+        title = text_cache.render(font_med, "Paused", True, WHITE)
         title_rect = title.get_rect(midtop=(panel_rect.centerx, panel_rect.y + 12))
         screen.blit(title, title_rect)
 
@@ -1994,11 +916,12 @@ def draw_battle_screen():
 
         for i, option in enumerate(PAUSE_OPTIONS):
             color = YELLOW if i == pause_menu_index else WHITE
-            txt = font_small.render(option, True, color)
+            txt = text_cache.render(font_small, option, True, color)
             txt_rect = txt.get_rect(midleft=(panel_rect.x + 40, row_y + i * row_h))
             screen.blit(txt, txt_rect)
 
-        hint = font_small.render(
+        hint = text_cache.render(
+            font_small,
             "↑/↓: Move   ENTER: Select   ESC: Resume",
             True,
             WHITE,
@@ -2008,6 +931,8 @@ def draw_battle_screen():
         )
         screen.blit(hint, hint_rect)
 
+
+def _draw_end_overlay():
     # ---------- END OVERLAY ----------
     if battle_state == "END":
         overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
@@ -2017,11 +942,12 @@ def draw_battle_screen():
         if winner == "HERO":
             if end_step == 0:
                 # Phase 0: Simple Victory prompt
-                title = font_big.render("Victory!", True, WHITE)
+                title = text_cache.render(font_big, "Victory!", True, WHITE)
                 title_rect = title.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 40))
                 screen.blit(title, title_rect)
 
-                prompt = font_small.render(
+                prompt = text_cache.render(
+                    font_small,
                     "Press any key for results   (ESC: Quit)",
                     True,
                     WHITE,
@@ -2043,7 +969,7 @@ def draw_battle_screen():
                 pygame.draw.rect(screen, (15, 15, 35), panel_rect)
                 pygame.draw.rect(screen, WHITE, panel_rect, 2)
 
-                title = font_med.render("Battle Results", True, WHITE)
+                title = text_cache.render(font_med, "Battle Results", True, WHITE)
                 title_rect = title.get_rect(
                     midtop=(panel_rect.centerx, panel_rect.y + 10)
                 )
@@ -2061,7 +987,8 @@ def draw_battle_screen():
                             state = results_anim_state[idx]
 
                         # Name + level
-                        name_txt = font_small.render(
+                        name_txt = text_cache.render(
+                            font_small,
                             f"{r['name']}  LV {r['level_before']}→{r['level_after']}",
                             True,
                             WHITE,
@@ -2072,7 +999,9 @@ def draw_battle_screen():
                         shown_xp = r["xp"]
                         if state is not None:
                             shown_xp = state["xp_display"]
-                        xp_txt = font_small.render(f"+{shown_xp} XP", True, YELLOW)
+                        xp_txt = text_cache.render(
+                            font_small, f"+{shown_xp} XP", True, YELLOW
+                        )
                         screen.blit(xp_txt, (panel_rect.x + 20, row_y + 18))
 
                         # XP bar
@@ -2102,7 +1031,8 @@ def draw_battle_screen():
                 loot_y = title_rect.bottom + 10 + 40 * len(post_battle_results or [])
                 loot_y += 8
 
-                gold_line = font_small.render(
+                gold_line = text_cache.render(
+                    font_small,
                     f"Gold found: {post_battle_gold}",
                     True,
                     WHITE,
@@ -2111,17 +1041,22 @@ def draw_battle_screen():
                 loot_y += 20
 
                 if post_battle_items:
-                    items_title = font_small.render("Items found:", True, WHITE)
+                    items_title = text_cache.render(
+                        font_small, "Items found:", True, WHITE
+                    )
                     screen.blit(items_title, (panel_rect.x + 20, loot_y))
                     loot_y += 18
 
                     for item_id, qty in post_battle_items:
                         item_name = gd.ITEMS.get(item_id, {}).get("name", item_id)
-                        line = font_small.render(f"- {item_name} x{qty}", True, WHITE)
+                        line = text_cache.render(
+                            font_small, f"- {item_name} x{qty}", True, WHITE
+                        )
                         screen.blit(line, (panel_rect.x + 40, loot_y))
                         loot_y += 18
 
-                prompt = font_small.render(
+                prompt = text_cache.render(
+                    font_small,
                     "Any key: Inventory   (ESC: Quit)",
                     True,
                     WHITE,
@@ -2145,21 +1080,19 @@ def draw_battle_screen():
                 pygame.draw.rect(screen, (10, 15, 30), panel_rect)
                 pygame.draw.rect(screen, WHITE, panel_rect, 2)
 
-                title = font_med.render("Inventory", True, WHITE)
+                title = text_cache.render(font_med, "Inventory", True, WHITE)
                 title_rect = title.get_rect(
                     midtop=(panel_rect.centerx, panel_rect.y + 10)
                 )
                 screen.blit(title, title_rect)
 
                 # Build a sorted list of items from the inventory
-                items = [
-                    (item_id, qty) for item_id, qty in inv.inventory.items() if qty > 0
-                ]
-                items.sort(key=lambda t: gd.ITEMS.get(t[0], {}).get("name", t[0]))
+                items = get_inventory_items()
 
                 # If empty:
                 if not items:
-                    empty_txt = font_small.render(
+                    empty_txt = text_cache.render(
+                        font_small,
                         "You don't have any items yet.",
                         True,
                         WHITE,
@@ -2184,18 +1117,18 @@ def draw_battle_screen():
                         line_text = f"{item_name}  x{qty}"
                         color = YELLOW if idx == inventory_menu_index else WHITE
 
-                        line = font_small.render(line_text, True, color)
+                        line = text_cache.render(font_small, line_text, True, color)
                         screen.blit(line, (list_x, list_y + draw_i * row_h))
 
                     # Scroll hints
                     if inventory_scroll > 0:
-                        up_txt = font_small.render("↑", True, WHITE)
+                        up_txt = text_cache.render(font_small, "↑", True, WHITE)
                         screen.blit(
                             up_txt,
                             (panel_rect.right - 30, list_y),
                         )
                     if end < len(items):
-                        dn_txt = font_small.render("↓", True, WHITE)
+                        dn_txt = text_cache.render(font_small, "↓", True, WHITE)
                         screen.blit(
                             dn_txt,
                             (
@@ -2204,8 +1137,9 @@ def draw_battle_screen():
                             ),
                         )
 
-                prompt = font_small.render(
-                    "ESC: Quit   ENTER/SPACE: Next battle",
+                prompt = text_cache.render(
+                    font_small,
+                    "ESC: Quit   ENTER/SPACE: Continue",
                     True,
                     WHITE,
                 )
@@ -2217,15 +1151,16 @@ def draw_battle_screen():
         else:
             # Defeat or Escape – keep it simple
             if winner == "ENEMY":
-                result_text = font_big.render("Defeat...", True, WHITE)
+                result_text = text_cache.render(font_big, "Defeat...", True, WHITE)
             else:
-                result_text = font_big.render("Escaped", True, WHITE)
+                result_text = text_cache.render(font_big, "Escaped", True, WHITE)
 
             result_rect = result_text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
             screen.blit(result_text, result_rect)
 
-            small = font_small.render(
-                "ESC: Quit   Any other key: Next battle",
+            small = text_cache.render(
+                font_small,
+                "ESC: Quit   Any other key: Continue",
                 True,
                 WHITE,
             )
@@ -2233,14 +1168,182 @@ def draw_battle_screen():
             screen.blit(small, small_rect)
 
 
-def start_new_battle():
-    """Reset battle state and spawn a new random enemy group."""
-    global menu_index, battle_state, enemies, message_log, winner
+def draw_battle_screen():
+    """Redraw the whole battle screen (see present_battle_screen())."""
+    screen.blit(get_stage_layer(), (0, 0))
+    _draw_enemies()
+    _draw_heroes()
+    _draw_battle_log()
+    _draw_damage_popups()
+    _draw_party_panel()
+    _draw_command_menu()
+    _draw_pause_overlay()
+    _draw_end_overlay()
+
+
+# --- Dirty-rect presentation ---
+# The screen is split into regions that don't overlap. Each frame a region
+# is redrawn (stage layer first, then its contents) only when the state it
+# shows has changed, and only those rects are sent to the display.
+_region_states = {}  # region name -> state shown on screen
+_full_redraw = True
+
+# States that cover the whole screen: redrawn and flipped every frame
+FULL_SCREEN_STATES = ("PAUSE_MENU", "END")
+
+
+def _enemy_region_state():
+    return (
+        target_index if battle_state == "TARGET_SELECT" else None,
+        tuple((e.name, e.is_alive()) for e in enemies[:3]),
+        tuple((id(p["surface"]), int(p["x"]), int(p["y"])) for p in damage_popups),
+    )
+
+
+def _active_hero_highlight():
+    if battle_state in ("PLAYER_CHOICE", "SKILL_MENU", "TARGET_SELECT"):
+        return current_hero_index
+    return None
+
+
+def _hero_region_state():
+    return (
+        _active_hero_highlight(),
+        tuple((h.name, h.is_alive()) for h in party[:3]),
+    )
+
+
+def _log_region_state():
+    return message_log.total, message_log.scroll
+
+
+def _party_region_state():
+    return (
+        _active_hero_highlight(),
+        ally_target_index if battle_state == "ITEM_TARGET" else None,
+        tuple(
+            (h.name, h.level, h.hp, h.max_hp, h.mp, h.max_mp, h.xp, h.xp_to_next)
+            for h in party
+        ),
+    )
+
+
+def _menu_region_state():
+    actor = get_active_hero()
+    return (
+        battle_state,
+        menu_index,
+        skill_index,
+        skill_scroll,
+        item_index,
+        item_scroll,
+        actor.name,
+        actor.level,
+        actor.attack,
+        actor.magic,
+        tuple(get_inventory_items()) if battle_state == "ITEM_MENU" else None,
+    )
+
+
+def _draw_enemy_side():
+    _draw_enemies()
+    _draw_damage_popups()  # popups float up the enemy column
+
+
+_field_bottom = BATTLE_FIELD_RECT.bottom
+BATTLE_REGIONS = (
+    # name, screen rect, state function, draw function
+    (
+        "enemies",
+        pygame.Rect(0, 0, BATTLE_LOG_RECT.x, _field_bottom),
+        _enemy_region_state,
+        _draw_enemy_side,
+    ),
+    (
+        "heroes",
+        pygame.Rect(
+            BATTLE_LOG_RECT.right, 0, WIDTH - BATTLE_LOG_RECT.right, _field_bottom
+        ),
+        _hero_region_state,
+        _draw_heroes,
+    ),
+    (
+        "log",
+        pygame.Rect(
+            BATTLE_LOG_RECT.x, 0, BATTLE_LOG_RECT.width, BATTLE_LOG_RECT.bottom + 24
+        ),
+        _log_region_state,
+        _draw_battle_log,
+    ),
+    (
+        "party",
+        pygame.Rect(0, _bottom_y, BATTLE_SPLIT_X, HEIGHT - _bottom_y),
+        _party_region_state,
+        _draw_party_panel,
+    ),
+    (
+        "menu",
+        pygame.Rect(
+            BATTLE_SPLIT_X, _bottom_y, WIDTH - BATTLE_SPLIT_X, HEIGHT - _bottom_y
+        ),
+        _menu_region_state,
+        _draw_command_menu,
+    ),
+)
+
+
+def invalidate_battle_screen():
+    """Force the next present_battle_screen() to redraw everything."""
+    global _full_redraw
+    _full_redraw = True
+
+
+def present_battle_screen():
+    """
+    Draw this frame and put it on the display.
+
+    Only regions whose state changed are redrawn and updated with
+    pygame.display.update(rects); full-screen overlays (pause, results)
+    fall back to a full redraw and flip.
+    """
+    global _full_redraw
+
+    if _full_redraw or battle_state in FULL_SCREEN_STATES:
+        draw_battle_screen()
+        pygame.display.flip()
+        _region_states.clear()
+        for name, _rect, state_fn, _draw_fn in BATTLE_REGIONS:
+            _region_states[name] = state_fn()
+        # Coming back from an overlay needs one more full frame
+        _full_redraw = battle_state in FULL_SCREEN_STATES
+        return
+
+    stage = get_stage_layer()
+    dirty = []
+    for name, rect, state_fn, draw_fn in BATTLE_REGIONS:
+        state = state_fn()
+        if _region_states.get(name) == state:
+            continue
+        _region_states[name] = state
+
+        screen.set_clip(rect)
+        screen.blit(stage, rect, rect)
+        draw_fn()
+        screen.set_clip(None)
+        dirty.append(rect)
+
+    if dirty:
+        pygame.display.update(dirty)
+
+
+def start_new_battle(enemy_group=None):
+    """Reset battle state and spawn `enemy_group` (or a new random group)."""
+    global menu_index, battle_state, enemies, winner
     global target_index, pending_action, selected_skill, skill_index
-    global current_hero_index, party_acted_this_round
+    global current_hero_index, sim, recorder
     global end_step, post_battle_results
     global selected_item, item_index, item_scroll, ally_target_index
-    global post_battle_gold, post_battle_items
+    global post_battle_xp, post_battle_gold, post_battle_items
     global inventory_menu_index, inventory_scroll
 
     # NEW: sync equipment to stats at the start of each battle
@@ -2252,6 +1355,7 @@ def start_new_battle():
     # reset end-phase
     end_step = 0
     post_battle_results = None
+    post_battle_xp = 0
     post_battle_gold = 0
     post_battle_items = []
 
@@ -2260,12 +1364,11 @@ def start_new_battle():
     inventory_scroll = 0
 
     # reset turn tracker
-    party_acted_this_round = set()
     current_hero_index = 0
 
     menu_index = 0
     battle_state = "PLAYER_CHOICE"
-    message_log = []
+    message_log.clear()
     winner = None
 
     pending_action = None
@@ -2279,18 +1382,12 @@ def start_new_battle():
     ally_target_index = 0
 
     # Restore hero/party HP/MP and reset per-battle performance counters
-    for member in party:
-        member.hp = member.max_hp
-        member.mp = member.max_mp
-        member.defending = False
-        member.statuses.clear()
-        member.battle_damage_dealt = 0
-        member.battle_damage_taken = 0
-        member.battle_kills = 0
-        member.battle_status_inflicted = 0
-
-    # New random enemy group
-    enemies[:] = pick_enemy_group()
+    battle_sim.reset_for_battle(party)
+
+    # New enemy group (random unless the caller supplied one)
+    if enemy_group is None:
+        enemy_group = pick_enemy_group()
+    enemies[:] = enemy_group
 
     # add these 4 lines here (this fixes poison/bleed carrying over!)
     hero.statuses.clear()  # Clear hero statuses (future-proof)
@@ -2300,6 +1397,18 @@ def start_new_battle():
         enemy.statuses.clear()
         enemy.battle_damage_taken = 0
 
+    sim = BattleSim(
+        party,
+        enemies,
+        seed=rng_streams.next_seed(),
+        inventory=inv.inventory,
+        on_message=add_message,
+        on_damage=spawn_enemy_damage_popup,
+    )
+    current_hero_index = sim.current
+    recorder = BattleRecorder(sim)
+    invalidate_battle_screen()
+
     if len(enemies) == 1:
         add_message(f"A wild {enemies[0].name} appears!")
     else:
@@ -2307,22 +1416,166 @@ def start_new_battle():
         add_message(f"Enemies appear: {names}!")
 
 
-def main():
-    global menu_index, battle_state, enemies, message_log, winner
+class BattleResult:
+    """What happened in one battle, as returned by run_battle()."""
+
+    def __init__(self, winner=None, xp=0, gold=0, items=None, quit_requested=False):
+        self.winner = winner  # "HERO", "ENEMY", "ESCAPE" (None if abandoned)
+        self.xp = xp  # total XP shared by the party
+        self.gold = gold
+        self.items = items or []  # list of (item_id, qty)
+        # Player asked to quit (window close, pause-menu Quit, ESC on end screens)
+        self.quit_requested = quit_requested
+
+
+def _finish_battle(quit_requested=False):
+    """Build the BattleResult for the battle that is ending."""
+    return BattleResult(
+        winner=winner,
+        xp=post_battle_xp,
+        gold=post_battle_gold,
+        items=list(post_battle_items),
+        quit_requested=quit_requested,
+    )
+
+
+def _request_app_quit():
+    """Re-post QUIT so the caller's own loop (e.g. the overworld) shuts down."""
+    pygame.event.post(pygame.event.Event(pygame.QUIT))
+    return _finish_battle(quit_requested=True)
+
+
+def run_battle(battle_party=None, enemy_group=None):
+    """
+    Run one battle in-process and return a BattleResult.
+
+    Reuses the already-open display window (resizing it to the battle layout
+    if needed) and the live party / inventory_state objects, so XP, gold and
+    loot earned here persist once the battle returns.
+
+    - battle_party: list of Entity to fight with (defaults to `party`)
+    - enemy_group: list of Entity to fight (defaults to a random group)
+    """
+    caller_surface = pygame.display.get_surface()
+    caller_size = caller_surface.get_size() if caller_surface else None
+    caller_caption = pygame.display.get_caption()
+
+    init_display()
+
+    if battle_party is not None:
+        party[:] = battle_party
+
+    start_new_battle(enemy_group)
+    try:
+        return _battle_loop()
+    finally:
+        # Keep the shared party state in sync with what happened in battle
+        sync_party_to_shared_state()
+        _save_last_replay()
+
+        if caller_size is not None and caller_size != (WIDTH, HEIGHT):
+            pygame.display.set_mode(caller_size)
+        if caller_caption:
+            pygame.display.set_caption(*caller_caption)
+
+
+def _save_last_replay():
+    """Write the battle that just ended to LAST_REPLAY_PATH (for bug reports)."""
+    if recorder is None:
+        return
+    try:
+        recorder.save(LAST_REPLAY_PATH)
+    except OSError:
+        pass  # a replay is a nice-to-have; never break the game over it
+
+
+def play_replay(replay, speed=1):
+    """
+    Watch a recorded battle (replay.Replay) on the battle screen.
+
+    speed: 1, 4 or 16. ESC stops early. Plays on copies of the recorded
+    combatants, so the live party, gold and inventory are left untouched.
+    """
+    global sim, battle_state, winner, menu_index
+    global end_step, post_battle_results, damage_popups
+
+    init_display()
+    saved_party, saved_enemies, saved_sim = party[:], enemies[:], sim
+
+    message_log.clear()
+    damage_popups = []
+    post_battle_results = None
+    end_step = 0
+    menu_index = 0
+    battle_state = "PLAYER_CHOICE"
+    winner = None
+
+    sim = replay.build_sim(on_message=add_message, on_damage=spawn_enemy_damage_popup)
+    invalidate_battle_screen()
+    party[:] = sim.party
+    enemies[:] = sim.enemies
+    _sync_from_sim(bank_rewards=False)
+
+    policy = replay.policy()
+    frames_per_step = max(1, REPLAY_STEP_FRAMES // speed)
+    timer = 0
+    end_hold = 120  # frames to linger on the final screen
+
+    try:
+        while end_hold > 0:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.event.post(pygame.event.Event(pygame.QUIT))
+                    return sim
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    return sim
+
+            finished = sim.winner is not None or (
+                sim.phase == "PARTY" and sim.turns >= len(replay.actions)
+            )
+            if finished:
+                end_hold -= 1
+            else:
+                timer += 1
+                if timer >= frames_per_step:
+                    timer = 0
+                    sim.step(policy)
+                    _sync_from_sim(bank_rewards=False)
+
+            update_damage_popups()
+            present_battle_screen()
+            clock.tick(60)
+
+        return sim
+    finally:
+        party[:] = saved_party
+        enemies[:] = saved_enemies
+        sim = saved_sim
+
+
+def _battle_loop():
+    """Event / update / draw loop for the current battle."""
+    global menu_index, battle_state, enemies, winner
     global target_index, pending_action, selected_skill, skill_index, skill_scroll
     global selected_item, item_index, item_scroll, ally_target_index
     global pause_menu_index
 
-    # Start the first battle
-    start_new_battle()
-
-    running = True
-
-    while running:
+    while True:
         # ----- HANDLE EVENTS -----
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                running = False
+                return _request_app_quit()
+
+            # Log scrollback works in every state
+            if event.type == pygame.KEYDOWN and event.key in (
+                pygame.K_PAGEUP,
+                pygame.K_PAGEDOWN,
+            ):
+                step = LOG_VISIBLE_LINES - 1
+                if event.key == pygame.K_PAGEDOWN:
+                    step = -step
+                message_log.scroll_by(step, LOG_VISIBLE_LINES)
+                continue
 
             # ----- PLAYER CHOICE STATE -----
             if battle_state == "PLAYER_CHOICE":
@@ -2376,8 +1629,7 @@ def main():
                         if choice == "Resume":
                             battle_state = "PLAYER_CHOICE"
                         elif choice == "Quit":
-                            pygame.quit()
-                            sys.exit()
+                            return _request_app_quit()
                     elif event.key == pygame.K_ESCAPE:
                         battle_state = "PLAYER_CHOICE"
 
@@ -2556,18 +1808,11 @@ def main():
                     # INVENTORY PHASE (end_step == 2) has special controls
                     if winner == "HERO" and end_step == 2:
                         if event.key == pygame.K_ESCAPE:
-                            running = False
+                            return _finish_battle(quit_requested=True)
 
                         else:
                             # Rebuild the same item list we draw, to know its length
-                            items = [
-                                (item_id, qty)
-                                for item_id, qty in inv.inventory.items()
-                                if qty > 0
-                            ]
-                            items.sort(
-                                key=lambda t: gd.ITEMS.get(t[0], {}).get("name", t[0])
-                            )
+                            items = get_inventory_items()
 
                             if event.key == pygame.K_UP and items:
                                 inventory_menu_index = (inventory_menu_index - 1) % len(
@@ -2591,16 +1836,14 @@ def main():
                                     )
 
                             elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
-                                # Sync party state back to shared module before next battle
-                                sync_party_to_shared_state()
-                                # For now: inventory is view-only, ENTER starts next battle
-                                start_new_battle()
+                                # For now: inventory is view-only, ENTER ends the battle
+                                return _finish_battle()
 
                             # Any other keys during inventory we just ignore
                     else:
                         # Normal END behavior for Victory/Results/Defeat/Escape
                         if event.key == pygame.K_ESCAPE:
-                            running = False
+                            return _finish_battle(quit_requested=True)
                         else:
                             if winner == "HERO":
                                 if end_step == 0:
@@ -2613,11 +1856,10 @@ def main():
                                     inventory_scroll = 0
                                 else:
                                     # Shouldn't really happen, but just in case
-                                    start_new_battle()
+                                    return _finish_battle()
                             else:
-                                # Defeat / Escape: sync and restart immediately
-                                sync_party_to_shared_state()
-                                start_new_battle()
+                                # Defeat / Escape: battle is over
+                                return _finish_battle()
 
         # ----- ENEMY TURN (no input needed) -----
         if battle_state == "ENEMY_TURN":
@@ -2628,10 +1870,17 @@ def main():
         update_results_animation()  # animate XP numbers + bars on results screen
 
         # ----- DRAW FRAME -----
-        draw_battle_screen()
-        pygame.display.flip()
+        present_battle_screen()
         clock.tick(60)
 
+
+def main():
+    """Standalone battle prototype: fight random battles until the player quits."""
+    while True:
+        result = run_battle()
+        if result.quit_requested:
+            break
+
     pygame.quit()
     sys.exit()
 
@@ -0,0 +1,336 @@
+# enemies.py
+"""
+Enemy data: stats, spawn rules, rewards and what each type does on its turn.
+
+ENEMY_BLUEPRINTS holds one record per enemy type: spawn gating/rarity plus
+base stats, XP, gold range and drops. battle_sim.create_enemy() builds a
+scaled prototype from it once per (type, level) and clones that on spawn.
+encounter_sampler(level) returns a cached alias-method sampler for the
+types unlocked at that level.
+
+ENEMY_BEHAVIORS is plain data - a weighted list of action records per enemy
+type. It is compiled once at import into BEHAVIOR_TABLE, so picking an
+action is one dict lookup plus one weighted draw. Call compile_behaviors()
+again after editing ENEMY_BEHAVIORS at runtime.
+
+Action record fields:
+    weight          relative chance of picking this action
+    damage          "physical", "magic" or None (no damage)
+    bonus           flat damage added on top of the formula
+    message         log line; {user}, {target} and {dmg} are filled in
+    inflict         status name to apply (optional)
+    chance          chance to apply it (1.0 = always, no roll)
+    duration/power  status duration and power
+    status_message  log line when the status lands (optional)
+"""
+
+from bisect import bisect_right
+
+# --- Enemy blueprints (level gating + rarity + stats) ---
+# min_level / weight: spawn gating and rarity (higher weight = more common)
+# stats: (max_hp, max_mp, attack, magic, defense, speed)
+# gold: (min, max); drops: (item_id, chance) pairs
+
+ENEMY_BLUEPRINTS = [
+    {
+        "type": "Slime",
+        "min_level": 1,
+        "weight": 40,
+        "stats": (35, 0, 8, 0, 2, 5),
+        "xp": 10,
+        "gold": (3, 6),
+        "drops": (("Potion", 0.20),),
+    },
+    {
+        # Fast, fragile, slightly trickier damage
+        "type": "Bat",
+        "min_level": 2,
+        "weight": 30,
+        "stats": (25, 0, 9, 0, 1, 14),
+        "xp": 14,
+        "gold": (5, 9),
+        "drops": (("Potion", 0.10),),
+    },
+    {
+        # Tougher, hits a little harder
+        "type": "Cultist",
+        "min_level": 3,
+        "weight": 25,
+        "stats": (45, 10, 11, 0, 3, 8),
+        "xp": 20,
+        "gold": (8, 15),
+        "drops": (("Potion", 0.25),),
+    },
+    {
+        # Chunky HP, decent attack, kinda slow
+        "type": "Ghoul",
+        "min_level": 4,
+        "weight": 20,
+        "stats": (60, 0, 12, 0, 3, 7),
+        "xp": 28,
+        "gold": (10, 20),
+        "drops": (("Potion", 0.15),),
+    },
+    {
+        # Faster, stronger, “elite” feeling
+        "type": "Vampire Thrall",
+        "min_level": 6,
+        "weight": 15,
+        "stats": (55, 5, 14, 5, 4, 12),
+        "xp": 35,
+        "gold": (15, 25),
+        "drops": (("Potion", 0.30),),
+    },
+    {
+        "type": "Shadow Fiend",
+        "min_level": 8,
+        "weight": 10,
+        "stats": (40, 15, 9, 16, 2, 13),
+        "xp": 40,
+        "gold": (20, 30),
+        "drops": (("Potion", 0.35),),
+    },
+]
+
+# Stats for any type without a blueprint
+UNKNOWN_ENEMY = {
+    "type": "Unknown",
+    "stats": (30, 0, 7, 0, 2, 5),
+    "xp": 8,
+    "gold": (3, 6),
+    "drops": (),
+}
+
+BLUEPRINTS_BY_TYPE = {bp["type"]: bp for bp in ENEMY_BLUEPRINTS}
+
+
+def get_blueprint(enemy_type: str) -> dict:
+    return BLUEPRINTS_BY_TYPE.get(enemy_type, UNKNOWN_ENEMY)
+
+
+def reindex_blueprints():
+    """Rebuild lookups after editing ENEMY_BLUEPRINTS."""
+    BLUEPRINTS_BY_TYPE.clear()
+    for bp in ENEMY_BLUEPRINTS:
+        BLUEPRINTS_BY_TYPE[bp["type"]] = bp
+    clear_encounter_samplers()
+
+
+
+# --- Encounter sampling ---
+
+
+class AliasTable:
+    """
+    Vose's alias method: O(1) weighted draws after O(n) setup.
+
+    draw() uses a single rng.random() call: the integer part picks a column,
+    the fractional part decides between the column and its alias.
+    """
+
+    __slots__ = ("n", "prob", "alias")
+
+    def __init__(self, weights):
+        n = len(weights)
+        total = float(sum(weights))
+        scaled = [w * n / total for w in weights]
+
+        self.n = n
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            s_i = small.pop()
+            l_i = large.pop()
+            self.prob[s_i] = scaled[s_i]
+            self.alias[s_i] = l_i
+            scaled[l_i] = (scaled[l_i] + scaled[s_i]) - 1.0
+            (small if scaled[l_i] < 1.0 else large).append(l_i)
+
+        # Whatever is left is 1.0 up to rounding error
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    def draw(self, rng) -> int:
+        u = rng.random() * self.n
+        i = int(u)
+        return i if u - i < self.prob[i] else self.alias[i]
+
+    def draw_many(self, count: int, np_rng):
+        """`count` indices as a NumPy array, drawn from a numpy Generator."""
+        import numpy as np
+
+        u = np_rng.random(count) * self.n
+        cols = u.astype(np.int64)
+        keep = (u - cols) < np.asarray(self.prob)[cols]
+        return np.where(keep, cols, np.asarray(self.alias)[cols])
+
+
+class EncounterSampler:
+    """Weighted enemy-type sampler for one level band."""
+
+    __slots__ = ("types", "table")
+
+    def __init__(self, blueprints):
+        self.types = tuple(bp["type"] for bp in blueprints)
+        self.table = AliasTable([bp["weight"] for bp in blueprints])
+
+    def draw(self, rng) -> str:
+        return self.types[self.table.draw(rng)]
+
+
+# Sorted min_level thresholds; a level's band is how many it has reached
+_band_thresholds = []
+# band -> EncounterSampler, built on first use
+_encounter_samplers = {}
+
+
+def clear_encounter_samplers():
+    """Drop cached samplers (call after editing ENEMY_BLUEPRINTS)."""
+    _encounter_samplers.clear()
+    _band_thresholds[:] = sorted(bp["min_level"] for bp in ENEMY_BLUEPRINTS)
+
+
+def encounter_sampler(level: int) -> EncounterSampler:
+    """The sampler for every enemy type unlocked at `level`."""
+    band = bisect_right(_band_thresholds, level)
+    sampler = _encounter_samplers.get(band)
+    if sampler is None:
+        candidates = [bp for bp in ENEMY_BLUEPRINTS if level >= bp["min_level"]]
+        if not candidates:
+            # Failsafe: always at least Slime
+            candidates = [ENEMY_BLUEPRINTS[0]]
+        sampler = _encounter_samplers[band] = EncounterSampler(candidates)
+    return sampler
+
+
+clear_encounter_samplers()
+
+
+# --- Enemy behaviors ---
+
+ENEMY_BEHAVIORS = {
+    "Slime": [
+        {"weight": 100, "damage": "physical",
+         "message": "{user} slaps {target} for {dmg} damage!"},
+    ],
+    "Bat": [
+        {"weight": 30, "damage": "physical",
+         "message": "{user} sinks its fangs into {target} for {dmg} damage!",
+         "inflict": "Poison", "chance": 0.60, "duration": 3, "power": 2,
+         "status_message": "{target} is afflicted with poison!"},
+        {"weight": 70, "damage": "physical",
+         "message": "{user} bites {target} for {dmg} damage!"},
+    ],
+    "Cultist": [
+        {"weight": 35, "damage": "physical",
+         "message": "{user} casts a blood hex on {target} for {dmg} damage!",
+         "inflict": "Bleed", "chance": 0.70, "duration": 3, "power": 3,
+         "status_message": "{target} starts bleeding!"},
+        {"weight": 25, "damage": None,
+         "message": "{user} binds {target} in shadowy chains!",
+         "inflict": "Stun", "chance": 1.0, "duration": 1, "power": 0},
+        {"weight": 40, "damage": "physical", "bonus": 1,
+         "message": "{user} strikes {target} for {dmg} damage!"},
+    ],
+    "Ghoul": [
+        {"weight": 70, "damage": "physical",
+         "message": "{user} claws {target} for {dmg} damage!"},
+        {"weight": 30, "damage": "physical",
+         "message": "{user} sinks rotten teeth into {target} for {dmg} damage!",
+         "inflict": "Poison", "chance": 0.50, "duration": 3, "power": 3,
+         "status_message": "{target} is afflicted with poison!"},
+    ],
+    "Vampire Thrall": [
+        {"weight": 55, "damage": "physical",
+         "message": "{user} slashes {target} for {dmg} damage!"},
+        {"weight": 30, "damage": "physical", "bonus": 2,
+         "message": "{user} tears into {target} for {dmg} damage!",
+         "inflict": "Bleed", "chance": 0.60, "duration": 3, "power": 4,
+         "status_message": "{target} starts bleeding!"},
+        {"weight": 15, "damage": None,
+         "message": "{user} fixes {target} with a hypnotic stare!",
+         "inflict": "Stun", "chance": 1.0, "duration": 1, "power": 0},
+    ],
+    "Shadow Fiend": [
+        {"weight": 50, "damage": "magic",
+         "message": "{user} hurls a shadow bolt at {target} for {dmg} damage!"},
+        {"weight": 25, "damage": "magic",
+         "message": "{user} drains {target}'s strength for {dmg} damage!",
+         "inflict": "Weaken", "chance": 0.70, "duration": 3, "power": 0,
+         "status_message": "{target} is weakened!"},
+        {"weight": 25, "damage": None,
+         "message": "{user} whispers a curse at {target}!",
+         "inflict": "Curse", "chance": 1.0, "duration": 3, "power": 0,
+         "status_message": "{target} is cursed!"},
+    ],
+}
+
+# Used for any enemy type without an entry above
+DEFAULT_BEHAVIOR = [
+    {"weight": 100, "damage": "physical",
+     "message": "{user} attacks {target} for {dmg} damage!"},
+]
+
+
+class EnemyAction:
+    """One compiled action record (see the module docstring)."""
+
+    __slots__ = (
+        "damage",
+        "bonus",
+        "message",
+        "inflict",
+        "chance",
+        "duration",
+        "power",
+        "status_message",
+    )
+
+    def __init__(self, record: dict):
+        self.damage = record.get("damage")
+        self.bonus = record.get("bonus", 0)
+        self.message = record["message"]
+        self.inflict = record.get("inflict")
+        self.chance = record.get("chance", 0.0)
+        self.duration = record.get("duration", 0)
+        self.power = record.get("power", 0)
+        self.status_message = record.get("status_message")
+
+
+def _compile(records):
+    """-> (actions, cumulative probabilities) for one enemy type."""
+    actions = tuple(EnemyAction(r) for r in records)
+    total = sum(r["weight"] for r in records)
+
+    cum = []
+    running = 0
+    for r in records:
+        running += r["weight"]
+        cum.append(running / total)
+    return actions, cum
+
+
+BEHAVIOR_TABLE = {}
+_DEFAULT = _compile(DEFAULT_BEHAVIOR)
+
+
+def compile_behaviors():
+    """(Re)build BEHAVIOR_TABLE from ENEMY_BEHAVIORS."""
+    BEHAVIOR_TABLE.clear()
+    for enemy_type, records in ENEMY_BEHAVIORS.items():
+        BEHAVIOR_TABLE[enemy_type] = _compile(records)
+
+
+def choose_action(enemy_type: str, rng) -> EnemyAction:
+    """Pick this turn's action for `enemy_type` (one lookup, at most one roll)."""
+    actions, cum = BEHAVIOR_TABLE.get(enemy_type, _DEFAULT)
+    if len(actions) == 1:
+        return actions[0]
+    return actions[bisect_right(cum, rng.random())]
+
+
+compile_behaviors()
@@ -8,82 +8,11 @@ Both combat.py and world.py should import this module.
 GOLD = 50  # starting gold, tweak as you like
 
 
-# -----------------------------------------------
-# WEAPON & ARMOR DEFINITIONS (NEW SYSTEM)
-# -----------------------------------------------
-
-WEAPONS = {
-    "Rusty Sword": {
-        "price": 10,
-        "attack": 2,
-        "defense": 0,
-        "allowed_jobs": ["Hero", "Warrior"],
-    },
-    "Steel Sword": {
-        "price": 45,
-        "attack": 6,
-        "defense": 0,
-        "allowed_jobs": ["Hero", "Warrior"],
-    },
-    "Great Axe": {
-        "price": 80,
-        "attack": 10,
-        "defense": -1,
-        "allowed_jobs": ["Warrior"],
-    },
-    "Wizard Staff": {
-        "price": 40,
-        "attack": 1,
-        "magic": 5,
-        "defense": 0,
-        "allowed_jobs": ["Mage"],
-    },
-}
-
-ARMOR = {
-    "Cloth Robe": {
-        "price": 18,
-        "defense": 2,
-        "magic": 1,
-        "allowed_jobs": ["Mage"],
-    },
-    "Leather Armor": {
-        "price": 35,
-        "defense": 4,
-        "allowed_jobs": ["Hero", "Warrior"],
-    },
-    "Iron Plate": {
-        "price": 60,
-        "defense": 8,
-        "allowed_jobs": ["Warrior"],
-    },
-}
-
-# -----------------------------------------------
-# SHOP INVENTORY LISTS
-# -----------------------------------------------
-
-ITEM_SHOP_STOCK = [
-    ("Potion", 30),
-    ("Ether", 60),
-]
-
-WEAPON_SHOP_STOCK = [
-    "Rusty Sword",
-    "Steel Sword",
-    "Great Axe",
-    "Wizard Staff",
-]
-
-ARMOR_SHOP_STOCK = [
-    "Cloth Robe",
-    "Leather Armor",
-    "Iron Plate",
-]
-
-
 # ---- ITEM CATALOG ----
-# Use string IDs so we can reference from combat + overworld + shops
+# The one table of item definitions; item_catalog.py indexes it.
+# Use string IDs so we can reference from combat + overworld + shops.
+# Equipment has a "slot" ("weapon" / "armor"), "allowed_jobs" and any of
+# attack_bonus / magic_bonus / defense_bonus (missing bonuses are 0).
 ITEMS = {
     # --- Consumables ---
     "Potion": {
@@ -119,7 +48,7 @@ ITEMS = {
         "type": "weapon",
         "slot": "weapon",
         "attack_bonus": 0,
-        "job": "Hero",
+        "allowed_jobs": ["Hero"],
         "price": 0,
         "desc": "A basic bronze blade for beginners.",
     },
@@ -128,7 +57,7 @@ ITEMS = {
         "type": "weapon",
         "slot": "weapon",
         "attack_bonus": 5,
-        "job": "Hero",
+        "allowed_jobs": ["Hero"],
         "price": 150,
         "desc": "A sturdy iron sword with decent edge.",
     },
@@ -137,17 +66,26 @@ ITEMS = {
         "type": "weapon",
         "slot": "weapon",
         "attack_bonus": 10,
-        "job": "Hero",
+        "allowed_jobs": ["Hero"],
         "price": 400,
         "desc": "Forged from fine steel, sharp and deadly.",
     },
+    "Rusty Sword": {
+        "name": "Rusty Sword",
+        "type": "weapon",
+        "slot": "weapon",
+        "attack_bonus": 2,
+        "allowed_jobs": ["Hero", "Warrior"],
+        "price": 10,
+        "desc": "Pitted and dull, but better than bare hands.",
+    },
     # --- Weapons (Warrior) ---
     "Bronze Axe": {
         "name": "Bronze Axe",
         "type": "weapon",
         "slot": "weapon",
         "attack_bonus": 0,
-        "job": "Warrior",
+        "allowed_jobs": ["Warrior"],
         "price": 0,
         "desc": "A crude bronze axe for training.",
     },
@@ -156,7 +94,7 @@ ITEMS = {
         "type": "weapon",
         "slot": "weapon",
         "attack_bonus": 6,
-        "job": "Warrior",
+        "allowed_jobs": ["Warrior"],
         "price": 160,
         "desc": "A heavy iron axe that cleaves through foes.",
     },
@@ -165,10 +103,38 @@ ITEMS = {
         "type": "weapon",
         "slot": "weapon",
         "attack_bonus": 12,
-        "job": "Warrior",
+        "allowed_jobs": ["Warrior"],
         "price": 450,
         "desc": "Massive steel axe with devastating power.",
     },
+    "Wooden Axe": {
+        "name": "Wooden Axe",
+        "type": "weapon",
+        "slot": "weapon",
+        "attack_bonus": 4,
+        "allowed_jobs": ["Warrior"],
+        "price": 0,
+        "desc": "A practice axe carved from hardwood.",
+    },
+    "Battle Axe": {
+        "name": "Battle Axe",
+        "type": "weapon",
+        "slot": "weapon",
+        "attack_bonus": 6,
+        "allowed_jobs": ["Warrior"],
+        "price": 130,
+        "desc": "A well-balanced axe built for war.",
+    },
+    "Great Axe": {
+        "name": "Great Axe",
+        "type": "weapon",
+        "slot": "weapon",
+        "attack_bonus": 10,
+        "defense_bonus": -1,
+        "allowed_jobs": ["Warrior"],
+        "price": 80,
+        "desc": "Huge and slow; hard to guard with.",
+    },
     # --- Weapons (Mage) ---
     "Wooden Staff": {
         "name": "Wooden Staff",
@@ -176,7 +142,7 @@ ITEMS = {
         "slot": "weapon",
         "attack_bonus": 0,
         "magic_bonus": 2,
-        "job": "Mage",
+        "allowed_jobs": ["Mage"],
         "price": 0,
         "desc": "A simple wooden staff for novice mages.",
     },
@@ -186,7 +152,7 @@ ITEMS = {
         "slot": "weapon",
         "attack_bonus": 4,
         "magic_bonus": 5,
-        "job": "Mage",
+        "allowed_jobs": ["Mage"],
         "price": 140,
         "desc": "Silver-tipped staff that channels magic well.",
     },
@@ -196,14 +162,91 @@ ITEMS = {
         "slot": "weapon",
         "attack_bonus": 9,
         "magic_bonus": 10,
-        "job": "Mage",
+        "allowed_jobs": ["Mage"],
         "price": 380,
         "desc": "An ancient staff pulsing with arcane power.",
     },
+    "Apprentice Staff": {
+        "name": "Apprentice Staff",
+        "type": "weapon",
+        "slot": "weapon",
+        "attack_bonus": 2,
+        "allowed_jobs": ["Mage"],
+        "price": 0,
+        "desc": "Issued to every apprentice on their first day.",
+    },
+    "Oak Staff": {
+        "name": "Oak Staff",
+        "type": "weapon",
+        "slot": "weapon",
+        "attack_bonus": 5,
+        "allowed_jobs": ["Mage"],
+        "price": 120,
+        "desc": "A sturdy oak staff.",
+    },
+    "Sage Staff": {
+        "name": "Sage Staff",
+        "type": "weapon",
+        "slot": "weapon",
+        "attack_bonus": 4,
+        "allowed_jobs": ["Mage"],
+        "price": 110,
+        "desc": "Carried by the sages of old.",
+    },
+    "Wizard Staff": {
+        "name": "Wizard Staff",
+        "type": "weapon",
+        "slot": "weapon",
+        "attack_bonus": 1,
+        "magic_bonus": 5,
+        "allowed_jobs": ["Mage"],
+        "price": 40,
+        "desc": "Light in the hand, heavy with magic.",
+    },
+    # --- Armor ---
+    "Cloth Robe": {
+        "name": "Cloth Robe",
+        "type": "armor",
+        "slot": "armor",
+        "defense_bonus": 2,
+        "magic_bonus": 1,
+        "allowed_jobs": ["Mage"],
+        "price": 18,
+        "desc": "A simple robe woven with a faint charm.",
+    },
+    "Leather Armor": {
+        "name": "Leather Armor",
+        "type": "armor",
+        "slot": "armor",
+        "defense_bonus": 4,
+        "allowed_jobs": ["Hero", "Warrior"],
+        "price": 35,
+        "desc": "Boiled leather; light and flexible.",
+    },
+    "Iron Plate": {
+        "name": "Iron Plate",
+        "type": "armor",
+        "slot": "armor",
+        "defense_bonus": 8,
+        "allowed_jobs": ["Warrior"],
+        "price": 60,
+        "desc": "Heavy plate only a warrior can wear.",
+    },
 }
 
-# Legacy WEAPONS dict for backward compatibility (references ITEMS)
+# Legacy WEAPONS / ARMOR dicts for backward compatibility (reference ITEMS)
 WEAPONS = {k: v for k, v in ITEMS.items() if v.get("type") == "weapon"}
+ARMOR = {k: v for k, v in ITEMS.items() if v.get("type") == "armor"}
+
+# -----------------------------------------------
+# SHOP INVENTORY LISTS
+# -----------------------------------------------
+# item ids each shop sells, in display order (keys match INTERIORS)
+SHOP_STOCK = {
+    "ITEM_SHOP": ["Potion", "Hi-Potion", "Ether"],
+    "WEAPON_SHOP": ["Rusty Sword", "Steel Sword", "Great Axe", "Wizard Staff"],
+    "ARMOR_SHOP": ["Cloth Robe", "Leather Armor", "Iron Plate"],
+}
 
 
 # ---- INVENTORY ----
@@ -251,38 +294,34 @@ def remove_item(item_id: str, qty: int = 1) -> bool:
 
 
 # ---- UNIFIED INTERIOR SYSTEM ----
-# Build weapon/armor prices safely
-_weapon_prices = {}
-for name in WEAPON_SHOP_STOCK:
-    if name in WEAPONS:
-        _weapon_prices[name] = WEAPONS[name]["price"]
 
-_armor_prices = {}
-for name in ARMOR_SHOP_STOCK:
-    if name in ARMOR:
-        _armor_prices[name] = ARMOR[name]["price"]
+
+def _shop_prices(shop: str) -> dict:
+    """Buy prices for a shop's stock, taken from ITEMS."""
+    return {name: ITEMS[name]["price"] for name in SHOP_STOCK[shop]}
+
 
 INTERIORS = {
     "ITEM_SHOP": {
         "tile_type": "shop",
         "npc_name": "Shopkeeper",
         "npc_welcome": "Welcome! What do you need?",
-        "inventory": ["Potion", "Hi-Potion", "Ether"],
-        "buy_prices": {"Potion": 30, "Hi-Potion": 90, "Ether": 60},
+        "inventory": list(SHOP_STOCK["ITEM_SHOP"]),
+        "buy_prices": _shop_prices("ITEM_SHOP"),
     },
     "WEAPON_SHOP": {
         "tile_type": "weapon_shop",
         "npc_name": "Armorer",
         "npc_welcome": "Best blades in town!",
-        "inventory": [name for name in WEAPON_SHOP_STOCK if name in WEAPONS],
-        "buy_prices": _weapon_prices,
+        "inventory": list(SHOP_STOCK["WEAPON_SHOP"]),
+        "buy_prices": _shop_prices("WEAPON_SHOP"),
     },
     "ARMOR_SHOP": {
         "tile_type": "armor_shop",
         "npc_name": "Armorer",
         "npc_welcome": "Finest armor available!",
-        "inventory": [name for name in ARMOR_SHOP_STOCK if name in ARMOR],
-        "buy_prices": _armor_prices,
+        "inventory": list(SHOP_STOCK["ARMOR_SHOP"]),
+        "buy_prices": _shop_prices("ARMOR_SHOP"),
     },
     "INN": {
         "tile_type": "inn",
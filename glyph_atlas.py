@@ -0,0 +1,126 @@
+# glyph_atlas.py
+"""
+Glyph-atlas text for numbers and HUD strings that change during play.
+
+A GlyphAtlas renders each character once for one (font, color) pair -
+font objects are per face and size - and builds strings by compositing
+those glyphs instead of calling font.render(). Digits and common HUD
+symbols are pre-rendered; any other character is added the first time it
+is used. Glyphs sit at their own advance, so kerning is not applied: fine
+for numbers and short labels, use font.render() for prose.
+
+Blitting a dozen separate glyphs every frame costs more than one blit, so
+HUD text goes through a slot: draw_hud_text() keeps the last string and
+surface per key and only recomposes when the text changes (an HP value,
+the gold total). A steady HUD costs one blit per line per frame.
+
+    draw_hud_text(("hp", h.name), screen, font_small, WHITE,
+                  f"HP {h.hp}/{h.max_hp}", (x, y))
+"""
+
+import pygame
+
+PRELOAD_CHARS = "0123456789+-/:%.,() "
+
+
+class GlyphAtlas:
+    """Pre-rendered glyphs for one font object and one color."""
+
+    def __init__(self, font, color, chars: str = PRELOAD_CHARS):
+        self.font = font
+        self.color = color
+        self.height = font.get_height()
+        self.glyphs = {}  # char -> Surface
+        self.widths = {}  # char -> advance in pixels
+        for ch in chars:
+            self.add_glyph(ch)
+
+    def add_glyph(self, ch: str):
+        surf = self.font.render(ch, True, self.color)
+        self.glyphs[ch] = surf
+        self.widths[ch] = surf.get_width()
+        return surf
+
+    def size(self, text: str):
+        """(width, height) of `text` when composed from this atlas."""
+        widths = self.widths
+        width = 0
+        for ch in text:
+            if ch not in widths:
+                self.add_glyph(ch)
+            width += widths[ch]
+        return width, self.height
+
+    def render(self, text: str):
+        """A new per-pixel-alpha Surface with `text` composed from glyphs."""
+        out = pygame.Surface(self.size(text), pygame.SRCALPHA)
+        glyphs = self.glyphs
+        widths = self.widths
+        x = 0
+        for ch in text:
+            # MAX onto the transparent surface copies the glyph's pixels as-is
+            out.blit(glyphs[ch], (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            x += widths[ch]
+        return out
+
+
+class HudText:
+    """One HUD string: recomposed from its atlas only when the text changes."""
+
+    __slots__ = ("atlas", "text", "surface")
+
+    def __init__(self, atlas: GlyphAtlas):
+        self.atlas = atlas
+        self.text = None
+        self.surface = None
+
+    def draw(self, surface, text: str, pos, anchor: str = "topleft"):
+        """
+        Blit `text` onto `surface`. `anchor` is a pygame.Rect attribute
+        ("topleft", "center", "topright", ...) that `pos` refers to.
+        Returns the drawn Rect.
+        """
+        if text != self.text:
+            self.text = text
+            self.surface = self.atlas.render(text)
+        rect = self.surface.get_rect(**{anchor: pos})
+        surface.blit(self.surface, rect)
+        return rect
+
+
+# (font, color) -> GlyphAtlas
+_atlases = {}
+# caller key -> HudText
+_hud_slots = {}
+
+
+def get_atlas(font, color) -> GlyphAtlas:
+    """The shared atlas for this font object (face + size) and color."""
+    key = (font, color)
+    atlas = _atlases.get(key)
+    if atlas is None:
+        atlas = _atlases[key] = GlyphAtlas(font, color)
+    return atlas
+
+
+def render_text(font, color, text: str):
+    """`text` composed through the shared atlas (for surfaces kept by the caller)."""
+    return get_atlas(font, color).render(text)
+
+
+def draw_hud_text(key, surface, font, color, text: str, pos, anchor: str = "topleft"):
+    """
+    Draw a HUD string through the slot `key` (any hashable, one per place
+    the string is shown). Returns the drawn Rect.
+    """
+    slot = _hud_slots.get(key)
+    atlas = get_atlas(font, color)
+    if slot is None or slot.atlas is not atlas:
+        slot = _hud_slots[key] = HudText(atlas)
+    return slot.draw(surface, text, pos, anchor)
+
+
+def clear_atlases():
+    """Drop every cached atlas and HUD slot (e.g. after fonts are reloaded)."""
+    _atlases.clear()
+    _hud_slots.clear()
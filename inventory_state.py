@@ -1,5 +1,7 @@
 # inventory_state.py
 
+import item_catalog
+
 # Shared gold pool
 player_gold = 100  # tweak starting value
 
@@ -13,100 +15,16 @@ inventory = {
 
 # --- EQUIPMENT DATA ---------------------------------------------------------
 
-# All weapons the game knows about
-WEAPON_DEFS = {
-    "rusty_sword": {
-        "name": "Rusty Sword",
-        "price": 0,  # starter gear
-        "attack_bonus": 3,
-        "for": "Hero",
-    },
-    "iron_sword": {
-        "name": "Iron Sword",
-        "price": 120,
-        "attack_bonus": 6,
-        "for": "Hero",
-    },
-    "wooden_axe": {
-        "name": "Wooden Axe",
-        "price": 0,
-        "attack_bonus": 4,
-        "for": "Warrior",
-    },
-    "bronze_axe": {
-        "name": "Bronze Axe",
-        "price": 120,
-        "attack_bonus": 7,
-        "for": "Warrior",
-    },
-    "apprentice_staff": {
-        "name": "Apprentice Staff",
-        "price": 0,
-        "attack_bonus": 2,
-        "for": "Mage",
-    },
-    "oak_staff": {
-        "name": "Oak Staff",
-        "price": 120,
-        "attack_bonus": 5,
-        "for": "Mage",
-    },
-}
-
-# Legacy WEAPONS dict for backwards compatibility with existing code
-WEAPONS = {
-    "Rusty Sword": {
-        "job": "Hero",
-        "atk_bonus": 0,
-        "price": 0,
-    },
-    "Bronze Sword": {
-        "job": "Hero",
-        "atk_bonus": 3,
-        "price": 50,
-    },
-    "Iron Sword": {
-        "job": "Hero",
-        "atk_bonus": 6,
-        "price": 120,
-    },
-    "Wooden Axe": {
-        "job": "Warrior",
-        "atk_bonus": 2,
-        "price": 40,
-    },
-    "Battle Axe": {
-        "job": "Warrior",
-        "atk_bonus": 6,
-        "price": 130,
-    },
-    "Apprentice Staff": {
-        "job": "Mage",
-        "atk_bonus": 1,
-        "price": 30,
-    },
-    "Sage Staff": {
-        "job": "Mage",
-        "atk_bonus": 4,
-        "price": 110,
-    },
-}
+# Weapon definitions live in game_data.ITEMS (see item_catalog.py)
 
-# What each character currently has equipped (by weapon_id).
+# What each character currently has equipped (by item_id).
 # These should match what your Status screen currently shows.
 equipped_weapons = {
-    "Hero": "rusty_sword",
-    "Warrior": "wooden_axe",
-    "Mage": "apprentice_staff",
+    "Hero": "Rusty Sword",
+    "Warrior": "Wooden Axe",
+    "Mage": "Apprentice Staff",
 }
 
-# Weapon shop stock - what the shop sells (character_name, weapon_id)
-WEAPON_SHOP_STOCK = [
-    ("Hero", "iron_sword"),
-    ("Warrior", "bronze_axe"),
-    ("Mage", "oak_staff"),
-]
-
 # --- Base stats to keep shops & combat in sync ---
 BASE_ATTACK = {
     "Hero": 15,  # Matches combat.py hero.attack
@@ -126,7 +44,7 @@ def get_weapon_for_actor(actor_name: str):
     wid = equipped_weapons.get(actor_name)
     if not wid:
         return None
-    return WEAPON_DEFS.get(wid)
+    return item_catalog.get(wid)
 
 
 def equip_weapon_on_entity(entity, weapon_id: str):
@@ -135,11 +53,11 @@ def equip_weapon_on_entity(entity, weapon_id: str):
     We assume the Entity has .name and .attack.
     We cache their 'base_attack' the first time we see them.
     """
-    if not hasattr(entity, "base_attack"):
+    if getattr(entity, "base_attack", None) is None:
         entity.base_attack = entity.attack
 
-    weapon = WEAPON_DEFS.get(weapon_id)
-    if weapon is None:
+    weapon = item_catalog.get(weapon_id)
+    if weapon is None or weapon.get("slot") != "weapon":
         # Failsafe: strip weapon bonus, just use base_attack
         entity.attack = entity.base_attack
         entity.weapon_name = "None"
@@ -183,15 +101,12 @@ def get_inventory_list():
     Return a sorted list of (item_id, name, qty, desc)
     for all items in the player's inventory (qty > 0).
     """
-    # Import here to avoid circular dependency
-    import game_data as gd
-
     items = []
     for item_id, qty in inventory.items():
         if qty <= 0:
             continue
 
-        data = gd.ITEMS.get(item_id, {})
+        data = item_catalog.get(item_id, {})
         name = data.get("name", item_id)
         desc = data.get("desc", "")
         items.append((item_id, name, qty, desc))
@@ -0,0 +1,144 @@
+# item_catalog.py
+"""
+Indexed item catalog.
+
+game_data.ITEMS is the one table of item definitions (consumables, weapons,
+armor) and game_data.SHOP_STOCK lists what each shop sells. The catalog is
+built from them once, at import, together with the secondary indexes that
+menus and shops ask for every frame, so none of them has to scan and filter
+the whole item table:
+
+    of_type("weapon")             item ids of one type, in table order
+    equippable("weapon", "Mage")  ids a job can equip in a slot
+    shop_stock("WEAPON_SHOP")     ids a shop sells, in display order
+    owned(inventory, "weapon")    (item_id, qty) pairs the party holds
+
+Index results are tuples shared by every caller: don't modify them. Call
+rebuild() after changing game_data.ITEMS or SHOP_STOCK at runtime.
+"""
+
+import game_data as gd
+
+
+class ItemCatalog:
+    """Item definitions with indexes by type, slot, allowed job and shop."""
+
+    def __init__(self, items: dict, shop_stock: dict):
+        self.items = items  # item_id -> definition
+        self.shop_lists = shop_stock  # shop -> [item_id, ...]
+        self.rebuild()
+
+    def rebuild(self):
+        """Recompute every index from items and shop_lists."""
+        by_type = {}
+        by_slot = {}
+        by_job = {}
+        by_slot_job = {}
+        for item_id, data in self.items.items():
+            by_type.setdefault(data.get("type"), []).append(item_id)
+            slot = data.get("slot")
+            if slot is None:
+                continue
+            by_slot.setdefault(slot, []).append(item_id)
+            for job in data.get("allowed_jobs", ()):
+                by_job.setdefault(job, []).append(item_id)
+                by_slot_job.setdefault((slot, job), []).append(item_id)
+
+        self.by_type = {key: tuple(ids) for key, ids in by_type.items()}
+        self.by_slot = {key: tuple(ids) for key, ids in by_slot.items()}
+        self.by_job = {key: tuple(ids) for key, ids in by_job.items()}
+        self.by_slot_job = {key: tuple(ids) for key, ids in by_slot_job.items()}
+        # Ids missing from the table are dropped so a shop never lists them
+        self.by_shop = {
+            shop: tuple(item_id for item_id in ids if item_id in self.items)
+            for shop, ids in self.shop_lists.items()
+        }
+        self.sort_keys = {
+            item_id: data.get("name", item_id).lower()
+            for item_id, data in self.items.items()
+        }
+
+    # --- Lookups ---
+
+    def __contains__(self, item_id):
+        return item_id in self.items
+
+    def get(self, item_id, default=None):
+        return self.items.get(item_id, default)
+
+    def name(self, item_id) -> str:
+        data = self.items.get(item_id)
+        return data.get("name", item_id) if data else item_id
+
+    def price(self, item_id) -> int:
+        data = self.items.get(item_id)
+        return data.get("price", 0) if data else 0
+
+    def is_type(self, item_id, item_type: str) -> bool:
+        data = self.items.get(item_id)
+        return data is not None and data.get("type") == item_type
+
+    # --- Indexes ---
+
+    def of_type(self, item_type: str) -> tuple:
+        return self.by_type.get(item_type, ())
+
+    def equippable(self, slot: str, job: str) -> tuple:
+        return self.by_slot_job.get((slot, job), ())
+
+    def shop_stock(self, shop: str) -> tuple:
+        return self.by_shop.get(shop, ())
+
+    def owned(self, inventory: dict, item_type=None, by_name: bool = False):
+        """
+        [(item_id, qty), ...] for catalog items held in `inventory` (qty > 0),
+        optionally only one type. Inventory order unless by_name is set.
+        """
+        items = self.items
+        held = [
+            (item_id, qty)
+            for item_id, qty in inventory.items()
+            if qty > 0
+            and item_id in items
+            and (item_type is None or items[item_id].get("type") == item_type)
+        ]
+        if by_name:
+            keys = self.sort_keys
+            held.sort(key=lambda pair: keys[pair[0]])
+        return held
+
+
+# Shared by world.py, combat.py, party_state.py and inventory_state.py
+CATALOG = ItemCatalog(gd.ITEMS, gd.SHOP_STOCK)
+
+
+def get(item_id, default=None):
+    return CATALOG.get(item_id, default)
+
+
+def name(item_id) -> str:
+    return CATALOG.name(item_id)
+
+
+def price(item_id) -> int:
+    return CATALOG.price(item_id)
+
+
+def is_type(item_id, item_type: str) -> bool:
+    return CATALOG.is_type(item_id, item_type)
+
+
+def of_type(item_type: str) -> tuple:
+    return CATALOG.of_type(item_type)
+
+
+def equippable(slot: str, job: str) -> tuple:
+    return CATALOG.equippable(slot, job)
+
+
+def shop_stock(shop: str) -> tuple:
+    return CATALOG.shop_stock(shop)
+
+
+def owned(inventory: dict, item_type=None, by_name: bool = False):
+    return CATALOG.owned(inventory, item_type, by_name)
@@ -0,0 +1,148 @@
+# minimap.py
+"""
+Overworld minimap with fog of war.
+
+The map itself (border, title, one square per world tile) is rendered once
+per world-map version into a base surface. Explored tiles are kept as a
+bitset (one bit per tile id); the surface shown on screen starts with fog
+over every tile and each tile is uncovered once, when it is first
+explored. A frame is one blit plus the current-tile highlight.
+
+    MINIMAP = Minimap(gd.WORLD_MAP, gd.WORLD_POSITIONS, FONT)
+    MINIMAP.explore(tile_id)                  # on entering a tile
+    MINIMAP.draw(screen, current_tile, (x, y))
+
+Call invalidate() after changing the world map or positions.
+"""
+
+import pygame
+
+import text_cache
+
+MINIMAP_SIZE = 180
+CELL_SIZE = 28  # grid spacing; squares are CELL_SIZE - 4
+GRID_OFFSET = (2, 3)  # grid cells added to WORLD_POSITIONS to center the map
+MARGIN = 10
+
+BACKGROUND = (20, 20, 20)
+BORDER = (100, 100, 150)
+FOG_COLOR = (40, 40, 48)
+HIGHLIGHT = (255, 255, 255)
+TITLE_COLOR = (255, 255, 255)
+
+# Square color by tile_type
+BIOME_COLORS = {
+    "town": (200, 200, 0),  # yellow
+    "town_edge": (180, 150, 100),  # tan
+    "forest": (0, 150, 0),  # green
+    "field": (100, 200, 100),  # light green
+    "mountain": (120, 120, 150),  # gray
+    "lake": (60, 120, 200),  # blue
+}
+DEFAULT_COLOR = (80, 80, 80)
+
+
+class Minimap:
+    """Cached minimap of one world map, with an explored-tile bitset."""
+
+    def __init__(self, world_map, positions, font, fog: bool = True):
+        self.world_map = world_map
+        self.positions = positions
+        self.font = font
+        self.fog = fog
+        self.version = 0
+        self.explored = 0  # bit i set = tile with index i explored
+        self._index = {}  # tile_id -> bit; ids keep their bit across versions
+        self._built_version = None
+        self._base = None  # every tile revealed
+        self._view = None  # base with fog over unexplored tiles
+
+    def invalidate(self):
+        """The world map changed: rebuild the base on the next draw."""
+        self.version += 1
+
+    # --- Fog of war ---
+
+    def _bit(self, tile_id) -> int:
+        bit = self._index.get(tile_id)
+        if bit is None:
+            bit = self._index[tile_id] = len(self._index)
+        return bit
+
+    def is_explored(self, tile_id) -> bool:
+        return bool(self.explored >> self._bit(tile_id) & 1)
+
+    def explore(self, tile_id):
+        """Mark a tile explored and uncover it on the cached view."""
+        mask = 1 << self._bit(tile_id)
+        if self.explored & mask:
+            return
+        self.explored |= mask
+        if self.fog and self._view is not None and self._built_version == self.version:
+            rect = self.tile_rect(tile_id)
+            if rect is not None:
+                self._view.blit(self._base, rect, rect)
+
+    def reset_fog(self):
+        self.explored = 0
+        self._built_version = None
+
+    # --- Rendering ---
+
+    def tile_rect(self, tile_id):
+        """The tile's square on the minimap, or None if it has no position."""
+        pos = self.positions.get(tile_id)
+        if pos is None:
+            return None
+        x = (pos[0] + GRID_OFFSET[0]) * CELL_SIZE + MARGIN
+        y = (pos[1] + GRID_OFFSET[1]) * CELL_SIZE + MARGIN
+        return pygame.Rect(x, y, CELL_SIZE - 4, CELL_SIZE - 4)
+
+    def _new_surface(self):
+        surface = pygame.Surface((MINIMAP_SIZE, MINIMAP_SIZE))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        surface.fill(BACKGROUND)
+        pygame.draw.rect(surface, BORDER, (0, 0, MINIMAP_SIZE, MINIMAP_SIZE), 2)
+        return surface
+
+    def _draw_title(self, surface):
+        title = text_cache.render(self.font, "Map", True, TITLE_COLOR)
+        surface.blit(title, (MINIMAP_SIZE // 2 - title.get_width() // 2, 4))
+
+    def _build(self):
+        base = self._new_surface()
+        view = self._new_surface() if self.fog else base
+        for tile_id, data in self.world_map.items():
+            rect = self.tile_rect(tile_id)
+            if rect is None:
+                continue
+            color = BIOME_COLORS.get(data["tile_type"], DEFAULT_COLOR)
+            pygame.draw.rect(base, color, rect)
+            if view is not base:
+                if self.is_explored(tile_id):
+                    pygame.draw.rect(view, color, rect)
+                else:
+                    pygame.draw.rect(view, FOG_COLOR, rect)
+        self._draw_title(base)
+        if view is not base:
+            self._draw_title(view)
+        self._base = base
+        self._view = view
+        self._built_version = self.version
+
+    def draw(self, screen, current_tile, pos):
+        """Blit the minimap at `pos` and outline `current_tile`."""
+        if self._built_version != self.version:
+            self._build()
+        screen.blit(self._view, pos)
+
+        rect = self.tile_rect(current_tile)
+        if rect is not None:
+            # Clip so an edge tile's outline stays inside the minimap
+            prev_clip = screen.get_clip()
+            screen.set_clip(
+                pygame.Rect(pos, (MINIMAP_SIZE, MINIMAP_SIZE)).clip(prev_clip)
+            )
+            pygame.draw.rect(screen, HIGHLIGHT, rect.move(pos), 3)
+            screen.set_clip(prev_clip)
@@ -1,12 +1,13 @@
 import pygame
 import sys
 
-pygame.init()
+import text_cache
 
 # --- Window setup ---
+# The window and fonts are created by init_display(), not at import
 WIDTH, HEIGHT = 1024, 640
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Overworld Menu Prototype")
+CAPTION = "Overworld Menu Prototype"
+screen = None
 
 clock = pygame.time.Clock()
 
@@ -17,10 +18,10 @@ GRAY = (60, 60, 60)
 YELLOW = (240, 220, 120)
 BLUE = (40, 60, 110)
 
-# --- Fonts ---
-font_big = pygame.font.Font(None, 64)
-font_med = pygame.font.Font(None, 36)
-font_small = pygame.font.Font(None, 24)
+# --- Fonts (loaded by init_display()) ---
+font_big = None
+font_med = None
+font_small = None
 
 # --- Overworld menu state ---
 OVERWORLD_MENU_OPTIONS = ["Items", "Party", "Save", "Quit Game"]
@@ -31,6 +32,18 @@ overworld_menu_open = False
 status_message = ""
 
 
+def init_display():
+    """Open the prototype window and load its fonts."""
+    global screen, font_big, font_med, font_small
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption(CAPTION)
+    font_big = pygame.font.Font(None, 64)
+    font_med = pygame.font.Font(None, 36)
+    font_small = pygame.font.Font(None, 24)
+    return screen
+
+
 def draw_overworld_base():
     """Draw the basic overworld background (no menu)."""
     screen.fill(BLUE)
@@ -39,12 +52,13 @@ def draw_overworld_base():
     pygame.draw.rect(screen, (20, 40, 90), (0, HEIGHT // 3, WIDTH, HEIGHT // 3))
     pygame.draw.rect(screen, (10, 25, 60), (0, 2 * HEIGHT // 3, WIDTH, HEIGHT // 3))
 
-    title = font_big.render("Overworld (Prototype)", True, WHITE)
+    title = text_cache.render(font_big, "Overworld (Prototype)", True, WHITE)
     title_rect = title.get_rect(center=(WIDTH // 2, 80))
     screen.blit(title, title_rect)
 
-    hint1 = font_small.render("ESC: Open/close Overworld Menu", True, WHITE)
-    hint2 = font_small.render(
+    hint1 = text_cache.render(font_small, "ESC: Open/close Overworld Menu", True, WHITE)
+    hint2 = text_cache.render(
+        font_small,
         "Up/Down: Move   Enter: Select   Quit Game: Exit", True, WHITE
     )
 
@@ -71,7 +85,7 @@ def draw_overworld_menu():
     pygame.draw.rect(screen, (15, 15, 35), panel_rect)
     pygame.draw.rect(screen, WHITE, panel_rect, 2)
 
-    title = font_med.render("Menu", True, WHITE)
+    title = text_cache.render(font_med, "Menu", True, WHITE)
     title_rect = title.get_rect(midtop=(panel_rect.centerx, panel_rect.y + 12))
     screen.blit(title, title_rect)
 
@@ -81,12 +95,12 @@ def draw_overworld_menu():
 
     for i, option in enumerate(OVERWORLD_MENU_OPTIONS):
         color = YELLOW if i == overworld_menu_index else WHITE
-        txt = font_small.render(option, True, color)
+        txt = text_cache.render(font_small, option, True, color)
         txt_rect = txt.get_rect(x=panel_rect.x + 40, y=start_y + i * row_h)
         screen.blit(txt, txt_rect)
 
     # Tiny hint
-    hint = font_small.render("ESC: Close menu", True, WHITE)
+    hint = text_cache.render(font_small, "ESC: Close menu", True, WHITE)
     hint_rect = hint.get_rect(midbottom=(panel_rect.centerx, panel_rect.bottom - 12))
     screen.blit(hint, hint_rect)
 
@@ -94,6 +108,7 @@ def draw_overworld_menu():
 def main():
     global overworld_menu_index, overworld_menu_open, status_message
 
+    init_display()
     running = True
 
     while running:
@@ -146,7 +161,7 @@ def main():
 
         # Bottom status line
         if status_message:
-            msg = font_small.render(status_message, True, WHITE)
+            msg = text_cache.render(font_small, status_message, True, WHITE)
             msg_rect = msg.get_rect(midbottom=(WIDTH // 2, HEIGHT - 8))
             screen.blit(msg, msg_rect)
 
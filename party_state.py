@@ -52,25 +52,20 @@ class PartyMember:
         Recalculate final stats from base stats + equipment bonuses.
         Called whenever we equip something or level up.
         """
-        from game_data import WEAPONS, ARMOR
+        import item_catalog
 
         # Reset to base
         self.attack = self.base_attack
         self.magic = self.base_magic
         self.defense = self.base_defense
 
-        # Apply weapon bonuses
-        if self.weapon and self.weapon in WEAPONS:
-            w = WEAPONS[self.weapon]
-            self.attack += w.get("attack", 0)
-            self.defense += w.get("defense", 0)
-            self.magic += w.get("magic", 0)
-
-        # Apply armor bonuses
-        if self.armor and self.armor in ARMOR:
-            a = ARMOR[self.armor]
-            self.defense += a.get("defense", 0)
-            self.magic += a.get("magic", 0)
+        # Apply weapon, then armor bonuses
+        for item_id in (self.weapon, self.armor):
+            item = item_catalog.get(item_id) if item_id else None
+            if item:
+                self.attack += item.get("attack_bonus", 0)
+                self.defense += item.get("defense_bonus", 0)
+                self.magic += item.get("magic_bonus", 0)
 
 
 # -----------------------------------------------
@@ -0,0 +1,324 @@
+# replay.py
+"""
+Compact binary battle replays.
+
+A replay stores the battle's seed, a snapshot of the party, enemies and
+inventory at the start, and every party command in order. Enemy turns are
+not stored: with the same seed (see rng_streams) the BattleSim reproduces
+them exactly. A typical battle is a few hundred bytes.
+
+    rec = BattleRecorder(sim)      # right after creating the BattleSim
+    ...                            # play the battle
+    rec.save("replays/bug.rpl")
+
+    replay = load_replay("replays/bug.rpl")
+    sim = replay.play()            # headless, thousands of turns per second
+
+    python replay.py replays/bug.rpl              # headless, prints the log
+    python replay.py replays/bug.rpl --speed 4    # watch it (1, 4 or 16)
+"""
+
+import argparse
+import os
+import struct
+import time
+
+import battle_sim as bs
+
+MAGIC = b"JRPL"
+VERSION = 1
+
+# Command codes
+CHOICES = ("Attack", "Magic", "SKILL", "ITEM", "Defend", "Run")
+CHOICE_CODES = {name: i for i, name in enumerate(CHOICES)}
+
+NONE_U8 = 0xFF
+NONE_U16 = 0xFFFF
+
+_HEADER = struct.Struct("<4sBq")  # magic, version, seed
+_STATS = struct.Struct("<14i")
+_ACTION = struct.Struct("<BBBH")  # actor, choice, target, arg
+_DROP = struct.Struct("<d")
+_COUNT8 = struct.Struct("<B")
+_COUNT16 = struct.Struct("<H")
+_COUNT32 = struct.Struct("<I")
+_QTY = struct.Struct("<i")
+
+_STAT_FIELDS = (
+    "max_hp",
+    "hp",
+    "max_mp",
+    "mp",
+    "attack",
+    "magic",
+    "defense",
+    "speed",
+    "level",
+    "xp",
+    "xp_to_next",
+    "xp_value",
+    "gold_min",
+    "gold_max",
+)
+
+
+# --- Low-level encoding ---
+
+
+def _write_str(out: bytearray, text):
+    data = (text or "").encode("utf-8")
+    out += _COUNT16.pack(len(data))
+    out += data
+
+
+class _Reader:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+
+    def unpack(self, st: struct.Struct):
+        values = st.unpack_from(self.data, self.pos)
+        self.pos += st.size
+        return values
+
+    def count8(self) -> int:
+        return self.unpack(_COUNT8)[0]
+
+    def count16(self) -> int:
+        return self.unpack(_COUNT16)[0]
+
+    def string(self) -> str:
+        n = self.count16()
+        text = self.data[self.pos : self.pos + n].decode("utf-8")
+        self.pos += n
+        return text
+
+
+def _write_entity(out: bytearray, e):
+    _write_str(out, e.name)
+    _write_str(out, e.job)
+    _write_str(out, e.equipped_weapon)
+    out += _STATS.pack(*(getattr(e, f) for f in _STAT_FIELDS))
+    out += _COUNT8.pack(len(e.drops))
+    for item_id, chance in e.drops:
+        _write_str(out, item_id)
+        out += _DROP.pack(chance)
+
+
+def _read_entity(r: _Reader):
+    name = r.string()
+    job = r.string()
+    weapon = r.string() or None
+    stats = dict(zip(_STAT_FIELDS, r.unpack(_STATS)))
+
+    e = bs.Entity(
+        name,
+        stats["max_hp"],
+        stats["max_mp"],
+        stats["attack"],
+        stats["magic"],
+        stats["defense"],
+        stats["speed"],
+    )
+    for field, value in stats.items():
+        setattr(e, field, value)
+    e.job = job
+    e.equipped_weapon = weapon  # stats above already include its bonus
+
+    drops = []
+    for _ in range(r.count8()):
+        item_id = r.string()
+        drops.append((item_id, r.unpack(_DROP)[0]))
+    e.drops = tuple(drops)
+    return e
+
+
+# --- Recording ---
+
+
+class BattleRecorder:
+    """
+    Records one BattleSim from its first command.
+
+    Create it right after the BattleSim (before any action) so the snapshot
+    matches the battle's starting state; it hooks sim.on_action.
+    """
+
+    def __init__(self, sim: bs.BattleSim):
+        self.sim = sim
+        self.seed = sim.seed
+        # Copies, so damage taken during the battle doesn't leak into them
+        self.party = [e.clone() for e in sim.party]
+        self.enemies = [e.clone() for e in sim.enemies]
+        self.inventory = dict(sim.inventory)
+        self.actions = []  # (actor, choice, target, arg) as small ints
+        self.strings = []  # item ids used by ITEM commands
+
+        sim.on_action = self._record
+
+    def _record(self, actor_idx, choice, target, arg):
+        sim = self.sim
+        code = CHOICE_CODES[choice]
+
+        target_idx = NONE_U8
+        if target is not None:
+            group = sim.party if choice == "ITEM" else sim.enemies
+            target_idx = group.index(target)
+
+        arg_idx = NONE_U16
+        if choice == "SKILL" and arg is not None:
+            arg_idx = bs.SKILLS.index(arg)
+        elif choice == "ITEM" and arg is not None:
+            if arg not in self.strings:
+                self.strings.append(arg)
+            arg_idx = self.strings.index(arg)
+
+        self.actions.append((actor_idx, code, target_idx, arg_idx))
+
+    def to_bytes(self) -> bytes:
+        out = bytearray(_HEADER.pack(MAGIC, VERSION, self.seed))
+
+        out += _COUNT8.pack(len(self.party))
+        for e in self.party:
+            _write_entity(out, e)
+        out += _COUNT8.pack(len(self.enemies))
+        for e in self.enemies:
+            _write_entity(out, e)
+
+        out += _COUNT16.pack(len(self.inventory))
+        for item_id, qty in self.inventory.items():
+            _write_str(out, item_id)
+            out += _QTY.pack(qty)
+
+        out += _COUNT16.pack(len(self.strings))
+        for text in self.strings:
+            _write_str(out, text)
+
+        out += _COUNT32.pack(len(self.actions))
+        for action in self.actions:
+            out += _ACTION.pack(*action)
+
+        _write_str(out, self.sim.winner)
+        return bytes(out)
+
+    def save(self, path: str):
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+
+# --- Playback ---
+
+
+class Replay:
+    """A decoded replay. build_sim()/play() re-run it."""
+
+    def __init__(self, seed, party, enemies, inventory, strings, actions, winner):
+        self.seed = seed
+        self.party = party
+        self.enemies = enemies
+        self.inventory = inventory
+        self.strings = strings
+        self.actions = actions
+        self.winner = winner or None  # as recorded
+
+    def build_sim(self, on_message=None, on_damage=None):
+        """A fresh BattleSim in the recorded starting state."""
+        return bs.BattleSim(
+            [e.clone() for e in self.party],
+            [e.clone() for e in self.enemies],
+            seed=self.seed,
+            inventory=dict(self.inventory),
+            on_message=on_message,
+            on_damage=on_damage,
+        )
+
+    def policy(self):
+        """A BattleSim policy that feeds back the recorded commands in order."""
+        actions = iter(self.actions)
+
+        def replay_policy(sim, actor):
+            _actor_idx, code, target_idx, arg_idx = next(actions)
+            choice = CHOICES[code]
+
+            target = None
+            if target_idx != NONE_U8:
+                group = sim.party if choice == "ITEM" else sim.enemies
+                target = group[target_idx]
+
+            arg = None
+            if arg_idx != NONE_U16:
+                arg = bs.SKILLS[arg_idx] if choice == "SKILL" else self.strings[arg_idx]
+
+            return choice, target, arg
+
+        return replay_policy
+
+    def play(self, on_message=None):
+        """Re-run the whole battle headlessly. Returns the finished sim."""
+        sim = self.build_sim(on_message=on_message)
+        policy = self.policy()
+        while sim.winner is None:
+            if sim.phase == "PARTY" and sim.turns >= len(self.actions):
+                break  # recording ended early (e.g. the window was closed)
+            sim.step(policy)
+        return sim
+
+
+def replay_from_bytes(data: bytes) -> Replay:
+    r = _Reader(data)
+    magic, version, seed = r.unpack(_HEADER)
+    if magic != MAGIC:
+        raise ValueError("not a battle replay")
+    if version != VERSION:
+        raise ValueError(f"unsupported replay version {version}")
+
+    party = [_read_entity(r) for _ in range(r.count8())]
+    enemies = [_read_entity(r) for _ in range(r.count8())]
+
+    inventory = {}
+    for _ in range(r.count16()):
+        item_id = r.string()
+        inventory[item_id] = r.unpack(_QTY)[0]
+
+    strings = [r.string() for _ in range(r.count16())]
+
+    n = r.unpack(_COUNT32)[0]
+    actions = [r.unpack(_ACTION) for _ in range(n)]
+
+    winner = r.string()
+    return Replay(seed, party, enemies, inventory, strings, actions, winner)
+
+
+def load_replay(path: str) -> Replay:
+    with open(path, "rb") as f:
+        return replay_from_bytes(f.read())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play back a battle replay.")
+    parser.add_argument("path")
+    parser.add_argument("--speed", type=int, choices=(1, 4, 16),
+                        help="watch the replay at this speed instead of running headless")
+    args = parser.parse_args()
+
+    replay = load_replay(args.path)
+
+    if args.speed:
+        import combat  # play_replay() opens the battle window
+
+        combat.play_replay(replay, speed=args.speed)
+        return
+
+    start = time.perf_counter()
+    sim = replay.play(on_message=print)
+    elapsed = time.perf_counter() - start
+
+    print(f"\nResult: {sim.winner} (recorded: {replay.winner})")
+    print(f"{sim.turns} turns, {sim.round} rounds in {elapsed * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
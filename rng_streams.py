@@ -0,0 +1,95 @@
+# rng_streams.py
+"""
+Seeded random number streams.
+
+Instead of sharing the global `random` module, each subsystem draws from
+its own named stream (damage, status, loot, encounter, worldgen, battle).
+Each stream is a random.Random whose seed is derived from one master seed
+and the stream's name, so:
+
+- the whole game (or a single battle) can be reproduced from one seed, and
+- extra draws in one subsystem never shift the numbers another one sees.
+
+    import rng_streams
+    rng_streams.seed_all(1234)             # reproducible session
+    rng_streams.stream("worldgen").randint(0, 10)
+
+    streams = rng_streams.RNGService(seed) # independent set, e.g. one battle
+    streams.damage.randint(-2, 2)
+"""
+
+import hashlib
+import random
+
+STREAM_NAMES = (
+    "damage",  # damage spread
+    "status",  # status-effect rolls
+    "loot",  # gold and item drops
+    "encounter",  # encounter checks and enemy groups
+    "worldgen",  # procedural tile decoration
+    "battle",  # run attempts, enemy targeting and action choice
+    "seeds",  # seeds handed out for new battles
+)
+
+
+def derive_seed(seed: int, name: str) -> int:
+    """A stable 64-bit seed for stream `name` (same on every run/process)."""
+    digest = hashlib.blake2b(f"{seed}:{name}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class RNGService:
+    """A master seed plus one independent random.Random per stream name."""
+
+    def __init__(self, seed=None):
+        self._streams = {}
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        """Reseed every stream (a random master seed if `seed` is None).
+
+        Streams are reseeded in place, so references to them stay valid.
+        """
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(63)
+        self.master_seed = seed
+        for name, stream in self._streams.items():
+            stream.seed(derive_seed(seed, name))
+
+    def stream(self, name: str) -> random.Random:
+        """The stream called `name` (created on first use)."""
+        s = self._streams.get(name)
+        if s is None:
+            s = self._streams[name] = random.Random(derive_seed(self.master_seed, name))
+        return s
+
+    def next_seed(self) -> int:
+        """A fresh seed for a child service (e.g. the next battle)."""
+        return self.stream("seeds").getrandbits(63)
+
+    # Shorthands for the standard streams
+    damage = property(lambda self: self.stream("damage"))
+    status = property(lambda self: self.stream("status"))
+    loot = property(lambda self: self.stream("loot"))
+    encounter = property(lambda self: self.stream("encounter"))
+    worldgen = property(lambda self: self.stream("worldgen"))
+    battle = property(lambda self: self.stream("battle"))
+
+
+# --- Process-wide default service ---
+
+default = RNGService()
+
+
+def seed_all(seed=None):
+    """Reseed every stream of the default service."""
+    default.seed(seed)
+
+
+def stream(name: str) -> random.Random:
+    """A stream from the default service."""
+    return default.stream(name)
+
+
+def next_seed() -> int:
+    return default.next_seed()
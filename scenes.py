@@ -0,0 +1,134 @@
+# scenes.py
+"""
+Table-driven scene dispatch for the overworld loop.
+
+Every scene ("WORLD", "TOWN", "INN", ...) registers its own handlers:
+
+    handle_event(event)   one input event
+    update()              once per frame, before drawing
+    draw(surface)         draw the frame
+
+Overlays (menus, dialog, shop UIs) sit on a stack above the scene. Each
+overlay has an is_open() test on the game state that opens and closes it,
+so code that sets a flag such as world_menu_open doesn't need to know about
+the stack: sync() pushes overlays as they open, in the order they open, and
+drops the ones that closed.
+
+Event dispatch is one lookup:
+
+    top modal overlay         gets every event (world menu, shop menu)
+    global key handler        keys that work anywhere else (ESC, battle)
+    top non-modal overlay     or, if none is open, the current scene
+
+An overlay can also block movement and be opaque (drawn instead of the
+scene, e.g. a building interior). Switching scenes is assigning the scene
+name; adding a scene doesn't touch any other scene's input path.
+"""
+
+
+class Scene:
+    """Handlers for one scene or overlay; unused handlers are None."""
+
+    def __init__(self, name, handle_event=None, update=None, draw=None):
+        self.name = name
+        self.handle_event = handle_event
+        self.update = update
+        self.draw = draw
+
+
+class Overlay(Scene):
+    """A scene layered over the current one while is_open() is true."""
+
+    def __init__(self, name, is_open, handle_event=None, draw=None,
+                 modal=True, opaque=False, blocks_movement=True):
+        super().__init__(name, handle_event=handle_event, draw=draw)
+        self.is_open = is_open
+        self.modal = modal  # takes events before the global key handler
+        self.opaque = opaque  # drawn instead of the scene and overlays below
+        self.blocks_movement = blocks_movement
+
+
+class SceneManager:
+    """Scene registry, overlay stack and per-frame dispatch."""
+
+    def __init__(self):
+        self.scenes = {}  # name -> Scene
+        self.overlays = []  # registered Overlays, in registration order
+        self.stack = []  # open Overlays, bottom to top
+        self.fallback = None  # Scene used for unknown scene names
+        self.global_keys = None  # handler(event) -> True if it consumed the event
+        self.running = True
+
+    # --- Registry ---
+
+    def add_scene(self, name, handle_event=None, update=None, draw=None):
+        scene = self.scenes[name] = Scene(name, handle_event, update, draw)
+        return scene
+
+    def add_overlay(self, name, is_open, **handlers):
+        overlay = Overlay(name, is_open, **handlers)
+        self.overlays.append(overlay)
+        return overlay
+
+    def scene(self, name) -> Scene:
+        return self.scenes.get(name, self.fallback)
+
+    def quit(self):
+        self.running = False
+
+    # --- Overlay stack ---
+
+    def sync(self):
+        """Drop overlays that closed and push the ones that just opened."""
+        stack = self.stack
+        if stack:
+            stack[:] = [overlay for overlay in stack if overlay.is_open()]
+        for overlay in self.overlays:
+            if overlay not in stack and overlay.is_open():
+                stack.append(overlay)
+
+    def top(self, modal=None):
+        """The topmost open overlay (only modal / non-modal ones if given)."""
+        for overlay in reversed(self.stack):
+            if modal is None or overlay.modal == modal:
+                return overlay
+        return None
+
+    def movement_blocked(self) -> bool:
+        return any(overlay.blocks_movement for overlay in self.stack)
+
+    # --- Per-frame dispatch ---
+
+    def handle_event(self, scene_name, event):
+        self.sync()
+        target = self.top(modal=True)
+        if target is None:
+            if self.global_keys is not None and self.global_keys(event):
+                return
+            self.sync()  # the global handler may have opened something
+            target = self.top(modal=False) or self.scene(scene_name)
+        if target is not None and target.handle_event is not None:
+            target.handle_event(event)
+
+    def update(self, scene_name):
+        self.sync()
+        scene = self.scene(scene_name)
+        if scene is not None and scene.update is not None:
+            scene.update()
+
+    def draw(self, scene_name, surface):
+        """Draw the scene, then each open overlay from the last opaque one up."""
+        self.sync()
+        stack = self.stack
+        first = 0
+        for i in range(len(stack) - 1, -1, -1):
+            if stack[i].opaque:
+                first = i
+                break
+        else:
+            scene = self.scene(scene_name)
+            if scene is not None and scene.draw is not None:
+                scene.draw(surface)
+        for overlay in stack[first:]:
+            if overlay.draw is not None:
+                overlay.draw(surface)
@@ -0,0 +1,78 @@
+# spatial_hash.py
+"""
+Uniform-grid spatial hash for collision rects.
+
+Objects are bucketed by the grid cells their rect overlaps. query() only
+looks at the cells under the rect it is given, so a collision check costs
+about the number of objects near the player, not the number on the tile.
+Built once when a tile is created (see world_tiles.Tile) and read-only
+after that.
+
+    solids = SpatialHash()
+    for obj in objects:
+        solids.insert(obj["rect"], obj)
+    hit = solids.first_hit(player_rect)
+"""
+
+CELL_SIZE = 64  # pixels; about the size of the largest object sprite
+
+
+class SpatialHash:
+    """Maps grid cells to the (rect, item) pairs that overlap them."""
+
+    def __init__(self, cell_size: int = CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}  # (cx, cy) -> [(rect, item), ...]
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def _cell_range(self, rect):
+        size = self.cell_size
+        # right/bottom are exclusive, so a rect ending on a cell edge stays out of it
+        return (
+            rect.left // size,
+            rect.top // size,
+            (rect.right - 1) // size,
+            (rect.bottom - 1) // size,
+        )
+
+    def insert(self, rect, item=None):
+        """Add `item` (defaults to the rect itself) under every cell `rect` touches."""
+        entry = (rect, rect if item is None else item)
+        x0, y0, x1, y1 = self._cell_range(rect)
+        cells = self.cells
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [entry]
+                else:
+                    bucket.append(entry)
+        self.count += 1
+
+    def query(self, rect):
+        """Items whose rect overlaps `rect` (each item at most once)."""
+        found = []
+        seen = set()
+        x0, y0, x1, y1 = self._cell_range(rect)
+        cells = self.cells
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                for other, item in cells.get((cx, cy), ()):
+                    if id(item) not in seen and rect.colliderect(other):
+                        seen.add(id(item))
+                        found.append(item)
+        return found
+
+    def first_hit(self, rect):
+        """The first item overlapping `rect`, or None (cheaper than query())."""
+        x0, y0, x1, y1 = self._cell_range(rect)
+        cells = self.cells
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                for other, item in cells.get((cx, cy), ()):
+                    if rect.colliderect(other):
+                        return item
+        return None
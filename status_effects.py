@@ -0,0 +1,150 @@
+# status_effects.py
+"""
+Status effect engine.
+
+Each entity's `statuses` is a dict keyed by status name, so add/has/remove
+are O(1). Every status type is registered once in STATUS_DEFS with its
+short code, an optional per-turn tick handler and its log messages.
+tick_group() ticks a whole group in one pass and returns events instead of
+formatting strings; describe_event() turns an event into a log line.
+"""
+
+
+class Status:
+    """One active status on an entity."""
+
+    __slots__ = ("duration", "power")
+
+    def __init__(self, duration: int, power: int = 0):
+        self.duration = duration
+        self.power = power
+
+    def __repr__(self):
+        return f"Status(duration={self.duration}, power={self.power})"
+
+
+class StatusDef:
+    """How a status type behaves. tick(entity, status) returns an amount."""
+
+    def __init__(self, name, code, tick=None, tick_message=None):
+        self.name = name
+        self.code = code
+        self.tick = tick
+        self.tick_message = tick_message
+        self.expire_message = "{target} is no longer affected by " + name.lower() + "."
+
+
+STATUS_DEFS = {}
+
+# --- Tick events ---
+# (kind, entity, status_name, amount)
+TICK = "tick"
+EXPIRE = "expire"
+
+
+def register_status(name, code, tick=None, tick_message=None):
+    """Register (or replace) a status type."""
+    STATUS_DEFS[name] = StatusDef(name, code, tick, tick_message)
+    return STATUS_DEFS[name]
+
+
+def _damage_over_time(entity, status) -> int:
+    dmg = max(1, status.power)
+    entity.hp = max(0, entity.hp - dmg)
+    return dmg
+
+
+register_status(
+    "Poison", "PSN", _damage_over_time, "{target} suffers {amount} poison damage!"
+)
+register_status("Bleed", "BLD", _damage_over_time, "{target} bleeds for {amount} damage!")
+# Modifier-only statuses: checked with has_status() where they matter
+register_status("Weaken", "WKN")  # less outgoing damage
+register_status("Stun", "STN")  # lose your turn
+register_status("Curse", "CRS")  # less magic damage
+
+
+# --- Queries / mutation ---
+
+
+def add_status(target, name: str, duration: int, power: int = 0):
+    """Apply or refresh a status on a target."""
+    current = target.statuses.get(name)
+    if current is not None:
+        current.duration = max(current.duration, duration)
+        current.power = max(current.power, power)
+        return
+
+    target.statuses[name] = Status(duration, power)
+
+
+def has_status(entity, name: str) -> bool:
+    """Return True if this entity has a status with the given name."""
+    return name in entity.statuses
+
+
+def remove_status(entity, name: str):
+    entity.statuses.pop(name, None)
+
+
+def get_status_codes(entity) -> str:
+    """Return a short comma-separated code string like 'PSN, BLD'."""
+    codes = []
+    for name in entity.statuses:
+        d = STATUS_DEFS.get(name)
+        codes.append(d.code if d is not None else name[:3].upper())
+    return ", ".join(codes)
+
+
+# --- Ticking ---
+
+
+def tick_group(group):
+    """
+    Tick every status on every living entity in `group`, once.
+
+    Tick handlers run, durations count down and expired statuses are removed.
+    Returns the list of (kind, entity, status_name, amount) events.
+    """
+    events = []
+
+    for e in group:
+        statuses = e.statuses
+        if not statuses or e.hp <= 0:
+            continue
+
+        expired = None
+        for name, status in statuses.items():
+            d = STATUS_DEFS.get(name)
+            if d is not None and d.tick is not None:
+                events.append((TICK, e, name, d.tick(e, status)))
+
+            status.duration -= 1
+            if status.duration <= 0 or e.hp <= 0:
+                if expired is None:
+                    expired = []
+                expired.append(name)
+                if e.hp > 0:
+                    events.append((EXPIRE, e, name, 0))
+
+        if expired:
+            for name in expired:
+                del statuses[name]
+
+    return events
+
+
+def describe_event(event) -> str:
+    """Battle-log line for a tick event."""
+    kind, entity, name, amount = event
+    d = STATUS_DEFS.get(name)
+
+    if kind == TICK:
+        template = d.tick_message if d is not None and d.tick_message else None
+        if template is None:
+            return f"{entity.name} is affected by {name.lower()}."
+        return template.format(target=entity.name, amount=amount)
+
+    if d is not None:
+        return d.expire_message.format(target=entity.name)
+    return f"{entity.name} is no longer affected by {name.lower()}."
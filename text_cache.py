@@ -0,0 +1,100 @@
+# text_cache.py
+"""
+Process-wide cache for rendered text.
+
+Most UI text (titles, hints, menu options, names) is the same every frame,
+so render() returns the surface from the last time the same
+(font, text, antialias, color, background) was drawn instead of calling
+font.render() again. The cache has a byte budget; when it is full the
+least recently used surfaces are dropped. hits / misses / evictions show
+how well it is doing (see stats()).
+
+    title = text_cache.render(font_small, "Commands", True, WHITE)
+
+Returned surfaces are shared: blit them, don't draw on them.
+"""
+
+from collections import OrderedDict
+
+DEFAULT_BUDGET = 8 * 1024 * 1024  # bytes of surface pixels
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces with a byte budget."""
+
+    def __init__(self, budget: int = DEFAULT_BUDGET):
+        self.budget = budget
+        self.size = 0  # bytes currently held
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (surface, nbytes)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def render(self, font, text, antialias, color, background=None):
+        """Same arguments and result as font.render(), cached."""
+        key = (font, text, antialias, color, background)
+        try:
+            entry = self._entries.get(key)
+        except TypeError:  # unhashable color, e.g. a list or pygame.Color
+            color = tuple(color)
+            if background is not None:
+                background = tuple(background)
+            key = (font, text, antialias, color, background)
+            entry = self._entries.get(key)
+
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+        self.misses += 1
+        if background is None:
+            surf = font.render(text, antialias, color)
+        else:
+            surf = font.render(text, antialias, color, background)
+
+        nbytes = surf.get_pitch() * surf.get_height()
+        if nbytes <= self.budget:
+            self._entries[key] = (surf, nbytes)
+            self.size += nbytes
+            while self.size > self.budget:
+                _, (_, dropped) = self._entries.popitem(last=False)
+                self.size -= dropped
+                self.evictions += 1
+        return surf
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "budget": self.budget,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Shared by world.py, combat.py and the menus
+default_cache = TextCache()
+
+
+def render(font, text, antialias, color, background=None):
+    """font.render() through the shared cache."""
+    return default_cache.render(font, text, antialias, color, background)
+
+
+def stats() -> dict:
+    return default_cache.stats()
+
+
+def clear():
+    default_cache.clear()
@@ -0,0 +1,126 @@
+# transitions.py
+"""
+Screen transitions driven by the game's own frame loop.
+
+A Transition covers the screen, calls `on_midpoint` once it is fully
+covered (swap the tile / scene there), then uncovers it again. It never
+blocks: the main loop calls update() once per frame and draw() after the
+scene has been drawn, so input, tile prefetching and everything else keep
+running during the effect. One overlay surface is reused for every frame.
+
+Styles:
+    fade    the screen fades to black and back
+    wipe    a black panel slides across in `direction`, then off again
+    iris    a circle closes on `center` and opens again
+
+    screen_transition.start("fade", on_midpoint=lambda: load_world_tile(t))
+"""
+
+import math
+
+import pygame
+
+TRANSITION_FRAMES = 34  # whole effect at 60 FPS (half to cover, half to reveal)
+STYLES = ("fade", "wipe", "iris")
+
+BLACK = (0, 0, 0)
+_IRIS_HOLE = (255, 0, 255)  # colorkey used to punch the iris hole
+
+
+class Transition:
+    """One reusable screen transition."""
+
+    def __init__(self, size):
+        self.size = size
+        self.overlay = pygame.Surface(size)  # reused for every frame
+        self.style = "fade"
+        self.frames = TRANSITION_FRAMES
+        self.frame = 0
+        self.active = False
+        self.direction = "right"
+        self.center = (size[0] // 2, size[1] // 2)
+        self.on_midpoint = None
+
+    def start(self, style="fade", on_midpoint=None, frames=TRANSITION_FRAMES,
+              direction="right", center=None):
+        """
+        Begin a transition. `direction` ("left", "right", "up", "down") is
+        where a wipe travels; `center` is where an iris closes.
+        """
+        if style not in STYLES:
+            raise ValueError(f"unknown transition style {style!r}")
+        self.style = style
+        self.on_midpoint = on_midpoint
+        self.frames = max(2, frames)
+        self.frame = 0
+        self.active = True
+        self.direction = direction
+        self.center = center or (self.size[0] // 2, self.size[1] // 2)
+
+    @property
+    def covering(self) -> bool:
+        """True during the first half (before the midpoint callback)."""
+        return self.active and self.frame < self.frames // 2
+
+    def progress(self) -> float:
+        """How much of the screen is covered: 0.0 (none) .. 1.0 (all)."""
+        half = self.frames // 2
+        if self.frame <= half:
+            return self.frame / half
+        return max(0.0, 1.0 - (self.frame - half) / (self.frames - half))
+
+    def update(self):
+        """Advance one frame; runs on_midpoint when the screen is fully covered."""
+        if not self.active:
+            return
+        self.frame += 1
+        if self.frame == self.frames // 2 and self.on_midpoint is not None:
+            callback, self.on_midpoint = self.on_midpoint, None
+            callback()
+        if self.frame >= self.frames:
+            self.active = False
+
+    def draw(self, surface):
+        """Draw the effect over an already drawn frame."""
+        if not self.active:
+            return
+        p = self.progress()
+        if p <= 0.0:
+            return
+
+        if self.style == "fade":
+            self.overlay.set_colorkey(None)
+            self.overlay.fill(BLACK)
+            self.overlay.set_alpha(int(255 * p))
+            surface.blit(self.overlay, (0, 0))
+
+        elif self.style == "wipe":
+            w, h = self.size
+            pw, ph = int(w * p), int(h * p)
+            # The panel enters from the side opposite to `direction` and
+            # leaves through the side it was heading for
+            trailing = not self.covering
+            if self.direction == "left":
+                rect = (0 if trailing else w - pw, 0, pw, h)
+            elif self.direction == "up":
+                rect = (0, 0 if trailing else h - ph, w, ph)
+            elif self.direction == "down":
+                rect = (0, h - ph if trailing else 0, w, ph)
+            else:
+                rect = (w - pw if trailing else 0, 0, pw, h)
+            surface.fill(BLACK, rect)
+
+        else:  # iris
+            w, h = self.size
+            cx, cy = self.center
+            # Far enough to clear the farthest corner from the center
+            max_r = math.hypot(max(cx, w - cx), max(cy, h - cy)) + 1
+            radius = int(max_r * (1.0 - p))
+            self.overlay.set_alpha(None)
+            self.overlay.fill(BLACK)
+            if radius > 0:
+                self.overlay.set_colorkey(_IRIS_HOLE)
+                pygame.draw.circle(self.overlay, _IRIS_HOLE, (cx, cy), radius)
+            else:
+                self.overlay.set_colorkey(None)
+            surface.blit(self.overlay, (0, 0))
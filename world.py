@@ -1,16 +1,22 @@
 import pygame
 import sys
-import subprocess  # <-- for launching combat.py
-import random  # for random encounters
+import rng_streams
+import text_cache
 import inventory_state as inv
 from inventory_state import add_item, remove_item
 import party_state as party
 from party_state import party as party_list
 import game_data as gd
-from game_data import WEAPONS, WEAPON_SHOP_STOCK, ARMOR, ARMOR_SHOP_STOCK
+import item_catalog
 import combat
-
-pygame.init()
+from battle_sim import get_equipped_weapon, get_weapon_attack_bonus
+import world_tiles
+import transitions
+import minimap
+import scenes
+from collision_grid import CollisionGrid
+from spatial_hash import SpatialHash
+from glyph_atlas import draw_hud_text
 
 # ---------------------------
 # GLOBAL GAME STATE CLEANUP
@@ -36,11 +42,36 @@ inn_prompt_active = False
 
 # ----------- BASIC SETUP -----------
 WIDTH, HEIGHT = 960, 540
-SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("JRPG Overworld Prototype (Tilemap)")
+CAPTION = "JRPG Overworld Prototype (Tilemap)"
 
+# The window and font are created by init_display() (called from main()),
+# so importing this module never opens a window.
+SCREEN = None
+FONT = None
 CLOCK = pygame.time.Clock()
-FONT = pygame.font.SysFont("arial", 18)
+
+# Frame-driven screen transitions (see transitions.py); never blocks the loop
+TILE_TRANSITION_STYLE = "fade"  # "fade", "wipe" or "iris"
+screen_transition = transitions.Transition((WIDTH, HEIGHT))
+
+# Overworld minimap; tiles stay fogged until visited (see minimap.py)
+MINIMAP = minimap.Minimap(gd.WORLD_MAP, gd.WORLD_POSITIONS, None, fog=True)
+
+
+def init_display():
+    """Open the overworld window and load the UI font (safe to call again)."""
+    global SCREEN, FONT
+    pygame.init()
+    SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption(CAPTION)
+    if FONT is None:
+        FONT = pygame.font.SysFont("arial", 18)
+        MINIMAP.font = FONT
+    return SCREEN
+
+# Seeded RNG stream (see rng_streams.py); rng_streams.seed_all() replays a walk.
+# Tile decoration is seeded per tile in world_tiles.py.
+ENCOUNTER_RNG = rng_streams.stream("encounter")
 
 TILE_SIZE = 32
 COLS = WIDTH // TILE_SIZE  # 30
@@ -148,6 +179,12 @@ TOWN_MAP = [
 # Any tile in this set is solid.
 SOLID_TILES = {"H"}
 
+# Tilemaps compiled into solidity grids once at load (see collision_grid.py).
+# Keyed like AREA_DRAWERS; areas without a grid have no tile collision.
+AREA_COLLISION = {
+    ("TOWN", 0, 0): CollisionGrid.from_rows(TOWN_MAP, SOLID_TILES, TILE_SIZE),
+}
+
 # --- DOOR DEFINITIONS -------------------------------------------------
 
 
@@ -156,6 +193,11 @@ def tile_rect(tx, ty):
     return pygame.Rect(tx * TILE_SIZE, ty * TILE_SIZE, TILE_SIZE, TILE_SIZE)
 
 
+# helper: center of a tile in world pixels
+def tile_center(tx, ty):
+    return (tx * TILE_SIZE + TILE_SIZE // 2, ty * TILE_SIZE + TILE_SIZE // 2)
+
+
 # Doors in the town, by tile coordinate
 DOORS_TOWN = [
     {
@@ -163,21 +205,21 @@ DOORS_TOWN = [
         "rect": tile_rect(4, 4),
         "interior": "INN",
         "target_scene": "INN",
-        "return_pos": (4 * TILE_SIZE, 4 * TILE_SIZE),
+        "return_pos": tile_center(4, 5),  # the tile below the door
     },
     {
         "name": "Item Shop",
         "rect": tile_rect(20, 4),
         "interior": "ITEM_SHOP",
         "target_scene": "ITEM_SHOP",
-        "return_pos": (20 * TILE_SIZE, 4 * TILE_SIZE),
+        "return_pos": tile_center(20, 5),  # the tile below the door
     },
     {
         "name": "Weapon Shop",
         "rect": tile_rect(4, 14),
         "interior": "WEAPON_SHOP",
         "target_scene": "WEAPON_SHOP",
-        "return_pos": (4 * TILE_SIZE, 14 * TILE_SIZE),
+        "return_pos": tile_center(4, 15),  # the tile below the door
     },
     {
         "name": "Town Gate",
@@ -220,6 +262,7 @@ last_town_position = (0, 0)
 current_tile = "TOWN_CENTER"
 tile_background = None
 tile_objects = []
+tile_solids = SpatialHash()  # solid tile_objects by grid cell (from world_tiles)
 step_count = 0  # track steps for encounter calculation
 
 # ----------- OVERWORLD MENU STATE -----------
@@ -247,22 +290,13 @@ equip_cursor_item = 0  # which weapon in the list
 equip_item_scroll = 0
 EQUIP_VISIBLE_MAX = 8
 
-# --- Shop stock definitions ---
-SHOP_STOCK = [
-    {"id": "Potion", "name": "Potion", "price": 30, "desc": "Heals 30 HP."},
-    {"id": "Hi-Potion", "name": "Hi-Potion", "price": 90, "desc": "Heals 90 HP."},
-    {"id": "Ether", "name": "Ether", "price": 60, "desc": "Restores 30 MP."},
-]
+# --- Shop stock (item ids, in display order; definitions in game_data.ITEMS) ---
+SHOP_STOCK = item_catalog.shop_stock("ITEM_SHOP")
+WEAPON_SHOP_STOCK = item_catalog.shop_stock("WEAPON_SHOP")
+ARMOR_SHOP_STOCK = item_catalog.shop_stock("ARMOR_SHOP")
 
 SHOP_VISIBLE_MAX = 5  # how many items to show on screen at once
 
-# Item data for display in menus
-ITEM_DATA = {
-    "Potion": {"name": "Potion", "desc": "Heals 30 HP."},
-    "Hi-Potion": {"name": "Hi-Potion", "desc": "Heals 90 HP."},
-    "Ether": {"name": "Ether", "desc": "Restores 30 MP."},
-}
-
 # Item shop UI
 shop_ui_open = False
 shop_menu_index = 0
@@ -270,8 +304,6 @@ shop_menu_index = 0
 # Weapon shop state
 weapon_shop_open = False
 weapon_shop_cursor = 0
-weapon_shop_items = []  # filled when you enter shop
-weapon_shop_target = "Hero"  # which character we are buying for (expand later)
 
 # Armor shop state
 armor_shop_open = False
@@ -323,20 +355,28 @@ def tile_at(px: float, py: float):
     tx = int(px // TILE_SIZE)
     ty = int(py // TILE_SIZE)
 
-    if tx < 0 or ty < 0 or ty >= ROWS or tx >= len(TOWN_MAP[0]):
+    if tx < 0 or ty < 0 or ty >= len(TOWN_MAP) or tx >= len(TOWN_MAP[ty]):
         return "G"  # treat outside as grass
 
     return TOWN_MAP[ty][tx]
 
 
 def is_blocked(px: float, py: float) -> bool:
-    """Return True if the given pixel position is blocked by a solid tile."""
-    # Only check collision in main town area
-    if current_area != "TOWN" or area_x != 0 or area_y != 0:
+    """Return True if the player centered at (px, py) would overlap a solid tile."""
+    # Tile collision only applies on town screens that have a tilemap
+    if current_scene != "TOWN":
+        return False
+    grid = AREA_COLLISION.get((current_area, area_x, area_y))
+    if grid is None:
         return False  # no collision in other areas
 
-    ch = tile_at(px, py)
-    return ch in SOLID_TILES
+    # Every tile under the player's box, not just the one under its center
+    half = PLAYER_SIZE // 2
+    return grid.blocks_rect(px - half, py - half, PLAYER_SIZE, PLAYER_SIZE)
+
+
+# Reused by move_player() for object collision
+_player_hitbox = pygame.Rect(0, 0, PLAYER_SIZE, PLAYER_SIZE)
 
 
 def move_player(dx: float, dy: float):
@@ -361,40 +401,62 @@ def move_player(dx: float, dy: float):
 
     # Check collision with world tile objects (in WORLD scene)
     if current_scene == "WORLD":
-        player_rect = pygame.Rect(
+        _player_hitbox.topleft = (
             player_x - PLAYER_SIZE // 2,
             player_y - PLAYER_SIZE // 2,
-            PLAYER_SIZE,
-            PLAYER_SIZE,
         )
 
-        for obj in tile_objects:
-            if obj.get("solid") and obj.get("rect"):
-                if player_rect.colliderect(obj["rect"]):
-                    # Collision detected - revert movement
-                    player_x = old_x
-                    player_y = old_y
-                    moved = False
-                    break
+        # Only the solid objects in the grid cells under the player are tested
+        if tile_solids.first_hit(_player_hitbox) is not None:
+            # Collision detected - revert movement
+            player_x = old_x
+            player_y = old_y
+            moved = False
 
     # Increment step count if player actually moved
     if moved and current_scene == "WORLD" and (dx != 0 or dy != 0):
         step_count += 1
 
 
+def _start_tile_transition(new_tile, direction, new_x=None, new_y=None):
+    """
+    Fade to `new_tile` without blocking: the tile swap and the player's new
+    position happen at the transition's midpoint, while the screen is black.
+    """
+    # Start building the destination now so it is ready by the midpoint
+    world_tiles.prefetcher.request(new_tile, (WIDTH, HEIGHT))
+
+    def swap_tile():
+        global player_x, player_y, current_tile
+        current_tile = new_tile
+        if new_x is not None:
+            player_x = new_x
+        if new_y is not None:
+            player_y = new_y
+        load_world_tile(current_tile)
+
+    screen_transition.start(
+        TILE_TRANSITION_STYLE,
+        on_midpoint=swap_tile,
+        direction=direction,
+        center=(int(player_x), int(player_y)),
+    )
+
+
 def handle_world_tile_transitions():
     """Check if player has moved off screen edge and transition to adjacent tile."""
-    global player_x, player_y, current_tile
+    global player_x, player_y
+
+    # Already on the way to the next tile
+    if screen_transition.active:
+        return
 
     transitioned = False
 
     if player_x < 0:
         new_tile = gd.WORLD_MAP[current_tile].get("west")
         if new_tile:
-            fade_transition()
-            current_tile = new_tile
-            player_x = WIDTH - 40
-            load_world_tile(current_tile)
+            _start_tile_transition(new_tile, "left", new_x=WIDTH - 40)
             transitioned = True
         else:
             player_x = 0
@@ -402,32 +464,23 @@ def handle_world_tile_transitions():
     elif player_x > WIDTH:
         new_tile = gd.WORLD_MAP[current_tile].get("east")
         if new_tile:
-            fade_transition()
-            current_tile = new_tile
-            player_x = 20
-            load_world_tile(current_tile)
+            _start_tile_transition(new_tile, "right", new_x=20)
             transitioned = True
         else:
             player_x = WIDTH
 
-    if player_y < 0:
+    if not transitioned and player_y < 0:
         new_tile = gd.WORLD_MAP[current_tile].get("north")
         if new_tile:
-            fade_transition()
-            current_tile = new_tile
-            player_y = HEIGHT - 40
-            load_world_tile(current_tile)
+            _start_tile_transition(new_tile, "up", new_y=HEIGHT - 40)
             transitioned = True
         else:
             player_y = 0
 
-    elif player_y > HEIGHT:
+    elif not transitioned and player_y > HEIGHT:
         new_tile = gd.WORLD_MAP[current_tile].get("south")
         if new_tile:
-            fade_transition()
-            current_tile = new_tile
-            player_y = 20
-            load_world_tile(current_tile)
+            _start_tile_transition(new_tile, "down", new_y=20)
             transitioned = True
         else:
             player_y = HEIGHT
@@ -437,7 +490,7 @@ def handle_world_tile_transitions():
         tile_type = gd.WORLD_MAP[current_tile]["tile_type"]
         encounter_rate = gd.ENCOUNTER_RATES.get(tile_type, 0.0)
 
-        if encounter_rate > 0 and random.random() < encounter_rate:
+        if encounter_rate > 0 and ENCOUNTER_RNG.random() < encounter_rate:
             start_battle()
 
 
@@ -555,33 +608,34 @@ def handle_area_transition(player_rect):
 
 
 # ----------- DRAWING -----------
-def draw_tile(x, y, ch):
-    """Draw a single tile at tile coordinates (x, y)."""
+def draw_tile(x, y, ch, surface=None):
+    """Draw a single tile at tile coordinates (x, y) (onto SCREEN by default)."""
+    surface = surface or SCREEN
     px = x * TILE_SIZE
     py = y * TILE_SIZE
 
     if ch == "G" or ch == ".":
-        pygame.draw.rect(SCREEN, GRASS, (px, py, TILE_SIZE, TILE_SIZE))
+        pygame.draw.rect(surface, GRASS, (px, py, TILE_SIZE, TILE_SIZE))
     elif ch == "R":
-        pygame.draw.rect(SCREEN, ROAD, (px, py, TILE_SIZE, TILE_SIZE))
+        pygame.draw.rect(surface, ROAD, (px, py, TILE_SIZE, TILE_SIZE))
     elif ch == "H":
-        pygame.draw.rect(SCREEN, HOUSE, (px, py, TILE_SIZE, TILE_SIZE))
+        pygame.draw.rect(surface, HOUSE, (px, py, TILE_SIZE, TILE_SIZE))
     elif ch == "D":
-        pygame.draw.rect(SCREEN, HOUSE, (px, py, TILE_SIZE, TILE_SIZE))
+        pygame.draw.rect(surface, HOUSE, (px, py, TILE_SIZE, TILE_SIZE))
         door_rect = pygame.Rect(
             px + TILE_SIZE // 4,
             py + TILE_SIZE // 4,
             TILE_SIZE // 2,
             TILE_SIZE * 3 // 4,
         )
-        pygame.draw.rect(SCREEN, DOOR, door_rect)
+        pygame.draw.rect(surface, DOOR, door_rect)
     elif ch == "^":
         pygame.draw.rect(
-            SCREEN, HOUSE, (px, py + TILE_SIZE // 4, TILE_SIZE, TILE_SIZE * 3 // 4)
+            surface, HOUSE, (px, py + TILE_SIZE // 4, TILE_SIZE, TILE_SIZE * 3 // 4)
         )
-        pygame.draw.rect(SCREEN, ROOF, (px, py, TILE_SIZE, TILE_SIZE // 3))
+        pygame.draw.rect(surface, ROOF, (px, py, TILE_SIZE, TILE_SIZE // 3))
     else:
-        pygame.draw.rect(SCREEN, GRASS, (px, py, TILE_SIZE, TILE_SIZE))
+        pygame.draw.rect(surface, GRASS, (px, py, TILE_SIZE, TILE_SIZE))
 
 
 def draw_town_doors(player_rect):
@@ -611,7 +665,9 @@ def draw_town_doors(player_rect):
         if player_rect.colliderect(rect):
             pygame.draw.rect(SCREEN, (255, 255, 0), rect, 3)
 
-            prompt = FONT.render(f"Press ENTER to enter {name}", True, (255, 255, 255))
+            prompt = text_cache.render(
+                FONT, f"Press ENTER to enter {name}", True, (255, 255, 255)
+            )
             SCREEN.blit(prompt, (rect.x - 20, rect.y - 30))
 
             active_building = name
@@ -634,7 +690,7 @@ def draw_town_npcs(surface):
         rect = pygame.Rect(npc["x"], npc["y"], TILE_SIZE, TILE_SIZE)
         # Simple placeholder: blue-ish square for NPCs
         pygame.draw.rect(surface, (80, 120, 255), rect)
-        name_text = FONT.render(npc["name"], True, (255, 255, 255))
+        name_text = text_cache.render(FONT, npc["name"], True, (255, 255, 255))
         surface.blit(name_text, (npc["x"], npc["y"] - 14))
 
 
@@ -651,8 +707,16 @@ def draw_town_0_0(surface, player_rect):
     draw_town()
 
 
-def draw_town_1_0(surface, player_rect):
-    """East side of town – more houses, no shops wired yet."""
+def paint_town_0_0(surface):
+    """Static layer of the main town screen: grass and the TOWN_MAP tiles."""
+    surface.fill(GRASS)
+    for y, row in enumerate(TOWN_MAP):
+        for x, ch in enumerate(row):
+            draw_tile(x, y, ch, surface)
+
+
+def paint_town_1_0(surface):
+    """Static layer of the east side of town: road and houses."""
     surface.fill((10, 40, 10))  # grass
 
     # simple dirt road across the middle
@@ -684,16 +748,21 @@ def draw_town_1_0(surface, player_rect):
         surface, door_color, (right_house.centerx - 10, right_house.bottom - 35, 20, 35)
     )
 
+
+def draw_town_1_0(surface, player_rect):
+    """East side of town – more houses, no shops wired yet."""
+    surface.blit(get_area_layer(("TOWN", 1, 0)), (0, 0))
+
     # Player
     pygame.draw.rect(surface, PLAYER_COLOR, player_rect)
 
     # "Town East" label
-    label = FONT.render("Town East", True, (255, 255, 255))
+    label = text_cache.render(FONT, "Town East", True, (255, 255, 255))
     surface.blit(label, (WIDTH // 2 - label.get_width() // 2, 20))
 
 
-def draw_field_0_1(surface, player_rect):
-    """Simple road + grass field south of town."""
+def paint_field_0_1(surface):
+    """Static layer of the field south of town: road and trees."""
     surface.fill((5, 60, 5))
 
     # vertical road up the middle
@@ -709,10 +778,15 @@ def draw_field_0_1(surface, player_rect):
         pygame.draw.rect(surface, tree_trunk, trunk)
         pygame.draw.circle(surface, tree_leaves, (x + 10, HEIGHT // 2 + 30), 35)
 
+
+def draw_field_0_1(surface, player_rect):
+    """Simple road + grass field south of town."""
+    surface.blit(get_area_layer(("FIELD", 0, 1)), (0, 0))
+
     # Player
     pygame.draw.rect(surface, PLAYER_COLOR, player_rect)
 
-    label = FONT.render("South Road", True, (255, 255, 255))
+    label = text_cache.render(FONT, "South Road", True, (255, 255, 255))
     surface.blit(label, (WIDTH // 2 - label.get_width() // 2, 20))
 
 
@@ -723,190 +797,51 @@ AREA_DRAWERS = {
     ("FIELD", 0, 1): draw_field_0_1,
 }
 
+# Static scenery of each area, baked once into a screen-sized layer; the
+# draw functions above blit it and draw doors, NPCs and the player on top.
+AREA_PAINTERS = {
+    ("TOWN", 0, 0): paint_town_0_0,
+    ("TOWN", 1, 0): paint_town_1_0,
+    ("FIELD", 0, 1): paint_field_0_1,
+}
 
-def draw_current_area(surface, player_rect):
-    """Dispatch to the correct area draw function."""
-    key = (current_area, area_x, area_y)
-    func = AREA_DRAWERS.get(key, draw_town_0_0)  # safe fallback
-    func(surface, player_rect)
-
-
-# ----------- WORLD TILE LOADING FUNCTIONS -----------
-
-
-def load_town_center():
-    """Town center background."""
-    surf = pygame.Surface((WIDTH, HEIGHT))
-    surf.fill((180, 150, 100))  # dirt/town color
-    # Add some texture
-    for i in range(50):
-        x = random.randint(0, WIDTH)
-        y = random.randint(0, HEIGHT)
-        pygame.draw.circle(surf, (170, 140, 90), (x, y), 3)
-    return surf
-
-
-def load_town_edge():
-    """Town edge background."""
-    surf = pygame.Surface((WIDTH, HEIGHT))
-    surf.fill((170, 130, 90))
-    # Add grass patches
-    for i in range(30):
-        x = random.randint(0, WIDTH)
-        y = random.randint(0, HEIGHT)
-        pygame.draw.circle(surf, (100, 140, 80), (x, y), 8)
-    return surf
-
-
-def load_forest_route():
-    """Forest area background."""
-    surf = pygame.Surface((WIDTH, HEIGHT))
-    surf.fill((40, 80, 40))  # dark green
-    # Add darker grass texture
-    for i in range(80):
-        x = random.randint(0, WIDTH)
-        y = random.randint(0, HEIGHT)
-        pygame.draw.circle(surf, (30, 70, 30), (x, y), 4)
-    return surf
-
-
-def load_grass_field():
-    """Grass field background."""
-    surf = pygame.Surface((WIDTH, HEIGHT))
-    surf.fill((90, 180, 90))  # bright green
-    # Add lighter patches
-    for i in range(60):
-        x = random.randint(0, WIDTH)
-        y = random.randint(0, HEIGHT)
-        pygame.draw.circle(surf, (100, 200, 100), (x, y), 6)
-    return surf
-
-
-def load_mountain():
-    """Mountain area background."""
-    surf = pygame.Surface((WIDTH, HEIGHT))
-    surf.fill((100, 100, 120))  # gray rocky
-    # Add rocks
-    for i in range(40):
-        x = random.randint(0, WIDTH)
-        y = random.randint(0, HEIGHT)
-        pygame.draw.circle(surf, (80, 80, 100), (x, y), 5)
-    return surf
-
-
-def load_lake():
-    """Lake/water area background."""
-    surf = pygame.Surface((WIDTH, HEIGHT))
-    surf.fill((60, 120, 180))  # blue water
-    # Add water ripples
-    for i in range(50):
-        x = random.randint(0, WIDTH)
-        y = random.randint(0, HEIGHT)
-        pygame.draw.circle(surf, (70, 130, 190), (x, y), 7)
-    return surf
-
-
-def load_blank():
-    """Fallback blank background."""
-    surf = pygame.Surface((WIDTH, HEIGHT))
-    surf.fill((0, 0, 0))  # black
-    return surf
-
-
-def place_forest_trees():
-    """Return list of tree objects for forest tiles."""
-    objects = []
-    for i in range(10):
-        x = random.randint(80, WIDTH - 80)
-        y = random.randint(80, HEIGHT - 80)
-        # Draw tree on surface
-        tree_surf = pygame.Surface((40, 60), pygame.SRCALPHA)
-        # Trunk
-        pygame.draw.rect(tree_surf, (60, 40, 20), (15, 35, 10, 25))
-        # Leaves
-        pygame.draw.circle(tree_surf, (20, 80, 20), (20, 20), 20)
-
-        rect = pygame.Rect(x, y, 40, 60)
-        objects.append({"image": tree_surf, "pos": (x, y), "rect": rect, "solid": True})
-    return objects
-
-
-def place_boulders():
-    """Return list of boulder objects for field tiles."""
-    objects = []
-    for i in range(8):
-        x = random.randint(80, WIDTH - 80)
-        y = random.randint(80, HEIGHT - 80)
-        size = random.randint(25, 40)
-        boulder_surf = pygame.Surface((size, size), pygame.SRCALPHA)
-        pygame.draw.circle(
-            boulder_surf, (120, 120, 120), (size // 2, size // 2), size // 2
-        )
-        pygame.draw.circle(
-            boulder_surf, (100, 100, 100), (size // 2 - 3, size // 2 - 3), size // 2 - 5
-        )
-
-        rect = pygame.Rect(x, y, size, size)
-        objects.append(
-            {"image": boulder_surf, "pos": (x, y), "rect": rect, "solid": True}
-        )
-    return objects
-
-
-def place_rocks():
-    """Return list of rock objects for mountain tiles."""
-    objects = []
-    for i in range(12):
-        x = random.randint(60, WIDTH - 60)
-        y = random.randint(60, HEIGHT - 60)
-        size = random.randint(30, 50)
-        rock_surf = pygame.Surface((size, size), pygame.SRCALPHA)
-        pygame.draw.polygon(
-            rock_surf, (80, 80, 100), [(size // 2, 0), (size, size), (0, size)]
-        )
-
-        rect = pygame.Rect(x, y, size, size)
-        objects.append({"image": rock_surf, "pos": (x, y), "rect": rect, "solid": True})
-    return objects
+# (area_name, x, y) -> baked Surface
+_area_layers = {}
 
 
-def place_water_reeds():
-    """Return list of reed objects for lake tiles."""
-    objects = []
-    for i in range(15):
-        x = random.randint(60, WIDTH - 60)
-        y = random.randint(60, HEIGHT - 60)
-        reed_surf = pygame.Surface((10, 30), pygame.SRCALPHA)
-        pygame.draw.line(reed_surf, (40, 100, 60), (5, 30), (5, 0), 3)
+def get_area_layer(key):
+    """The baked static layer for an area, painted on first use."""
+    layer = _area_layers.get(key)
+    if layer is None:
+        layer = pygame.Surface((WIDTH, HEIGHT))
+        if pygame.display.get_surface() is not None:
+            layer = layer.convert()
+        AREA_PAINTERS[key](layer)
+        _area_layers[key] = layer
+    return layer
 
-        objects.append(
-            {"image": reed_surf, "pos": (x, y), "rect": None, "solid": False}
-        )
-    return objects
 
+def invalidate_town_layers():
+    """
+    Call after changing TOWN_MAP (or any area's scenery): drops the baked
+    layers and recompiles the town collision grid.
+    """
+    _area_layers.clear()
+    AREA_COLLISION[("TOWN", 0, 0)] = CollisionGrid.from_rows(
+        TOWN_MAP, SOLID_TILES, TILE_SIZE
+    )
 
-def generate_tile_objects(tile_name):
-    """Generate objects for a tile based on its type (unified generator)."""
-    if tile_name not in gd.WORLD_MAP:
-        return []
-
-    tile_type = gd.WORLD_MAP[tile_name]["tile_type"]
 
-    if tile_type == "forest":
-        return place_forest_trees()
-    elif tile_type == "field":
-        return place_boulders()
-    elif tile_type == "mountain":
-        return place_rocks()
-    elif tile_type == "lake":
-        return place_water_reeds()
-    else:
-        return []
+def draw_current_area(surface, player_rect):
+    """Dispatch to the correct area draw function."""
+    key = (current_area, area_x, area_y)
+    func = AREA_DRAWERS.get(key, draw_town_0_0)  # safe fallback
+    func(surface, player_rect)
 
 
 def load_world_tile(tile_id):
-    """Load the correct area graphics based on tile_type."""
-    global tile_background, tile_objects
+    """Load the tile's background and objects (cached after the first visit)."""
+    global tile_background, tile_objects, tile_solids
 
     # --- FULL STATE RESET WHEN ENTERING A NEW MAP ---
     global CURRENT_INTERIOR, world_menu_open, dialog_active, step_count
@@ -917,118 +852,25 @@ def load_world_tile(tile_id):
     # Reset step counter so movement doesn't trigger effects on spawn
     step_count = 0
 
-    data = gd.WORLD_MAP[tile_id]
-    tile_type = data["tile_type"]
-
-    if tile_type == "town":
-        tile_background = load_town_center()
-        tile_objects = []
-    elif tile_type == "town_edge":
-        tile_background = load_town_edge()
-        tile_objects = []
-    elif tile_type == "forest":
-        tile_background = load_forest_route()
-        tile_objects = place_forest_trees()
-    elif tile_type == "field":
-        tile_background = load_grass_field()
-        tile_objects = place_boulders()
-    elif tile_type == "mountain":
-        tile_background = load_mountain()
-        tile_objects = place_rocks()
-    elif tile_type == "lake":
-        tile_background = load_lake()
-        tile_objects = place_water_reeds()
-    else:
-        tile_background = load_blank()
-        tile_objects = []
-
-
-def fade_transition():
-    """Fade out/in effect for tile transitions."""
-    for alpha in range(0, 255, 15):
-        fade_surface = pygame.Surface((WIDTH, HEIGHT))
-        fade_surface.fill(BLACK)
-        fade_surface.set_alpha(alpha)
-        SCREEN.blit(fade_surface, (0, 0))
-        pygame.display.update()
-        CLOCK.tick(60)
-
-    # Fade back in
-    for alpha in range(255, 0, -15):
-        fade_surface = pygame.Surface((WIDTH, HEIGHT))
-        fade_surface.fill(BLACK)
-        fade_surface.set_alpha(alpha)
-        SCREEN.blit(fade_surface, (0, 0))
-        pygame.display.update()
-        CLOCK.tick(60)
+    # Seeded per tile and cached (see world_tiles.py): revisits are a lookup
+    tile = world_tiles.get_tile(tile_id, (WIDTH, HEIGHT))
+    tile_background = tile.background
+    tile_objects = tile.objects
+    tile_solids = tile.solids
+    MINIMAP.explore(tile_id)
+    world_tiles.prefetch_neighbors(tile_id, (WIDTH, HEIGHT))
 
 
 def draw_minimap(screen):
     """Draw FF-style minimap in top-right corner."""
-    mini_size = 180
-    tile_size = 28
-    mini = pygame.Surface((mini_size, mini_size))
-    mini.fill((20, 20, 20))
-
-    # Border
-    pygame.draw.rect(mini, (100, 100, 150), (0, 0, mini_size, mini_size), 2)
-
-    # Draw all known tiles
-    for tile_id, data in gd.WORLD_MAP.items():
-        if tile_id in gd.WORLD_POSITIONS:
-            grid_x, grid_y = gd.WORLD_POSITIONS[tile_id]
-
-            # Offset to center the map
-            offset_x = 2
-            offset_y = 3
-
-            x = (grid_x + offset_x) * tile_size + 10
-            y = (grid_y + offset_y) * tile_size + 10
-
-            # Color by biome
-            tile_type = data["tile_type"]
-            if tile_type == "town":
-                color = (200, 200, 0)  # yellow
-            elif tile_type == "town_edge":
-                color = (180, 150, 100)  # tan
-            elif tile_type == "forest":
-                color = (0, 150, 0)  # green
-            elif tile_type == "field":
-                color = (100, 200, 100)  # light green
-            elif tile_type == "mountain":
-                color = (120, 120, 150)  # gray
-            elif tile_type == "lake":
-                color = (60, 120, 200)  # blue
-            else:
-                color = (80, 80, 80)  # gray
-
-            pygame.draw.rect(mini, color, (x, y, tile_size - 4, tile_size - 4))
-
-    # Highlight current tile
-    if current_tile in gd.WORLD_POSITIONS:
-        grid_x, grid_y = gd.WORLD_POSITIONS[current_tile]
-        offset_x = 2
-        offset_y = 3
-        x = (grid_x + offset_x) * tile_size + 10
-        y = (grid_y + offset_y) * tile_size + 10
-        pygame.draw.rect(mini, (255, 255, 255), (x, y, tile_size - 4, tile_size - 4), 3)
-
-    # Title
-    title = FONT.render("Map", True, (255, 255, 255))
-    mini.blit(title, (mini_size // 2 - title.get_width() // 2, 4))
-
-    screen.blit(mini, (WIDTH - mini_size - 10, 10))
+    # Base map cached in MINIMAP; only the current-tile outline is per frame
+    MINIMAP.draw(screen, current_tile, (WIDTH - minimap.MINIMAP_SIZE - 10, 10))
 
 
 def draw_town():
     """Draw the town tilemap and base UI."""
-    SCREEN.fill(GRASS)
-
-    # Tilemap
-    for y in range(ROWS):
-        row = TOWN_MAP[y]
-        for x in range(len(row)):
-            draw_tile(x, y, row[x])
+    # Tilemap (baked once, see get_area_layer)
+    SCREEN.blit(get_area_layer(("TOWN", 0, 0)), (0, 0))
 
     # Create player rect (used for door highlighting and drawing)
     player_rect = pygame.Rect(0, 0, PLAYER_SIZE, PLAYER_SIZE)
@@ -1048,13 +890,15 @@ def draw_town():
     pygame.draw.rect(SCREEN, UI_BG, ui_rect)
     pygame.draw.rect(SCREEN, UI_TEXT, ui_rect, 1)
 
-    text1 = FONT.render("Arrows / WASD: Move", True, UI_TEXT)
-    text2 = FONT.render("B: Start Battle   ESC: Overworld Menu", True, UI_TEXT)
+    text1 = text_cache.render(FONT, "Arrows / WASD: Move", True, UI_TEXT)
+    text2 = text_cache.render(
+        FONT, "B: Start Battle   ESC: Overworld Menu", True, UI_TEXT
+    )
     SCREEN.blit(text1, (ui_rect.x + 8, ui_rect.y + 6))
     SCREEN.blit(text2, (ui_rect.x + 8, ui_rect.y + 28))
 
     if debug_message:
-        msg = FONT.render(debug_message, True, UI_TEXT)
+        msg = text_cache.render(FONT, debug_message, True, UI_TEXT)
         SCREEN.blit(msg, (8, HEIGHT - 26))
 
 
@@ -1083,20 +927,24 @@ def draw_world_tile():
     pygame.draw.rect(SCREEN, UI_BG, ui_rect)
     pygame.draw.rect(SCREEN, UI_TEXT, ui_rect, 1)
 
-    text1 = FONT.render("Arrows/WASD: Move  ESC: Menu  B: Battle", True, UI_TEXT)
+    text1 = text_cache.render(
+        FONT, "Arrows/WASD: Move  ESC: Menu  B: Battle", True, UI_TEXT
+    )
 
     # Show biome name and step counter
     tile_type = gd.WORLD_MAP[current_tile]["tile_type"]
     biome_name = tile_type.replace("_", " ").title()
     encounter_rate = gd.ENCOUNTER_RATES.get(tile_type, 0.0)
-    text2 = FONT.render(
-        f"{current_tile} ({biome_name}) | Steps: {step_count} | Rate: {encounter_rate*100:.1f}%",
-        True,
-        (200, 200, 255),
-    )
 
     SCREEN.blit(text1, (ui_rect.x + 8, ui_rect.y + 6))
-    SCREEN.blit(text2, (ui_rect.x + 8, ui_rect.y + 32))
+    draw_hud_text(
+        "world_status",
+        SCREEN,
+        FONT,
+        (200, 200, 255),
+        f"{current_tile} ({biome_name}) | Steps: {step_count} | Rate: {encounter_rate*100:.1f}%",
+        (ui_rect.x + 8, ui_rect.y + 32),
+    )
 
     # Show prompt to enter town if on TOWN_CENTER
     if current_tile == "TOWN_CENTER":
@@ -1104,9 +952,9 @@ def draw_world_tile():
         pygame.draw.rect(SCREEN, (40, 40, 80), prompt_rect)
         pygame.draw.rect(SCREEN, (255, 255, 0), prompt_rect, 3)
 
-        prompt1 = FONT.render("TOWN GATE", True, (255, 255, 0))
-        prompt2 = FONT.render("Press ENTER to", True, (255, 255, 255))
-        prompt3 = FONT.render("enter town", True, (255, 255, 255))
+        prompt1 = text_cache.render(FONT, "TOWN GATE", True, (255, 255, 0))
+        prompt2 = text_cache.render(FONT, "Press ENTER to", True, (255, 255, 255))
+        prompt3 = text_cache.render(FONT, "enter town", True, (255, 255, 255))
         SCREEN.blit(
             prompt1,
             (prompt_rect.x + 150 - prompt1.get_width() // 2, prompt_rect.y + 10),
@@ -1121,7 +969,7 @@ def draw_world_tile():
         )
 
     if debug_message:
-        msg = FONT.render(debug_message, True, (255, 255, 0))
+        msg = text_cache.render(FONT, debug_message, True, (255, 255, 0))
         msg_rect = pygame.Rect(8, 8, msg.get_width() + 16, 30)
         pygame.draw.rect(SCREEN, (40, 40, 80), msg_rect)
         pygame.draw.rect(SCREEN, (255, 255, 0), msg_rect, 2)
@@ -1140,7 +988,7 @@ def draw_interior(title_text, counter_color):
     pygame.draw.rect(SCREEN, counter_color, (140, 140, WIDTH - 280, 80))
 
     # Title label
-    title = FONT.render(title_text, True, WHITE)
+    title = text_cache.render(FONT, title_text, True, WHITE)
     title_rect = title.get_rect(center=(WIDTH // 2, 90))
     SCREEN.blit(title, title_rect)
 
@@ -1150,7 +998,7 @@ def draw_interior(title_text, counter_color):
     pygame.draw.rect(SCREEN, (230, 230, 230), player_rect)
 
     # Exit prompt
-    prompt = FONT.render("Press Enter / Esc to leave", True, WHITE)
+    prompt = text_cache.render(FONT, "Press Enter / Esc to leave", True, WHITE)
     prompt_rect = prompt.get_rect(center=(WIDTH // 2, HEIGHT - 40))
     SCREEN.blit(prompt, prompt_rect)
 
@@ -1230,11 +1078,11 @@ def draw_interior_ui():
     pygame.draw.rect(SCREEN, PLAYER_COLOR, player_rect)
 
     # NPC name
-    name_txt = FONT.render(npc_name, True, (255, 255, 0))
+    name_txt = text_cache.render(FONT, npc_name, True, (255, 255, 0))
     SCREEN.blit(name_txt, (WIDTH // 2 - name_txt.get_width() // 2, 80))
 
     # Greeting
-    welcome_txt = FONT.render(welcome, True, WHITE)
+    welcome_txt = text_cache.render(FONT, welcome, True, WHITE)
     SCREEN.blit(welcome_txt, (WIDTH // 2 - welcome_txt.get_width() // 2, 110))
 
     # Shop UI
@@ -1248,15 +1096,23 @@ def draw_interior_ui():
             color = (255, 255, 0) if i == shop_selection else WHITE
             price = prices.get(item, 0)
             line = f"{item} - {price}g"
-            txt = FONT.render(line, True, color)
+            txt = text_cache.render(FONT, line, True, color)
             SCREEN.blit(txt, (WIDTH // 2 - 100, menu_y + i * 25))
 
         # Gold display
-        gold_txt = FONT.render(f"Gold: {inv.player_gold}g", True, (255, 255, 0))
-        SCREEN.blit(gold_txt, (WIDTH - gold_txt.get_width() - 20, 20))
+        draw_hud_text(
+            "interior_gold",
+            SCREEN,
+            FONT,
+            (255, 255, 0),
+            f"Gold: {inv.player_gold}g",
+            (WIDTH - 20, 20),
+            "topright",
+        )
 
         # Instructions
-        instr = FONT.render(
+        instr = text_cache.render(
+            FONT,
             "↑↓ Select   Enter: Buy   Esc: Leave", True, (180, 180, 180)
         )
         SCREEN.blit(instr, (WIDTH // 2 - instr.get_width() // 2, HEIGHT - 40))
@@ -1265,15 +1121,22 @@ def draw_interior_ui():
     elif CURRENT_INTERIOR == "INN":
         price = data["heal_price"]
         line = f"Stay the night? {price} gold."
-        txt = FONT.render(line, True, WHITE)
+        txt = text_cache.render(FONT, line, True, WHITE)
         SCREEN.blit(txt, (WIDTH // 2 - txt.get_width() // 2, HEIGHT // 2))
 
-        instr = FONT.render("Enter: Yes   Esc: No", True, (180, 180, 180))
+        instr = text_cache.render(FONT, "Enter: Yes   Esc: No", True, (180, 180, 180))
         SCREEN.blit(instr, (WIDTH // 2 - instr.get_width() // 2, HEIGHT // 2 + 40))
 
         # Gold display
-        gold_txt = FONT.render(f"Gold: {inv.player_gold}g", True, (255, 255, 0))
-        SCREEN.blit(gold_txt, (WIDTH - gold_txt.get_width() - 20, 20))
+        draw_hud_text(
+            "interior_gold",
+            SCREEN,
+            FONT,
+            (255, 255, 0),
+            f"Gold: {inv.player_gold}g",
+            (WIDTH - 20, 20),
+            "topright",
+        )
 
 
 def attempt_purchase(item_id, price):
@@ -1322,7 +1185,7 @@ def draw_item_shop_interior(screen, font, player_rect):
     pygame.draw.rect(screen, (120, 120, 200), room_rect, 2)
 
     # Title
-    title = font.render("Item Shop", True, WHITE)
+    title = text_cache.render(font, "Item Shop", True, WHITE)
     title_rect = title.get_rect(center=(WIDTH // 2, 60))
     screen.blit(title, title_rect)
 
@@ -1408,7 +1271,7 @@ def draw_item_shop_interior(screen, font, player_rect):
     pygame.draw.rect(screen, WHITE, player_rect)
 
     # Hint
-    hint = font.render("Enter: Talk / Door   Esc: Leave", True, WHITE)
+    hint = text_cache.render(font, "Enter: Talk / Door   Esc: Leave", True, WHITE)
     hint_rect = hint.get_rect(center=(WIDTH // 2, HEIGHT - 30))
     screen.blit(hint, hint_rect)
 
@@ -1426,7 +1289,9 @@ def draw_item_shop_interior(screen, font, player_rect):
         pygame.draw.rect(screen, WHITE, panel_rect, 2)
 
         # Gold display
-        gold_text = font.render(f"Gold: {inv.player_gold}", True, MENU_HILIGHT)
+        gold_text = text_cache.render(
+            font, f"Gold: {inv.player_gold}", True, MENU_HILIGHT
+        )
         screen.blit(gold_text, (panel_rect.x + 12, panel_rect.y + 10))
 
         # Item list
@@ -1434,19 +1299,21 @@ def draw_item_shop_interior(screen, font, player_rect):
         end = min(len(SHOP_STOCK), start + SHOP_VISIBLE_MAX)
 
         y = panel_rect.y + 30
-        for i, item in enumerate(SHOP_STOCK[start:end]):
+        for i, item_id in enumerate(SHOP_STOCK[start:end]):
             idx = start + i
+            item = item_catalog.get(item_id)
             name = item["name"]
             price = item["price"]
-            qty = inv.inventory.get(item["id"], 0)
+            qty = inv.inventory.get(item_id, 0)
 
             color = MENU_HILIGHT if idx == shop_menu_index else WHITE
             label = f"{name:<10}  {price:>3} G   (Have: {qty})"
-            text = font.render(label, True, color)
+            text = text_cache.render(font, label, True, color)
             screen.blit(text, (panel_rect.x + 20, y))
             y += 22
 
-        help_text = font.render(
+        help_text = text_cache.render(
+            font,
             "Up/Down: Select   Enter: Buy   Esc: Cancel", True, WHITE
         )
         help_rect = help_text.get_rect(
@@ -1486,7 +1353,7 @@ def draw_overworld_menu():
 
 def draw_overworld_main_menu(screen, panel_rect):
     """Draw the main menu options."""
-    title = FONT.render("Menu", True, WHITE)
+    title = text_cache.render(FONT, "Menu", True, WHITE)
     title_rect = title.get_rect(midtop=(panel_rect.centerx, panel_rect.y + 10))
     screen.blit(title, title_rect)
 
@@ -1497,7 +1364,7 @@ def draw_overworld_main_menu(screen, panel_rect):
         color = WHITE
         if i == menu_index:
             color = MENU_HILIGHT
-        label = FONT.render(text, True, color)
+        label = text_cache.render(FONT, text, True, color)
         screen.blit(label, (panel_rect.x + 40, y))
         y += 26
 
@@ -1505,20 +1372,20 @@ def draw_overworld_main_menu(screen, panel_rect):
 def draw_overworld_inventory(screen, panel_rect):
     """Draw the inventory view."""
     # Title
-    title = FONT.render("Inventory", True, WHITE)
+    title = text_cache.render(FONT, "Inventory", True, WHITE)
     title_rect = title.get_rect(midtop=(panel_rect.centerx, panel_rect.y + 10))
     screen.blit(title, title_rect)
 
     # Show current gold
-    gold_text = FONT.render(f"Gold: {inv.player_gold}", True, MENU_HILIGHT)
+    gold_text = text_cache.render(FONT, f"Gold: {inv.player_gold}", True, MENU_HILIGHT)
     screen.blit(gold_text, (panel_rect.x + 20, title_rect.bottom + 10))
 
     # List items
-    items = [(k, v) for k, v in inv.inventory.items() if v > 0]
+    items = get_inventory_items_as_list()
     y = title_rect.bottom + 40
 
     if not items:
-        msg = FONT.render("You have no items.", True, (200, 200, 200))
+        msg = text_cache.render(FONT, "You have no items.", True, (200, 200, 200))
         screen.blit(msg, (panel_rect.x + 20, y))
         return
 
@@ -1527,12 +1394,12 @@ def draw_overworld_inventory(screen, panel_rect):
         if i == inv_cursor:
             color = MENU_HILIGHT
 
-        label = FONT.render(f"{item_id} x{qty}", True, color)
+        label = text_cache.render(FONT, f"{item_id} x{qty}", True, color)
         screen.blit(label, (panel_rect.x + 20, y))
         y += 22
 
     # Small hint at bottom
-    hint = FONT.render("ESC: Back", True, (200, 200, 200))
+    hint = text_cache.render(FONT, "ESC: Back", True, (200, 200, 200))
     hint_rect = hint.get_rect(
         bottomright=(panel_rect.right - 10, panel_rect.bottom - 10)
     )
@@ -1540,10 +1407,22 @@ def draw_overworld_inventory(screen, panel_rect):
 
 
 def launch_battle():
-    """Launch combat.py as a subprocess."""
-    global debug_message
-    subprocess.run([sys.executable, "combat.py"])
-    debug_message = "Returned from battle."
+    """Run a battle in-process on the current window and live party state."""
+    global debug_message, SCREEN
+
+    result = combat.run_battle()
+
+    # The battle may have resized the window; grab the restored display surface
+    SCREEN = pygame.display.get_surface()
+
+    if result.winner == "HERO":
+        debug_message = f"Victory! +{result.xp} XP, +{result.gold} G"
+    elif result.winner == "ENEMY":
+        debug_message = "The party was defeated..."
+    elif result.winner == "ESCAPE":
+        debug_message = "Got away safely."
+    else:
+        debug_message = "Returned from battle."
 
 
 def start_battle():
@@ -1561,7 +1440,7 @@ def draw_weapon_shop_interior(screen, font, player_rect):
     pygame.draw.rect(screen, (15, 15, 40), room_rect)
     pygame.draw.rect(screen, (120, 120, 200), room_rect, 2)
 
-    title = font.render("Weapon Shop", True, WHITE)
+    title = text_cache.render(font, "Weapon Shop", True, WHITE)
     title_rect = title.get_rect(center=(WIDTH // 2, 60))
     screen.blit(title, title_rect)
 
@@ -1637,7 +1516,9 @@ def draw_weapon_shop_interior(screen, font, player_rect):
     pygame.draw.rect(screen, WHITE, player_rect)
 
     # HUD text
-    hint = font.render("Enter at door: leave   Enter at counter: talk", True, WHITE)
+    hint = text_cache.render(
+        font, "Enter at door: leave   Enter at counter: talk", True, WHITE
+    )
     hint_rect = hint.get_rect(center=(WIDTH // 2, HEIGHT - 30))
     screen.blit(hint, hint_rect)
 
@@ -1649,10 +1530,6 @@ def price_str(v):
 
 def calculate_weapon_preview(member, weapon_name):
     """Return (old_attack, new_attack) if equipped."""
-    from game_data import WEAPONS
-
-    weapon_data = WEAPONS[weapon_name]
-
     old_atk = member.attack
     temp_weapon = member.weapon
 
@@ -1678,11 +1555,13 @@ def draw_weapon_shop_ui(screen):
     pygame.draw.rect(screen, (255, 255, 255), panel_rect, 2)
 
     # Title
-    title = FONT.render("Weapon Shop", True, (255, 255, 255))
+    title = text_cache.render(FONT, "Weapon Shop", True, (255, 255, 255))
     screen.blit(title, (panel_rect.x + 20, panel_rect.y + 10))
 
     # Gold display
-    gold_text = FONT.render(f"Gold: {inv.player_gold} G", True, (255, 220, 100))
+    gold_text = text_cache.render(
+        FONT, f"Gold: {inv.player_gold} G", True, (255, 220, 100)
+    )
     screen.blit(gold_text, (panel_rect.right - 160, panel_rect.y + 10))
 
     # -------------------------------
@@ -1692,7 +1571,7 @@ def draw_weapon_shop_ui(screen):
     list_y = panel_rect.y + 60
 
     for i, item_name in enumerate(WEAPON_SHOP_STOCK):
-        weapon = WEAPONS[item_name]
+        weapon = item_catalog.get(item_name)
         y = list_y + i * 36
 
         # Highlight selected item
@@ -1702,7 +1581,7 @@ def draw_weapon_shop_ui(screen):
         else:
             color = (255, 255, 255)
 
-        text = FONT.render(f"{item_name} - {weapon['price']}G", True, color)
+        text = text_cache.render(FONT, f"{item_name} - {weapon['price']}G", True, color)
         screen.blit(text, (list_x, y))
 
     # -------------------------------
@@ -1710,20 +1589,20 @@ def draw_weapon_shop_ui(screen):
     # -------------------------------
     if WEAPON_SHOP_STOCK:
         item_name = WEAPON_SHOP_STOCK[weapon_shop_cursor]
-        weapon = WEAPONS[item_name]
+        weapon = item_catalog.get(item_name)
 
         preview_x = panel_rect.x + 340
         preview_y = panel_rect.y + 60
 
         # Item Title
-        name_text = FONT.render(item_name, True, (255, 255, 255))
+        name_text = text_cache.render(FONT, item_name, True, (255, 255, 255))
         screen.blit(name_text, (preview_x, preview_y))
 
         # Show which party members can equip
-        allowed_label = FONT.render("Can Equip:", True, (255, 255, 255))
+        allowed_label = text_cache.render(FONT, "Can Equip:", True, (255, 255, 255))
         screen.blit(allowed_label, (preview_x, preview_y + 30))
         allowed = ", ".join(weapon["allowed_jobs"])
-        allowed_text = FONT.render(allowed, True, (100, 255, 100))
+        allowed_text = text_cache.render(FONT, allowed, True, (100, 255, 100))
         screen.blit(allowed_text, (preview_x + 100, preview_y + 30))
 
         # Preview for Hero (party_list[0])
@@ -1735,12 +1614,16 @@ def draw_weapon_shop_ui(screen):
             else:
                 # Fallback for dict-based party
                 old_atk = member.get("attack", 0)
-                new_atk = old_atk + weapon.get("attack", 0)
+                new_atk = old_atk + weapon.get("attack_bonus", 0)
 
-            atk_old = FONT.render(f"Current ATK: {old_atk}", True, (255, 255, 255))
+            atk_old = text_cache.render(
+                FONT, f"Current ATK: {old_atk}", True, (255, 255, 255)
+            )
             screen.blit(atk_old, (preview_x, preview_y + 70))
 
-            atk_new = FONT.render(f"New ATK:     {new_atk}", True, (255, 255, 0))
+            atk_new = text_cache.render(
+                FONT, f"New ATK:     {new_atk}", True, (255, 255, 0)
+            )
             screen.blit(atk_new, (preview_x, preview_y + 90))
 
         # Bottom description
@@ -1750,16 +1633,17 @@ def draw_weapon_shop_ui(screen):
         pygame.draw.rect(screen, (35, 35, 35), desc_box)
         pygame.draw.rect(screen, (255, 255, 255), desc_box, 2)
 
-        desc_text = f"ATK +{weapon.get('attack', 0)}"
-        if weapon.get("magic", 0) > 0:
-            desc_text += f"  MAG +{weapon['magic']}"
-        if weapon.get("defense", 0) != 0:
-            desc_text += f"  DEF {weapon['defense']:+d}"
+        desc_text = f"ATK +{weapon.get('attack_bonus', 0)}"
+        if weapon.get("magic_bonus", 0) > 0:
+            desc_text += f"  MAG +{weapon['magic_bonus']}"
+        if weapon.get("defense_bonus", 0) != 0:
+            desc_text += f"  DEF {weapon['defense_bonus']:+d}"
 
-        desc = FONT.render(desc_text, True, (255, 255, 255))
+        desc = text_cache.render(FONT, desc_text, True, (255, 255, 255))
         screen.blit(desc, (desc_box.x + 10, desc_box.y + 10))
 
-        hint = FONT.render(
+        hint = text_cache.render(
+            FONT,
             "↑/↓: Select   Enter: Buy   ESC: Exit", True, (180, 180, 180)
         )
         screen.blit(hint, (desc_box.x + 10, desc_box.y + 35))
@@ -1767,9 +1651,6 @@ def draw_weapon_shop_ui(screen):
 
 def calculate_armor_preview(member, armor_name):
     """Returns (old_defense, new_defense) after equipping armor."""
-    from game_data import ARMOR
-
-    armor_data = ARMOR[armor_name]
     old_def = member.defense
 
     temp = member.armor  # save old armor
@@ -1793,11 +1674,13 @@ def draw_armor_shop_ui(screen):
     pygame.draw.rect(screen, (255, 255, 255), panel_rect, 2)
 
     # Title
-    title = FONT.render("Armor Shop", True, (255, 255, 255))
+    title = text_cache.render(FONT, "Armor Shop", True, (255, 255, 255))
     screen.blit(title, (panel_rect.x + 20, panel_rect.y + 10))
 
     # Gold display
-    gold_text = FONT.render(f"Gold: {inv.player_gold} G", True, (255, 220, 100))
+    gold_text = text_cache.render(
+        FONT, f"Gold: {inv.player_gold} G", True, (255, 220, 100)
+    )
     screen.blit(gold_text, (panel_rect.right - 160, panel_rect.y + 10))
 
     # -------------------------------
@@ -1810,7 +1693,7 @@ def draw_armor_shop_ui(screen):
     cursor = globals().get("armor_shop_cursor", 0)
 
     for i, item_name in enumerate(ARMOR_SHOP_STOCK):
-        armor = ARMOR[item_name]
+        armor = item_catalog.get(item_name)
         y = list_y + i * 36
 
         # Highlight selected item
@@ -1820,7 +1703,7 @@ def draw_armor_shop_ui(screen):
         else:
             color = (255, 255, 255)
 
-        text = FONT.render(f"{item_name} - {armor['price']}G", True, color)
+        text = text_cache.render(FONT, f"{item_name} - {armor['price']}G", True, color)
         screen.blit(text, (list_x, y))
 
     # -------------------------------
@@ -1828,20 +1711,20 @@ def draw_armor_shop_ui(screen):
     # -------------------------------
     if ARMOR_SHOP_STOCK:
         item_name = ARMOR_SHOP_STOCK[cursor]
-        armor = ARMOR[item_name]
+        armor = item_catalog.get(item_name)
 
         preview_x = panel_rect.x + 340
         preview_y = panel_rect.y + 60
 
         # Item Title
-        name_text = FONT.render(item_name, True, (255, 255, 255))
+        name_text = text_cache.render(FONT, item_name, True, (255, 255, 255))
         screen.blit(name_text, (preview_x, preview_y))
 
         # Show which party members can equip
-        allowed_label = FONT.render("Can Equip:", True, (255, 255, 255))
+        allowed_label = text_cache.render(FONT, "Can Equip:", True, (255, 255, 255))
         screen.blit(allowed_label, (preview_x, preview_y + 30))
         allowed = ", ".join(armor["allowed_jobs"])
-        allowed_text = FONT.render(allowed, True, (100, 255, 100))
+        allowed_text = text_cache.render(FONT, allowed, True, (100, 255, 100))
         screen.blit(allowed_text, (preview_x + 100, preview_y + 30))
 
         # Preview for Hero (party_list[0])
@@ -1853,12 +1736,16 @@ def draw_armor_shop_ui(screen):
             else:
                 # Fallback for dict-based party
                 old_def = member.get("defense", 0)
-                new_def = old_def + armor.get("defense", 0)
+                new_def = old_def + armor.get("defense_bonus", 0)
 
-            def_old = FONT.render(f"Current DEF: {old_def}", True, (255, 255, 255))
+            def_old = text_cache.render(
+                FONT, f"Current DEF: {old_def}", True, (255, 255, 255)
+            )
             screen.blit(def_old, (preview_x, preview_y + 70))
 
-            def_new = FONT.render(f"New DEF:     {new_def}", True, (255, 255, 0))
+            def_new = text_cache.render(
+                FONT, f"New DEF:     {new_def}", True, (255, 255, 0)
+            )
             screen.blit(def_new, (preview_x, preview_y + 90))
 
         # Bottom description
@@ -1868,14 +1755,15 @@ def draw_armor_shop_ui(screen):
         pygame.draw.rect(screen, (35, 35, 35), desc_box)
         pygame.draw.rect(screen, (255, 255, 255), desc_box, 2)
 
-        desc_text = f"DEF +{armor.get('defense', 0)}"
-        if armor.get("magic", 0) > 0:
-            desc_text += f"  MAG +{armor['magic']}"
+        desc_text = f"DEF +{armor.get('defense_bonus', 0)}"
+        if armor.get("magic_bonus", 0) > 0:
+            desc_text += f"  MAG +{armor['magic_bonus']}"
 
-        desc = FONT.render(desc_text, True, (255, 255, 255))
+        desc = text_cache.render(FONT, desc_text, True, (255, 255, 255))
         screen.blit(desc, (desc_box.x + 10, desc_box.y + 10))
 
-        hint = FONT.render(
+        hint = text_cache.render(
+            FONT,
             "↑/↓: Select   Enter: Buy   ESC: Exit", True, (180, 180, 180)
         )
         screen.blit(hint, (desc_box.x + 10, desc_box.y + 35))
@@ -1892,7 +1780,7 @@ def draw_inn_interior(screen, font):
     pygame.draw.rect(screen, (120, 120, 200), room_rect, 2)
 
     # Title
-    title = font.render("Inn", True, WHITE)
+    title = text_cache.render(font, "Inn", True, WHITE)
     title_rect = title.get_rect(center=(WIDTH // 2, 60))
     screen.blit(title, title_rect)
 
@@ -1967,7 +1855,9 @@ def draw_inn_interior(screen, font):
     pygame.draw.rect(screen, WHITE, player_rect)
 
     # Hint text
-    hint = font.render("Enter at door: leave   Enter at counter: talk", True, WHITE)
+    hint = text_cache.render(
+        font, "Enter at door: leave   Enter at counter: talk", True, WHITE
+    )
     hint_rect = hint.get_rect(center=(WIDTH // 2, HEIGHT - 30))
     screen.blit(hint, hint_rect)
 
@@ -1986,7 +1876,8 @@ def draw_inn_interior(screen, font):
 
         if inn_dialog_state == 1:
             # Ask to stay
-            msg = font.render(
+            msg = text_cache.render(
+                font,
                 f"Stay the night for {INN_PRICE} G? (Gold: {inv.player_gold})",
                 True,
                 WHITE,
@@ -1996,13 +1887,13 @@ def draw_inn_interior(screen, font):
             options = ["Yes", "No"]
             for i, label in enumerate(options):
                 c = MENU_HILIGHT if i == inn_cursor_index else WHITE
-                t = font.render(label, True, c)
+                t = text_cache.render(font, label, True, c)
                 screen.blit(t, (panel_rect.x + 40 + i * 80, panel_rect.y + 40))
 
         elif inn_dialog_state == 2:
             # Result text only; press any key to close
             msg = getattr(draw_inn_interior, "last_message", "You feel rested.")
-            text = font.render(msg, True, WHITE)
+            text = text_cache.render(font, msg, True, WHITE)
             text_rect = text.get_rect(center=panel_rect.center)
             screen.blit(text, text_rect)
 
@@ -2025,17 +1916,19 @@ def draw_inn_ui(screen):
     pygame.draw.rect(screen, (20, 20, 40), panel_rect)
     pygame.draw.rect(screen, (255, 255, 255), panel_rect, 2)
 
-    title = FONT.render("Inn", True, (255, 255, 255))
+    title = text_cache.render(FONT, "Inn", True, (255, 255, 255))
     screen.blit(title, (panel_rect.x + 16, panel_rect.y + 12))
 
-    cost_text = FONT.render(
+    cost_text = text_cache.render(
+        FONT,
         f"Stay the night for {inv.INN_COST}G?",
         True,
         (255, 255, 255),
     )
     screen.blit(cost_text, (panel_rect.x + 16, panel_rect.y + 48))
 
-    gold_text = FONT.render(
+    gold_text = text_cache.render(
+        FONT,
         f"Gold: {inv.player_gold}",
         True,
         (255, 255, 200),
@@ -2049,17 +1942,18 @@ def draw_inn_ui(screen):
         color = (255, 255, 255)
         if i == inn_menu_index:
             color = (240, 220, 120)
-            arrow = FONT.render("▶", True, color)
+            arrow = text_cache.render(FONT, "▶", True, color)
             screen.blit(arrow, (panel_rect.x + 16, y))
             text_x = panel_rect.x + 32
         else:
             text_x = panel_rect.x + 32
 
-        label = FONT.render(opt, True, color)
+        label = text_cache.render(FONT, opt, True, color)
         screen.blit(label, (text_x, y))
         y += 24
 
-    hint = FONT.render(
+    hint = text_cache.render(
+        FONT,
         "↑↓: Select   Enter: Confirm   ESC: Cancel",
         True,
         (200, 200, 200),
@@ -2081,7 +1975,7 @@ def draw_inn_message(screen):
     pygame.draw.rect(screen, (0, 0, 0, 200), panel_rect)
     pygame.draw.rect(screen, (255, 255, 255), panel_rect, 2)
 
-    msg = FONT.render(inn_message, True, (255, 255, 255))
+    msg = text_cache.render(FONT, inn_message, True, (255, 255, 255))
     msg_rect = msg.get_rect(center=panel_rect.center)
     screen.blit(msg, msg_rect)
 
@@ -2105,10 +1999,10 @@ def draw_dialog_box(surface):
     # Show current line
     if dialog_index < len(dialog_lines):
         line = dialog_lines[dialog_index]
-        text_surf = FONT.render(line, True, (255, 255, 255))
+        text_surf = text_cache.render(FONT, line, True, (255, 255, 255))
         surface.blit(text_surf, (box_rect.x + 12, box_rect.y + 16))
 
-    hint = FONT.render("[Enter] to continue", True, (200, 200, 200))
+    hint = text_cache.render(FONT, "[Enter] to continue", True, (200, 200, 200))
     surface.blit(hint, (box_rect.right - 180, box_rect.bottom - 24))
 
 
@@ -2133,7 +2027,7 @@ def draw_overworld_menu(surface):
         color = (255, 255, 255)
         if i == world_menu_tab_index:
             color = (255, 255, 0)
-        text = FONT.render(tab, True, color)
+        text = text_cache.render(FONT, tab, True, color)
         surface.blit(text, (tab_x, tab_y))
         tab_x += text.get_width() + 24
 
@@ -2151,7 +2045,7 @@ def draw_overworld_menu(surface):
 
 def draw_status_tab(surface, panel_rect):
     """Draw the Status tab showing detailed party member stats."""
-    title = FONT.render("Party Status", True, (255, 255, 255))
+    title = text_cache.render(FONT, "Party Status", True, (255, 255, 255))
     surface.blit(title, (panel_rect.x + 20, panel_rect.y + 40))
 
     # Show all party members in columns
@@ -2162,29 +2056,35 @@ def draw_status_tab(surface, panel_rect):
         y = y_start + (i * 140)
 
         # Member name and level
-        name_text = FONT.render(
+        name_text = text_cache.render(
+            FONT,
             f"{member.name} (Lv {member.level})", True, (255, 255, 0)
         )
         surface.blit(name_text, (x_offset, y))
 
         # Job
-        job_text = FONT.render(f"Job: {member.job}", True, (200, 200, 200))
+        job_text = text_cache.render(FONT, f"Job: {member.job}", True, (200, 200, 200))
         surface.blit(job_text, (x_offset, y + 25))
 
         # HP/MP
-        hp_text = FONT.render(f"HP: {member.hp}/{member.max_hp}", True, (255, 255, 255))
+        hp_text = text_cache.render(
+            FONT, f"HP: {member.hp}/{member.max_hp}", True, (255, 255, 255)
+        )
         surface.blit(hp_text, (x_offset + 200, y))
 
-        mp_text = FONT.render(f"MP: {member.mp}/{member.max_mp}", True, (255, 255, 255))
+        mp_text = text_cache.render(
+            FONT, f"MP: {member.mp}/{member.max_mp}", True, (255, 255, 255)
+        )
         surface.blit(mp_text, (x_offset + 200, y + 25))
 
         # Stats
         stats_text = f"ATK: {member.attack}  DEF: {member.defense}  MAG: {member.magic}"
-        stats = FONT.render(stats_text, True, (255, 255, 255))
+        stats = text_cache.render(FONT, stats_text, True, (255, 255, 255))
         surface.blit(stats, (x_offset, y + 50))
 
         # XP Bar
-        xp_label = FONT.render(
+        xp_label = text_cache.render(
+            FONT,
             f"XP: {member.xp}/{member.xp_to_next}", True, (200, 200, 200)
         )
         surface.blit(xp_label, (x_offset, y + 75))
@@ -2214,33 +2114,38 @@ def draw_status_tab(surface, panel_rect):
             if hasattr(p_member, "armor"):
                 armor_name = p_member.armor or "None"
 
-        equip_text = FONT.render(
+        equip_text = text_cache.render(
+            FONT,
             f"Weapon: {weapon_name}  Armor: {armor_name}", True, (180, 180, 255)
         )
         surface.blit(equip_text, (x_offset, y + 100))
 
     # Show gold at bottom
     gold_line = f"Gold: {inv.player_gold} G"
-    gold_text = FONT.render(gold_line, True, (255, 220, 100))
+    gold_text = text_cache.render(FONT, gold_line, True, (255, 220, 100))
     surface.blit(gold_text, (panel_rect.x + 20, panel_rect.bottom - 40))
 
     # Hint
-    hint = FONT.render("View detailed stats for each character", True, (150, 150, 150))
+    hint = text_cache.render(
+        FONT, "View detailed stats for each character", True, (150, 150, 150)
+    )
     surface.blit(hint, (panel_rect.x + 20, panel_rect.bottom - 20))
 
 
 def draw_inventory_tab(surface, panel_rect):
     """Draw the Inventory tab showing items with scrolling."""
-    title = FONT.render("Inventory", True, (255, 255, 255))
+    title = text_cache.render(FONT, "Inventory", True, (255, 255, 255))
     surface.blit(title, (panel_rect.x + 20, panel_rect.y + 40))
 
     # Show gold in top-right
-    gold_text = FONT.render(f"Gold: {inv.player_gold} G", True, (255, 220, 100))
+    gold_text = text_cache.render(
+        FONT, f"Gold: {inv.player_gold} G", True, (255, 220, 100)
+    )
     surface.blit(gold_text, (panel_rect.right - 180, panel_rect.y + 40))
 
     items = get_inventory_items_as_list()
     if not items:
-        msg = FONT.render("No items.", True, (200, 200, 200))
+        msg = text_cache.render(FONT, "No items.", True, (200, 200, 200))
         surface.blit(msg, (panel_rect.x + 20, panel_rect.y + 80))
         return
 
@@ -2252,15 +2157,14 @@ def draw_inventory_tab(surface, panel_rect):
         item_id, qty = items[idx]
 
         # Look up item data
-        item_def = ITEM_DATA.get(item_id, {"name": item_id, "desc": ""})
-        name = item_def["name"]
+        name = item_catalog.name(item_id)
         line = f"{name}  x{qty}"
 
         color = (255, 255, 255)
         if idx == inv_cursor:
             color = (255, 255, 0)
 
-        text = FONT.render(line, True, color)
+        text = text_cache.render(FONT, line, True, color)
         surface.blit(text, (panel_rect.x + 20, y))
 
         y += 22
@@ -2268,11 +2172,11 @@ def draw_inventory_tab(surface, panel_rect):
 
 def draw_equipment_tab(surface, panel_rect):
     """Draw the Equipment tab."""
-    title = FONT.render("Equipment", True, (255, 255, 255))
+    title = text_cache.render(FONT, "Equipment", True, (255, 255, 255))
     surface.blit(title, (panel_rect.x + 20, panel_rect.y + 40))
 
     if not combat.party:
-        msg = FONT.render("No party members.", True, (200, 200, 200))
+        msg = text_cache.render(FONT, "No party members.", True, (200, 200, 200))
         surface.blit(msg, (panel_rect.x + 20, panel_rect.y + 80))
         return
 
@@ -2280,7 +2184,7 @@ def draw_equipment_tab(surface, panel_rect):
     y = panel_rect.y + 80
     x = panel_rect.x + 20
 
-    label = FONT.render("Character:", True, (255, 255, 255))
+    label = text_cache.render(FONT, "Character:", True, (255, 255, 255))
     surface.blit(label, (x, y))
 
     cx = x + 120
@@ -2288,7 +2192,7 @@ def draw_equipment_tab(surface, panel_rect):
         color = (255, 255, 255)
         if i == equip_cursor_char:
             color = (255, 255, 0)
-        name_text = FONT.render(member.name, True, color)
+        name_text = text_cache.render(FONT, member.name, True, color)
         surface.blit(name_text, (cx, y))
         cx += name_text.get_width() + 24
 
@@ -2296,22 +2200,22 @@ def draw_equipment_tab(surface, panel_rect):
     actor = combat.party[equip_cursor_char]
     y += 30
     info_line = f"LV {actor.level}   ATK {actor.attack}   MAG {actor.magic}"
-    info_text = FONT.render(info_line, True, (255, 255, 255))
+    info_text = text_cache.render(FONT, info_line, True, (255, 255, 255))
     surface.blit(info_text, (panel_rect.x + 20, y))
 
     # Current weapon display
-    cur_weapon_id = combat.get_equipped_weapon(actor)
+    cur_weapon_id = get_equipped_weapon(actor)
     if cur_weapon_id is None:
         weap_name = "None"
         weap_bonus = 0
     else:
         weap_data = gd.ITEMS.get(cur_weapon_id, {})
         weap_name = weap_data.get("name", cur_weapon_id)
-        weap_bonus = combat.get_weapon_attack_bonus(cur_weapon_id)
+        weap_bonus = get_weapon_attack_bonus(cur_weapon_id)
 
     y += 24
     current_line = f"Weapon: {weap_name}  (ATK +{weap_bonus})"
-    current_text = FONT.render(current_line, True, (200, 200, 255))
+    current_text = text_cache.render(FONT, current_line, True, (200, 200, 255))
     surface.blit(current_text, (panel_rect.x + 20, y))
 
     # --- Weapon list from inventory ---
@@ -2319,11 +2223,11 @@ def draw_equipment_tab(surface, panel_rect):
     weapons = get_weapon_inventory_list()
 
     if not weapons:
-        msg = FONT.render("No weapons in inventory.", True, (200, 200, 200))
+        msg = text_cache.render(FONT, "No weapons in inventory.", True, (200, 200, 200))
         surface.blit(msg, (panel_rect.x + 20, y))
         return
 
-    list_title = FONT.render("Equip from Bag:", True, (255, 255, 255))
+    list_title = text_cache.render(FONT, "Equip from Bag:", True, (255, 255, 255))
     surface.blit(list_title, (panel_rect.x + 20, y))
     y += 20
 
@@ -2334,13 +2238,13 @@ def draw_equipment_tab(surface, panel_rect):
         item_id, qty = weapons[idx]
         data = gd.ITEMS.get(item_id, {})
         name = data.get("name", item_id)
-        atk_bonus = combat.get_weapon_attack_bonus(item_id)
+        atk_bonus = get_weapon_attack_bonus(item_id)
 
         # preview new ATK if this was equipped
         preview_attack = actor.attack
         # Remove current weapon's bonus to compute "true" base+other gear
         if cur_weapon_id is not None:
-            preview_attack -= combat.get_weapon_attack_bonus(cur_weapon_id)
+            preview_attack -= get_weapon_attack_bonus(cur_weapon_id)
         preview_attack += atk_bonus
 
         line = f"{name} x{qty}   ATK +{atk_bonus}  -> ATK {preview_attack}"
@@ -2349,13 +2253,14 @@ def draw_equipment_tab(surface, panel_rect):
         if idx == equip_cursor_item:
             color = (255, 255, 0)
 
-        text = FONT.render(line, True, color)
+        text = text_cache.render(FONT, line, True, color)
         surface.blit(text, (panel_rect.x + 20, y))
 
         y += 22
 
     # Optional hint
-    hint = FONT.render(
+    hint = text_cache.render(
+        FONT,
         "←/→: Change character   ↑/↓: Select weapon   Enter: Equip",
         True,
         (180, 180, 180),
@@ -2365,10 +2270,10 @@ def draw_equipment_tab(surface, panel_rect):
 
 def draw_system_tab(surface, panel_rect):
     """Draw the System tab with save/load/quit options."""
-    title = FONT.render("System", True, (255, 255, 255))
+    title = text_cache.render(FONT, "System", True, (255, 255, 255))
     surface.blit(title, (panel_rect.x + 20, panel_rect.y + 40))
 
-    msg = FONT.render("Save/Load/Quit will go here.", True, (200, 200, 200))
+    msg = text_cache.render(FONT, "Save/Load/Quit will go here.", True, (200, 200, 200))
     surface.blit(msg, (panel_rect.x + 20, panel_rect.y + 80))
 
 
@@ -2378,32 +2283,24 @@ def draw_system_tab(surface, panel_rect):
 
 
 def get_equippable_items(member, slot):
-    """Get list of items from inventory that member can equip in slot."""
-    results = []
-
-    if slot == "weapon":
-        source_dict = WEAPONS
-    elif slot == "armor":
-        source_dict = ARMOR
-    else:
-        return results
-
+    """Get list of (item_id, item_data) that member can equip in slot."""
     # Get member's job
     member_job = member.get("job", "Hero") if isinstance(member, dict) else member.job
 
-    for item_name, item_data in source_dict.items():
-        # Check if member's job can use this item
-        if member_job in item_data.get("allowed_jobs", []):
-            results.append((item_name, item_data))
-
-    return results
+    items = gd.ITEMS
+    return [
+        (item_id, items[item_id])
+        for item_id in item_catalog.equippable(slot, member_job)
+    ]
 
 
 def draw_equipment_menu():
     """Draw the party member selection screen for equipment."""
     SCREEN.fill((20, 20, 35))
 
-    title = FONT.render("Equipment - Select Party Member", True, (255, 255, 255))
+    title = text_cache.render(
+        FONT, "Equipment - Select Party Member", True, (255, 255, 255)
+    )
     SCREEN.blit(title, (40, 20))
 
     # Use party_list for display
@@ -2413,10 +2310,10 @@ def draw_equipment_menu():
             member.get("name", "Unknown") if isinstance(member, dict) else member.name
         )
         color = (255, 255, 0) if i == equip_index else (255, 255, 255)
-        text = FONT.render(member_name, True, color)
+        text = text_cache.render(FONT, member_name, True, color)
         SCREEN.blit(text, (60, y + i * 40))
 
-    hint = FONT.render("Enter = Select   ESC = Back", True, (200, 200, 200))
+    hint = text_cache.render(FONT, "Enter = Select   ESC = Back", True, (200, 200, 200))
     SCREEN.blit(hint, (40, HEIGHT - 60))
 
 
@@ -2429,7 +2326,7 @@ def draw_equip_member(member):
         member.get("name", "Unknown") if isinstance(member, dict) else member.name
     )
 
-    title = FONT.render(f"{member_name}'s Equipment", True, (255, 255, 255))
+    title = text_cache.render(FONT, f"{member_name}'s Equipment", True, (255, 255, 255))
     SCREEN.blit(title, (40, 20))
 
     options = ["Weapon", "Armor"]
@@ -2440,7 +2337,7 @@ def draw_equip_member(member):
 
         # Slot name
         color = (255, 255, 0) if i == equip_slot_index else (255, 255, 255)
-        text = FONT.render(f"{slot}:", True, color)
+        text = text_cache.render(FONT, f"{slot}:", True, color)
         SCREEN.blit(text, (60, y))
 
         # Current equipment
@@ -2452,7 +2349,7 @@ def draw_equip_member(member):
         if current is None:
             current = "None"
 
-        eq_text = FONT.render(f"{current}", True, (180, 180, 255))
+        eq_text = text_cache.render(FONT, f"{current}", True, (180, 180, 255))
         SCREEN.blit(eq_text, (240, y))
 
         # Show stats
@@ -2460,16 +2357,20 @@ def draw_equip_member(member):
             member_atk = (
                 member.get("attack", 0) if isinstance(member, dict) else member.attack
             )
-            stat_text = FONT.render(f"ATK: {member_atk}", True, (200, 200, 200))
+            stat_text = text_cache.render(
+                FONT, f"ATK: {member_atk}", True, (200, 200, 200)
+            )
             SCREEN.blit(stat_text, (240, y + 25))
         else:  # Armor
             member_def = (
                 member.get("defense", 0) if isinstance(member, dict) else member.defense
             )
-            stat_text = FONT.render(f"DEF: {member_def}", True, (200, 200, 200))
+            stat_text = text_cache.render(
+                FONT, f"DEF: {member_def}", True, (200, 200, 200)
+            )
             SCREEN.blit(stat_text, (240, y + 25))
 
-    hint = FONT.render("Enter = Change   ESC = Back", True, (200, 200, 200))
+    hint = text_cache.render(FONT, "Enter = Change   ESC = Back", True, (200, 200, 200))
     SCREEN.blit(hint, (40, HEIGHT - 60))
 
 
@@ -2480,13 +2381,16 @@ def draw_equip_select(member, slot, items, selected):
     member_name = (
         member.get("name", "Unknown") if isinstance(member, dict) else member.name
     )
-    title = FONT.render(
+    title = text_cache.render(
+        FONT,
         f"Equip {slot.capitalize()} - {member_name}", True, (255, 255, 255)
     )
     SCREEN.blit(title, (40, 20))
 
     if not items:
-        msg = FONT.render("No equippable items available.", True, (200, 200, 200))
+        msg = text_cache.render(
+            FONT, "No equippable items available.", True, (200, 200, 200)
+        )
         SCREEN.blit(msg, (60, 120))
     else:
         y = 120
@@ -2496,23 +2400,24 @@ def draw_equip_select(member, slot, items, selected):
             # Item name and stats
             stat_bonus = ""
             if slot == "weapon":
-                atk = item_data.get("attack", 0)
+                atk = item_data.get("attack_bonus", 0)
                 stat_bonus = f" (ATK +{atk})"
             elif slot == "armor":
-                defense = item_data.get("defense", 0)
+                defense = item_data.get("defense_bonus", 0)
                 stat_bonus = f" (DEF +{defense})"
 
-            text = FONT.render(f"{item_name}{stat_bonus}", True, color)
+            text = text_cache.render(FONT, f"{item_name}{stat_bonus}", True, color)
             SCREEN.blit(text, (60, y + i * 35))
 
             # Price if available
             if "price" in item_data:
-                price_text = FONT.render(
+                price_text = text_cache.render(
+                    FONT,
                     f"{item_data['price']}G", True, (200, 200, 200)
                 )
                 SCREEN.blit(price_text, (400, y + i * 35))
 
-    hint = FONT.render("Enter = Equip   ESC = Back", True, (200, 200, 200))
+    hint = text_cache.render(FONT, "Enter = Equip   ESC = Back", True, (200, 200, 200))
     SCREEN.blit(hint, (40, HEIGHT - 60))
 
 
@@ -2544,7 +2449,7 @@ def draw_world_menu(screen):
 
         pygame.draw.rect(screen, (200, 200, 200), tab_rect, 1)
 
-        tab_text = FONT.render(tab_name, True, (255, 255, 255))
+        tab_text = text_cache.render(FONT, tab_name, True, (255, 255, 255))
         tab_text_rect = tab_text.get_rect(center=tab_rect.center)
         screen.blit(tab_text, tab_text_rect)
 
@@ -2558,21 +2463,24 @@ def draw_world_menu(screen):
     if active_tab == "Status":
         y_offset = content_y
 
-        # Draw party members with equipment
-        for char_name in ["Hero", "Warrior", "Mage"]:
-            base_atk = inv.BASE_ATTACK.get(char_name, 10)
-            weapon_name = inv.equipped_weapons.get(char_name, "None")
-            weapon_data = inv.WEAPONS.get(weapon_name, {})
-            weapon_bonus = weapon_data.get("atk_bonus", 0)
-            total_atk = base_atk + weapon_bonus
+        # Draw party members with equipment (the same stats battles use)
+        for char_data in party_list:
+            char_name = char_data["job"]
+            total_atk = char_data["attack"]
+            weapon_id = char_data.get("equipped_weapon")
+            weapon_name = item_catalog.name(weapon_id) if weapon_id else "None"
 
-            name_text = FONT.render(f"{char_name}", True, (255, 255, 100))
+            name_text = text_cache.render(FONT, f"{char_name}", True, (255, 255, 100))
             screen.blit(name_text, (panel_x + 20, y_offset))
 
-            atk_text = FONT.render(f"ATK: {total_atk}", True, (255, 255, 255))
+            atk_text = text_cache.render(
+                FONT, f"ATK: {total_atk}", True, (255, 255, 255)
+            )
             screen.blit(atk_text, (panel_x + 180, y_offset))
 
-            weapon_text = FONT.render(f"Weapon: {weapon_name}", True, (200, 200, 200))
+            weapon_text = text_cache.render(
+                FONT, f"Weapon: {weapon_name}", True, (200, 200, 200)
+            )
             screen.blit(weapon_text, (panel_x + 280, y_offset))
 
             y_offset += 35
@@ -2582,7 +2490,9 @@ def draw_world_menu(screen):
         items = inv.get_inventory_list()
 
         if not items:
-            no_items_text = FONT.render("No items in inventory", True, (150, 150, 150))
+            no_items_text = text_cache.render(
+                FONT, "No items in inventory", True, (150, 150, 150)
+            )
             screen.blit(no_items_text, (panel_x + 20, content_y))
         else:
             # Clamp cursor
@@ -2598,7 +2508,9 @@ def draw_world_menu(screen):
                     )
                     pygame.draw.rect(screen, (80, 80, 120), highlight_rect)
 
-                item_text = FONT.render(f"{name} x{qty}", True, (255, 255, 255))
+                item_text = text_cache.render(
+                    FONT, f"{name} x{qty}", True, (255, 255, 255)
+                )
                 screen.blit(item_text, (panel_x + 20, y_offset))
 
                 y_offset += 35
@@ -2606,16 +2518,18 @@ def draw_world_menu(screen):
                 # Show description for selected item
                 if i == world_menu_cursor and desc:
                     desc_y = panel_y + panel_h - 60
-                    desc_text = FONT.render(desc, True, (200, 200, 200))
+                    desc_text = text_cache.render(FONT, desc, True, (200, 200, 200))
                     screen.blit(desc_text, (panel_x + 20, desc_y))
 
     # ---- SYSTEM TAB ----
     elif active_tab == "System":
-        quit_text = FONT.render("Press Enter to Quit Game", True, (255, 100, 100))
+        quit_text = text_cache.render(
+            FONT, "Press Enter to Quit Game", True, (255, 100, 100)
+        )
         quit_rect = quit_text.get_rect(center=(panel_x + panel_w // 2, content_y + 50))
         screen.blit(quit_text, quit_rect)
 
-        hint_text = FONT.render("(or ESC to return)", True, (150, 150, 150))
+        hint_text = text_cache.render(FONT, "(or ESC to return)", True, (150, 150, 150))
         hint_rect = hint_text.get_rect(center=(panel_x + panel_w // 2, content_y + 90))
         screen.blit(hint_text, hint_rect)
 
@@ -2634,56 +2548,6 @@ def enter_item_shop():
     player_y = door_y
 
 
-def enter_weapon_shop():
-    """Enter the weapon shop and spawn player at the door."""
-    global current_scene, last_town_position, player_x, player_y
-    global weapon_shop_open, weapon_shop_cursor, weapon_shop_items
-    last_town_position = (player_x, player_y)
-    current_scene = "WEAPON_SHOP"
-    weapon_shop_open = False
-    weapon_shop_cursor = 0
-
-    # Build weapon shop inventory based on WEAPON_SHOP_STOCK
-    weapon_shop_items = []
-    for char_name, weapon_id in inv.WEAPON_SHOP_STOCK:
-        weapon = inv.WEAPON_DEFS.get(weapon_id)
-        if weapon:
-            weapon_shop_items.append((char_name, weapon_id))
-
-    # Spawn just inside the door (bottom middle of the interior frame)
-    door_y = HEIGHT - 80
-    player_x = WIDTH // 2
-    player_y = door_y
-
-
-def buy_weapon_at_cursor():
-    """Purchase the weapon currently selected in the weapon shop."""
-    global weapon_shop_cursor
-
-    if not weapon_shop_items:
-        return
-
-    weapon_name = weapon_shop_items[weapon_shop_cursor]
-    weapon_data = inv.WEAPONS[weapon_name]
-
-    price = weapon_data.get("price", 0)
-
-    # For now we buy for Hero; expand later with a selector if you want
-    target = "Hero"
-
-    # Check if already equipped
-    if inv.equipped_weapons.get(target) == weapon_name:
-        return  # Already equipped, fail silently
-
-    if inv.player_gold < price:
-        # You can add a message system later; for now just fail silently
-        return
-
-    inv.player_gold -= price
-    inv.equipped_weapons[target] = weapon_name
-    # Equipment will affect combat ATK on next battle via sync_party_equipment_from_inventory()
-
-
 def handle_weapon_shop_input(event):
     """Handle input when the weapon shop UI is open - NEW SYSTEM."""
     global weapon_shop_open, weapon_shop_cursor, menu_active
@@ -2703,7 +2567,7 @@ def handle_weapon_shop_input(event):
     elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
         # Try to buy/equip the selected weapon
         chosen = WEAPON_SHOP_STOCK[weapon_shop_cursor]
-        data = WEAPONS[chosen]
+        data = item_catalog.get(chosen)
 
         # Check gold
         if inv.player_gold < data["price"]:
@@ -2731,7 +2595,7 @@ def handle_weapon_shop_input(event):
                 hero["equipped_weapon"] = chosen
                 if "attack" in hero:
                     hero["attack"] = hero.get("base_attack", hero["attack"]) + data.get(
-                        "attack", 0
+                        "attack_bonus", 0
                     )
 
             print(f"Equipped {chosen}!")
@@ -2760,7 +2624,7 @@ def handle_armor_shop_input(event):
     elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
         # Try to buy/equip the selected armor
         chosen = ARMOR_SHOP_STOCK[armor_shop_cursor]
-        data = ARMOR[chosen]
+        data = item_catalog.get(chosen)
 
         # Check gold
         if inv.player_gold < data["price"]:
@@ -2789,7 +2653,7 @@ def handle_armor_shop_input(event):
                 if "defense" in hero:
                     hero["defense"] = hero.get(
                         "base_defense", hero["defense"]
-                    ) + data.get("defense", 0)
+                    ) + data.get("defense_bonus", 0)
 
             shop_message = f"Equipped {chosen}!"
             armor_shop_open = False
@@ -2831,11 +2695,7 @@ def get_inventory_items_as_list():
     Return [(item_id, qty), ...] for items that have qty > 0.
     Uses the centralized inventory from inventory_state module.
     """
-    items = []
-    for item_id, qty in inv.inventory.items():
-        if qty > 0:
-            items.append((item_id, qty))
-    return items
+    return item_catalog.owned(inv.inventory)
 
 
 def get_weapon_inventory_list():
@@ -2843,16 +2703,7 @@ def get_weapon_inventory_list():
     Return list of (item_id, qty) for all weapon items in inventory
     that have qty > 0.
     """
-    items = []
-    for item_id, qty in gd.INVENTORY.items():
-        if qty <= 0:
-            continue
-        data = gd.ITEMS.get(item_id)
-        if not data:
-            continue
-        if data.get("type") == "weapon":
-            items.append((item_id, qty))
-    return items
+    return item_catalog.owned(gd.INVENTORY, "weapon")
 
 
 def handle_inventory_tab_input(event):
@@ -3020,590 +2871,645 @@ def exit_building():
     current_scene = "TOWN"
 
 
-def main():
-    global debug_message, menu_active, menu_mode, menu_index, inv_cursor, current_scene
-    global shop_ui_open, shop_menu_index
-    global weapon_shop_open, weapon_shop_cursor
-    global inn_dialog_state, inn_cursor_index
-    global inn_ui_open, inn_menu_index, inn_message, inn_message_timer
-    global player_weapons
-    global world_menu_open, world_menu_tab_index, world_menu_cursor
-    global dialog_active, dialog_lines, dialog_index
-    global inv_scroll, equip_cursor_char, equip_cursor_slot
+# ----------- SCENES -----------
+# Each scene's input, per-frame update and drawing, registered in SCENES
+# below (see scenes.py). main() only runs the frame loop.
 
-    # Initialize world tile system
-    load_world_tile(current_tile)
 
-    current_scene = "WORLD"  # Start in world tile system
-    running = True
-    while running:
-        dt = CLOCK.tick(60) / 1000.0
+def player_screen_rect():
+    """The player's rect on screen, for drawing and door/keeper checks."""
+    player_rect = pygame.Rect(0, 0, PLAYER_SIZE, PLAYER_SIZE)
+    player_rect.center = (int(player_x), int(player_y))
+    return player_rect
 
-        dx = dy = 0
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-
-            # --- WEAPON SHOP HAS PRIORITY WHEN OPEN ---
-            if current_scene == "WEAPON_SHOP" and weapon_shop_open:
-                handle_weapon_shop_input(event)
-                # Do NOT let other handlers see this event
-                continue
-
-            if event.type == pygame.KEYDOWN:
-                # -------------------------------------------------
-                # ESC => toggle world menu (if not in a shop/inn scene)
-                # -------------------------------------------------
-                if event.key == pygame.K_ESCAPE:
-                    # Block if we're in ITEM_SHOP, WEAPON_SHOP, or INN and a UI is open
-                    block_toggle = False
-                    if current_scene == "ITEM_SHOP" and shop_ui_open:
-                        block_toggle = True
-                    elif current_scene == "WEAPON_SHOP" and weapon_shop_open:
-                        block_toggle = True
-                    elif current_scene == "INN" and inn_ui_open:
-                        block_toggle = True
-
-                    if not block_toggle:
-                        # Toggle the world menu
-                        world_menu_open = not world_menu_open
-                        menu_active = world_menu_open
-                        if world_menu_open:
-                            world_menu_tab_index = 0
-                            world_menu_cursor = 0
-                            inv_scroll = 0
-                        continue  # skip other ESC handlers
-
-                # -------------------------------------------------
-                # If world menu is open, handle tab/cursor navigation
-                # -------------------------------------------------
-                if world_menu_open:
-                    if event.key == pygame.K_LEFT:
-                        world_menu_tab_index = (world_menu_tab_index - 1) % len(
-                            world_menu_tabs
-                        )
-                        world_menu_cursor = 0
-                    elif event.key == pygame.K_RIGHT:
-                        world_menu_tab_index = (world_menu_tab_index + 1) % len(
-                            world_menu_tabs
-                        )
-                        world_menu_cursor = 0
-                    elif event.key == pygame.K_UP:
-                        # navigate within the active tab
-                        if world_menu_tabs[world_menu_tab_index] == "Inventory":
-                            world_menu_cursor = max(0, world_menu_cursor - 1)
-                    elif event.key == pygame.K_DOWN:
-                        if world_menu_tabs[world_menu_tab_index] == "Inventory":
-                            world_menu_cursor += 1  # clamp in draw code
-                    elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
-                        # System tab => quit
-                        if world_menu_tabs[world_menu_tab_index] == "System":
-                            running = False
-                    continue  # consume input when world menu is open
-
-                # When menu is open, only handle menu navigation
-                if menu_active:
-                    if menu_mode == "MAIN":
-                        main_options = ["Resume", "Inventory", "Quit"]
-
-                        if event.key == pygame.K_UP:
-                            menu_index = (menu_index - 1) % len(main_options)
-                        elif event.key == pygame.K_DOWN:
-                            menu_index = (menu_index + 1) % len(main_options)
-                        elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
-                            choice = main_options[menu_index]
-                            if choice == "Resume":
-                                menu_active = False
-                            elif choice == "Inventory":
-                                menu_mode = "INVENTORY"
-                                inv_cursor = 0
-                            elif choice == "Quit":
-                                running = False
-                        elif event.key == pygame.K_ESCAPE:
-                            # ESC closes menu from MAIN
-                            menu_active = False
-
-                    elif menu_mode == "INVENTORY":
-                        # Build a list of items that actually exist (qty > 0)
-                        items = [(k, v) for k, v in inv.inventory.items() if v > 0]
-
-                        if event.key == pygame.K_ESCAPE:
-                            # back to main menu
-                            menu_mode = "MAIN"
-                            menu_index = 0
-
-                        elif items:
-                            if event.key == pygame.K_UP:
-                                inv_cursor = (inv_cursor - 1) % len(items)
-                            elif event.key == pygame.K_DOWN:
-                                inv_cursor = (inv_cursor + 1) % len(items)
-
-                            # For now, inventory in overworld is VIEW ONLY
-                            # Later we can add "use potion outside battle".
-                            elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
-                                pass
+def handle_global_keys(event):
+    """Keys that work in any scene unless a modal overlay is open."""
+    global world_menu_open, menu_active, world_menu_tab_index, world_menu_cursor
+    global inv_scroll
 
-                else:
-                    # ---- Normal overworld controls ----
-                    # (ESC for menu is handled above with world_menu_open)
-
-                    if event.key == pygame.K_b:
-                        launch_battle()
-
-                    # Scene-specific controls
-                    if current_scene == "TOWN":
-                        # Handle dialog advancement if active
-                        if dialog_active:
-                            if event.key in (
-                                pygame.K_RETURN,
-                                pygame.K_SPACE,
-                                pygame.K_z,
-                            ):
-                                dialog_index += 1
-                                if dialog_index >= len(dialog_lines):
-                                    # end dialog
-                                    dialog_active = False
-                                    dialog_lines = []
-                                    dialog_index = 0
-                        else:
-                            # Normal town controls
-                            if event.key == pygame.K_RETURN:
-                                # First try talking to NPCs
-                                try_talk_to_npc()
-
-                                # Then check for building entry
-                                if (
-                                    not dialog_active
-                                ):  # only if we didn't start a dialog
-                                    # Check if building has unified interior
-                                    door = None
-                                    for d in DOORS_TOWN:
-                                        if d.get("name") == active_building:
-                                            door = d
-                                            break
-
-                                    if door and "interior" in door:
-                                        # Use unified interior system
-                                        load_interior(door["interior"])
-                                        current_scene = door["target_scene"]
-                                    elif active_building == "Town Gate":
-                                        # Enter world tile system
-                                        current_scene = "WORLD"
-                                        player_x = WIDTH // 2
-                                        player_y = HEIGHT - 40
-                                        load_world_tile(current_tile)
-                                        debug_message = "Entered overworld"
-
-                    # ============================================================================
-                    # UNIFIED INTERIOR INPUT HANDLING
-                    # ============================================================================
-                    elif CURRENT_INTERIOR:
-                        data = gd.INTERIORS.get(CURRENT_INTERIOR, {})
-
-                        # Shop navigation and purchase
-                        if CURRENT_INTERIOR in (
-                            "ITEM_SHOP",
-                            "WEAPON_SHOP",
-                            "ARMOR_SHOP",
-                        ):
-                            if event.key == pygame.K_UP:
-                                shop_selection = (shop_selection - 1) % len(
-                                    data["inventory"]
-                                )
-                            elif event.key == pygame.K_DOWN:
-                                shop_selection = (shop_selection + 1) % len(
-                                    data["inventory"]
-                                )
-                            elif event.key == pygame.K_RETURN:
-                                item_id = data["inventory"][shop_selection]
-                                price = data["buy_prices"][item_id]
-                                attempt_purchase(item_id, price)
-                            elif event.key == pygame.K_ESCAPE:
-                                leave_interior()
-
-                        # Inn rest
-                        elif CURRENT_INTERIOR == "INN":
-                            if event.key == pygame.K_RETURN:
-                                attempt_inn_rest()
-                            elif event.key == pygame.K_ESCAPE:
-                                leave_interior()
-
-                    elif current_scene == "ITEM_SHOP":
-                        # ---- ITEM SHOP INPUT ----
-                        if shop_ui_open:
-                            # Shop menu is open
-                            if event.key == pygame.K_UP:
-                                shop_menu_index = (shop_menu_index - 1) % len(
-                                    SHOP_STOCK
-                                )
-                            elif event.key == pygame.K_DOWN:
-                                shop_menu_index = (shop_menu_index + 1) % len(
-                                    SHOP_STOCK
-                                )
-                            elif event.key in (pygame.K_ESCAPE, pygame.K_BACKSPACE):
-                                shop_ui_open = False
-                            elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
-                                # Attempt to buy selected item
-                                item = SHOP_STOCK[shop_menu_index]
-                                price = item["price"]
-                                item_id = item["id"]
-
-                                if inv.player_gold >= price:
-                                    inv.player_gold -= price
-                                    inv.inventory[item_id] = (
-                                        inv.inventory.get(item_id, 0) + 1
-                                    )
-                                    print(
-                                        f"Bought {item['name']}! Now have {inv.inventory[item_id]}"
-                                    )
-                                else:
-                                    print("Not enough gold.")
-                        else:
-                            # No menu open: walk around / talk / leave
-                            if event.key == pygame.K_ESCAPE:
-                                # leave via Esc from anywhere
-                                exit_building()
-                            elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
-                                # check door / shopkeeper
-                                player_rect = pygame.Rect(
-                                    0, 0, PLAYER_SIZE, PLAYER_SIZE
-                                )
-                                player_rect.center = (int(player_x), int(player_y))
-
-                                # Leave via door
-                                door_rect = getattr(
-                                    draw_item_shop_interior, "itemshop_door_rect", None
-                                )
-                                if door_rect and player_rect.colliderect(door_rect):
-                                    exit_building()
-                                else:
-                                    # Talk to shopkeeper to open menu
-                                    keeper_rect = getattr(
-                                        draw_item_shop_interior, "shopkeeper_rect", None
-                                    )
-                                    if keeper_rect and player_rect.colliderect(
-                                        keeper_rect.inflate(40, 40)
-                                    ):
-                                        shop_ui_open = True
-                                        shop_menu_index = 0
-
-                    elif current_scene == "WEAPON_SHOP":
-                        # ---- WEAPON SHOP INPUT ----
-                        if weapon_shop_open:
-                            # --- MENU OPEN: use dedicated input handler ---
-                            handle_weapon_shop_input(event)
-                        else:
-                            # --- MENU CLOSED: walking / interacting / leaving ---
-                            if event.key == pygame.K_ESCAPE:
-                                # leave via Esc from anywhere
-                                exit_building()
-                            elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
-                                # check door / shopkeeper
-                                player_rect = pygame.Rect(
-                                    0, 0, PLAYER_SIZE, PLAYER_SIZE
-                                )
-                                player_rect.center = (int(player_x), int(player_y))
-                                if weaponshop_door_rect and player_rect.colliderect(
-                                    weaponshop_door_rect
-                                ):
-                                    exit_building()
-                                elif weaponshop_keeper_rect and player_rect.colliderect(
-                                    weaponshop_keeper_rect.inflate(40, 40)
-                                ):
-                                    # Standing near the counter → open shop UI
-                                    weapon_shop_open = True
-                                    menu_active = True
-                                    weapon_shop_cursor = 0
-
-                    elif current_scene == "INN":
-                        # ---- INN INPUT ----
-                        # New inn UI system
-                        if inn_ui_open:
-                            if event.key == pygame.K_ESCAPE:
-                                # Close inn UI
-                                inn_ui_open = False
-                                inn_message = ""
-                                inn_message_timer = 0
-
-                            elif event.key in (pygame.K_UP, pygame.K_DOWN):
-                                # Toggle Yes/No
-                                inn_menu_index = 1 - inn_menu_index
-
-                            elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
-                                if inn_menu_index == 0:
-                                    # YES
-                                    stay_at_inn()
-                                else:
-                                    # NO
-                                    inn_ui_open = False
-                                    inn_message = ""
-                                    inn_message_timer = 0
-
-                        # Legacy dialog system (keeping for backwards compatibility)
-                        elif inn_dialog_state == 1:
-                            # Yes / No selection
-                            if event.key in (
-                                pygame.K_LEFT,
-                                pygame.K_RIGHT,
-                                pygame.K_UP,
-                                pygame.K_DOWN,
-                            ):
-                                inn_cursor_index = (
-                                    1 - inn_cursor_index
-                                )  # toggle 0 <-> 1
-                            elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
-                                if inn_cursor_index == 0:  # Yes
-                                    if inv.player_gold >= INN_PRICE:
-                                        inv.player_gold -= INN_PRICE
-                                        msg = "You stay the night. You feel rested."
-                                        # later: actually heal party HP/MP here
-                                    else:
-                                        msg = "Not enough gold..."
-                                    inn_dialog_state = 2
-                                    draw_inn_interior.last_message = msg
-                                else:
-                                    # No – close dialog
-                                    inn_dialog_state = 0
-                            elif event.key == pygame.K_ESCAPE:
-                                inn_dialog_state = 0
-
-                        elif inn_dialog_state == 2:
-                            # Result message; any key closes
-                            if event.key in (
-                                pygame.K_RETURN,
-                                pygame.K_SPACE,
-                                pygame.K_ESCAPE,
-                            ):
-                                inn_dialog_state = 0
-
-                        else:
-                            # No dialog: walk around / leave / talk to innkeeper
-                            if event.key == pygame.K_ESCAPE:
-                                # leave via Esc from anywhere
-                                exit_building()
-                            elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
-                                # check door / innkeeper
-                                player_rect = pygame.Rect(
-                                    0, 0, PLAYER_SIZE, PLAYER_SIZE
-                                )
-                                player_rect.center = (int(player_x), int(player_y))
-
-                                # Leave if at door
-                                door_rect = getattr(
-                                    draw_inn_interior, "door_rect", None
-                                )
-                                if door_rect and player_rect.colliderect(door_rect):
-                                    exit_building()
-                                else:
-                                    # Start dialog if facing innkeeper
-                                    keeper_rect = getattr(
-                                        draw_inn_interior, "keeper_rect", None
-                                    )
-                                    if keeper_rect and player_rect.colliderect(
-                                        keeper_rect.inflate(40, 40)
-                                    ):
-                                        open_inn_ui()
-
-                    # ============================================================================
-                    # EQUIPMENT MENU INPUT HANDLING
-                    # ============================================================================
-                    elif current_scene == SCENE_EQUIPMENT:
-                        if event.key == pygame.K_UP:
-                            equip_index = (equip_index - 1) % len(party_list)
-                        elif event.key == pygame.K_DOWN:
-                            equip_index = (equip_index + 1) % len(party_list)
-                        elif event.key == pygame.K_RETURN:
-                            current_scene = SCENE_EQUIP_MEMBER
-                            equip_slot_index = 0
-                            equip_current_member = party_list[equip_index]
-                        elif event.key == pygame.K_ESCAPE:
-                            menu_active = False
-                            current_scene = "TOWN"
-
-                    elif current_scene == SCENE_EQUIP_MEMBER:
-                        member = party_list[equip_index]
-
-                        if event.key == pygame.K_UP:
-                            equip_slot_index = (equip_slot_index - 1) % 2
-                        elif event.key == pygame.K_DOWN:
-                            equip_slot_index = (equip_slot_index + 1) % 2
-                        elif event.key == pygame.K_RETURN:
-                            slot = "weapon" if equip_slot_index == 0 else "armor"
-                            equip_current_slot = slot
-                            equip_select_index = 0
-                            current_scene = SCENE_EQUIP_SELECT
-                        elif event.key == pygame.K_ESCAPE:
-                            current_scene = SCENE_EQUIPMENT
-
-                    elif current_scene == SCENE_EQUIP_SELECT:
-                        member = party_list[equip_index]
-                        slot = equip_current_slot
-                        equippable = get_equippable_items(member, slot)
-
-                        if not equippable:
-                            if event.key == pygame.K_ESCAPE:
-                                current_scene = SCENE_EQUIP_MEMBER
-                        else:
-                            if event.key == pygame.K_UP:
-                                equip_select_index = (equip_select_index - 1) % len(
-                                    equippable
-                                )
-                            elif event.key == pygame.K_DOWN:
-                                equip_select_index = (equip_select_index + 1) % len(
-                                    equippable
-                                )
-                            elif event.key == pygame.K_RETURN:
-                                item_name, item_data = equippable[equip_select_index]
-
-                                # Equip the item using the new system
-                                if hasattr(member, "equip_weapon") and slot == "weapon":
-                                    member.equip_weapon(item_name, item_data)
-                                elif hasattr(member, "equip_armor") and slot == "armor":
-                                    member.equip_armor(item_name, item_data)
-                                else:
-                                    # Fallback for dict-based party
-                                    if isinstance(member, dict):
-                                        member[f"equipped_{slot}"] = item_name
-                                        if slot == "weapon":
-                                            member["attack"] = member.get(
-                                                "base_attack", member.get("attack", 0)
-                                            ) + item_data.get("attack", 0)
-                                        elif slot == "armor":
-                                            member["defense"] = member.get(
-                                                "base_defense", member.get("defense", 0)
-                                            ) + item_data.get("defense", 0)
-
-                                # Return to member equipment screen
-                                current_scene = SCENE_EQUIP_MEMBER
-
-                            elif event.key == pygame.K_ESCAPE:
-                                current_scene = SCENE_EQUIP_MEMBER
-
-                    # -------------------------------------------------
-                    # WORLD scene - handle town entry
-                    # -------------------------------------------------
-                    elif current_scene == "WORLD" and not world_menu_open:
-                        if event.key == pygame.K_RETURN:
-                            # Check if on TOWN_CENTER tile
-                            if current_tile == "TOWN_CENTER":
-                                current_scene = "TOWN"
-                                player_x = WIDTH // 2
-                                player_y = HEIGHT // 2
-                                debug_message = "Entered town"
-
-        # Movement only when not in menu/dialog and not in interior (CURRENT_INTERIOR handles all shops/inns)
-        can_move = (
-            not world_menu_open
-            and not dialog_active
-            and CURRENT_INTERIOR is None
+    # Nothing below the modal overlays handles anything but key presses
+    if event.type != pygame.KEYDOWN:
+        return True
+
+    if event.key == pygame.K_ESCAPE:
+        # Shop/inn UIs and interiors use ESC to close / leave themselves
+        block_toggle = (
+            (current_scene == "ITEM_SHOP" and shop_ui_open)
+            or (current_scene == "INN" and inn_ui_open)
+            or CURRENT_INTERIOR is not None
         )
+        if not block_toggle:
+            # Open the world menu (its overlay handles ESC while open)
+            world_menu_open = True
+            menu_active = True
+            world_menu_tab_index = 0
+            world_menu_cursor = 0
+            inv_scroll = 0
+            return True
+
+    if event.key == pygame.K_b:
+        launch_battle()
+    return False
 
-        if movement_debug_enabled:
-            keys = pygame.key.get_pressed()
-            if (
-                keys[pygame.K_LEFT]
-                or keys[pygame.K_a]
-                or keys[pygame.K_RIGHT]
-                or keys[pygame.K_d]
-                or keys[pygame.K_UP]
-                or keys[pygame.K_w]
-                or keys[pygame.K_DOWN]
-                or keys[pygame.K_s]
-            ):
-                if not can_move:
-                    print(
-                        "BLOCKED → world_menu_open:",
-                        world_menu_open,
-                        "dialog_active:",
-                        dialog_active,
-                        "CURRENT_INTERIOR:",
-                        CURRENT_INTERIOR,
-                    )
 
-        if can_move:
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-                dx -= player_speed
-            if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-                dx += player_speed
-            if keys[pygame.K_UP] or keys[pygame.K_w]:
-                dy -= player_speed
-            if keys[pygame.K_DOWN] or keys[pygame.K_s]:
-                dy += player_speed
-
-            if dx or dy:
-                debug_message = ""
-
-            move_player(dx, dy)
-
-            # Handle transitions between areas
-            if current_scene == "TOWN":
-                player_rect = pygame.Rect(0, 0, PLAYER_SIZE, PLAYER_SIZE)
-                player_rect.center = (int(player_x), int(player_y))
-                handle_area_transition(player_rect)
-
-            # Handle world tile transitions
-            elif current_scene == "WORLD":
-                handle_world_tile_transitions()
-
-        # ----- DRAW -----
-        # Unified interior drawing takes precedence
-        if CURRENT_INTERIOR:
-            draw_interior_ui()
-        elif current_scene == "TOWN":
-            player_rect = pygame.Rect(0, 0, PLAYER_SIZE, PLAYER_SIZE)
-            player_rect.center = (int(player_x), int(player_y))
-            draw_current_area(SCREEN, player_rect)
-            if menu_active:
-                draw_overworld_menu(SCREEN)
-            draw_dialog_box(SCREEN)
-        elif current_scene == "WORLD":
-            draw_world_tile()
-        elif current_scene == "INN":
-            draw_inn_interior(SCREEN, FONT)
-            if inn_ui_open:
-                draw_inn_ui(SCREEN)
-            if inn_message_timer > 0 and inn_message:
-                draw_inn_message(SCREEN)
-        elif current_scene == "ITEM_SHOP":
-            player_rect = pygame.Rect(0, 0, PLAYER_SIZE, PLAYER_SIZE)
-            player_rect.center = (int(player_x), int(player_y))
-            draw_item_shop_interior(SCREEN, FONT, player_rect)
-        elif current_scene == "WEAPON_SHOP":
-            player_rect = pygame.Rect(0, 0, PLAYER_SIZE, PLAYER_SIZE)
-            player_rect.center = (int(player_x), int(player_y))
-            draw_weapon_shop_interior(SCREEN, FONT, player_rect)
-            if weapon_shop_open:
-                draw_weapon_shop_ui(SCREEN)
-
-        # ============================================================================
-        # EQUIPMENT MENU DRAWING
-        # ============================================================================
-        elif current_scene == SCENE_EQUIPMENT:
-            draw_equipment_menu()
-        elif current_scene == SCENE_EQUIP_MEMBER:
-            member = party_list[equip_index]
-            draw_equip_member(member)
-        elif current_scene == SCENE_EQUIP_SELECT:
-            member = party_list[equip_index]
-            slot = equip_current_slot
-            equippable = get_equippable_items(member, slot)
-            draw_equip_select(member, slot, equippable, equip_select_index)
+# --- Overlays ---
 
+
+def handle_world_menu_event(event):
+    global world_menu_open, menu_active, world_menu_tab_index, world_menu_cursor
+
+    if event.type != pygame.KEYDOWN:
+        return
+
+    if event.key == pygame.K_ESCAPE:
+        world_menu_open = False
+        menu_active = False
+    elif event.key == pygame.K_LEFT:
+        world_menu_tab_index = (world_menu_tab_index - 1) % len(world_menu_tabs)
+        world_menu_cursor = 0
+    elif event.key == pygame.K_RIGHT:
+        world_menu_tab_index = (world_menu_tab_index + 1) % len(world_menu_tabs)
+        world_menu_cursor = 0
+    elif event.key == pygame.K_UP:
+        # navigate within the active tab
+        if world_menu_tabs[world_menu_tab_index] == "Inventory":
+            world_menu_cursor = max(0, world_menu_cursor - 1)
+    elif event.key == pygame.K_DOWN:
+        if world_menu_tabs[world_menu_tab_index] == "Inventory":
+            world_menu_cursor += 1  # clamp in draw code
+    elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
+        # System tab => quit
+        if world_menu_tabs[world_menu_tab_index] == "System":
+            SCENES.quit()
+
+
+def handle_pause_menu_event(event):
+    """Old Resume / Inventory / Quit menu (menu_active without the world menu)."""
+    global menu_active, menu_mode, menu_index, inv_cursor
+
+    if event.type != pygame.KEYDOWN:
+        return
+
+    if menu_mode == "MAIN":
+        main_options = ["Resume", "Inventory", "Quit"]
+
+        if event.key == pygame.K_UP:
+            menu_index = (menu_index - 1) % len(main_options)
+        elif event.key == pygame.K_DOWN:
+            menu_index = (menu_index + 1) % len(main_options)
+        elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
+            choice = main_options[menu_index]
+            if choice == "Resume":
+                menu_active = False
+            elif choice == "Inventory":
+                menu_mode = "INVENTORY"
+                inv_cursor = 0
+            elif choice == "Quit":
+                SCENES.quit()
+        elif event.key == pygame.K_ESCAPE:
+            # ESC closes menu from MAIN
+            menu_active = False
+
+    elif menu_mode == "INVENTORY":
+        # Build a list of items that actually exist (qty > 0)
+        items = get_inventory_items_as_list()
+
+        if event.key == pygame.K_ESCAPE:
+            # back to main menu
+            menu_mode = "MAIN"
+            menu_index = 0
+
+        elif items:
+            # For now, inventory in overworld is VIEW ONLY
+            # Later we can add "use potion outside battle".
+            if event.key == pygame.K_UP:
+                inv_cursor = (inv_cursor - 1) % len(items)
+            elif event.key == pygame.K_DOWN:
+                inv_cursor = (inv_cursor + 1) % len(items)
+
+
+def handle_dialog_event(event):
+    """Advance the NPC dialog."""
+    global dialog_active, dialog_lines, dialog_index
+
+    if event.key in (pygame.K_RETURN, pygame.K_SPACE, pygame.K_z):
+        dialog_index += 1
+        if dialog_index >= len(dialog_lines):
+            # end dialog
+            dialog_active = False
+            dialog_lines = []
+            dialog_index = 0
+
+
+def handle_interior_event(event):
+    """Unified interior input: shop navigation / purchase, inn rest."""
+    global shop_selection
+
+    data = gd.INTERIORS.get(CURRENT_INTERIOR, {})
+
+    # Shop navigation and purchase
+    if CURRENT_INTERIOR in ("ITEM_SHOP", "WEAPON_SHOP", "ARMOR_SHOP"):
+        if event.key == pygame.K_UP:
+            shop_selection = (shop_selection - 1) % len(data["inventory"])
+        elif event.key == pygame.K_DOWN:
+            shop_selection = (shop_selection + 1) % len(data["inventory"])
+        elif event.key == pygame.K_RETURN:
+            item_id = data["inventory"][shop_selection]
+            price = data["buy_prices"][item_id]
+            attempt_purchase(item_id, price)
+        elif event.key == pygame.K_ESCAPE:
+            leave_interior()
+
+    # Inn rest
+    elif CURRENT_INTERIOR == "INN":
+        if event.key == pygame.K_RETURN:
+            attempt_inn_rest()
+        elif event.key == pygame.K_ESCAPE:
+            leave_interior()
+
+
+def draw_interior_overlay(surface):
+    draw_interior_ui()
+
+
+def draw_world_menu_overlay(surface):
+    draw_world_menu(surface)
+
+
+# --- Movement (shared by the walkable scenes) ---
+
+
+def update_player_movement():
+    """
+    Arrow / WASD movement unless an overlay or transition blocks it.
+    Returns whether the player could move this frame.
+    """
+    global debug_message
+
+    can_move = not SCENES.movement_blocked() and not screen_transition.active
+    keys = pygame.key.get_pressed()
+
+    if not can_move:
+        if movement_debug_enabled and (
+            keys[pygame.K_LEFT]
+            or keys[pygame.K_a]
+            or keys[pygame.K_RIGHT]
+            or keys[pygame.K_d]
+            or keys[pygame.K_UP]
+            or keys[pygame.K_w]
+            or keys[pygame.K_DOWN]
+            or keys[pygame.K_s]
+        ):
+            print(
+                "BLOCKED → world_menu_open:",
+                world_menu_open,
+                "dialog_active:",
+                dialog_active,
+                "CURRENT_INTERIOR:",
+                CURRENT_INTERIOR,
+            )
+        return False
+
+    dx = dy = 0
+    if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+        dx -= player_speed
+    if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+        dx += player_speed
+    if keys[pygame.K_UP] or keys[pygame.K_w]:
+        dy -= player_speed
+    if keys[pygame.K_DOWN] or keys[pygame.K_s]:
+        dy += player_speed
+
+    if dx or dy:
+        debug_message = ""
+
+    move_player(dx, dy)
+    return True
+
+
+# --- WORLD ---
+
+
+def handle_world_event(event):
+    global current_scene, player_x, player_y, debug_message
+
+    if event.key == pygame.K_RETURN:
+        # Check if on TOWN_CENTER tile
+        if current_tile == "TOWN_CENTER":
+            current_scene = "TOWN"
+            player_x = WIDTH // 2
+            player_y = HEIGHT // 2
+            debug_message = "Entered town"
+
+
+def update_world():
+    if update_player_movement():
+        handle_world_tile_transitions()
+    world_tiles.step()  # build neighboring tiles a slice at a time
+
+
+def draw_world(surface):
+    draw_world_tile()
+
+
+# --- TOWN ---
+
+
+def handle_town_event(event):
+    global current_scene, player_x, player_y, debug_message
+
+    if event.key != pygame.K_RETURN:
+        return
+
+    # First try talking to NPCs
+    try_talk_to_npc()
+    if dialog_active:
+        return  # only enter buildings if we didn't start a dialog
+
+    # Check if building has unified interior
+    door = None
+    for d in DOORS_TOWN:
+        if d.get("name") == active_building:
+            door = d
+            break
+
+    if door and "interior" in door:
+        # Use unified interior system
+        load_interior(door["interior"])
+        current_scene = door["target_scene"]
+    elif active_building == "Town Gate":
+        # Enter world tile system
+        current_scene = "WORLD"
+        player_x = WIDTH // 2
+        player_y = HEIGHT - 40
+        load_world_tile(current_tile)
+        debug_message = "Entered overworld"
+
+
+def update_town():
+    if update_player_movement():
+        # Handle transitions between areas
+        handle_area_transition(player_screen_rect())
+
+
+def draw_town_scene(surface):
+    draw_current_area(surface, player_screen_rect())
+    if menu_active:
+        draw_overworld_menu(surface)
+    draw_dialog_box(surface)
+
+
+# --- ITEM_SHOP ---
+
+
+def handle_item_shop_event(event):
+    global shop_ui_open, shop_menu_index
+
+    if shop_ui_open:
+        # Shop menu is open
+        if event.key == pygame.K_UP:
+            shop_menu_index = (shop_menu_index - 1) % len(SHOP_STOCK)
+        elif event.key == pygame.K_DOWN:
+            shop_menu_index = (shop_menu_index + 1) % len(SHOP_STOCK)
+        elif event.key in (pygame.K_ESCAPE, pygame.K_BACKSPACE):
+            shop_ui_open = False
+        elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
+            # Attempt to buy selected item
+            item_id = SHOP_STOCK[shop_menu_index]
+            item = item_catalog.get(item_id)
+            price = item["price"]
+
+            if inv.player_gold >= price:
+                inv.player_gold -= price
+                inv.inventory[item_id] = inv.inventory.get(item_id, 0) + 1
+                print(f"Bought {item['name']}! Now have {inv.inventory[item_id]}")
+            else:
+                print("Not enough gold.")
+
+    elif event.key == pygame.K_ESCAPE:
+        # No menu open: leave via Esc from anywhere
+        exit_building()
+    elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
+        # check door / shopkeeper
+        player_rect = player_screen_rect()
+
+        # Leave via door
+        door_rect = getattr(draw_item_shop_interior, "itemshop_door_rect", None)
+        if door_rect and player_rect.colliderect(door_rect):
+            exit_building()
         else:
-            # Fallback for TITLE or unknown scenes
-            draw_town()
+            # Talk to shopkeeper to open menu
+            keeper_rect = getattr(draw_item_shop_interior, "shopkeeper_rect", None)
+            if keeper_rect and player_rect.colliderect(keeper_rect.inflate(40, 40)):
+                shop_ui_open = True
+                shop_menu_index = 0
+
+
+def draw_item_shop_scene(surface):
+    draw_item_shop_interior(surface, FONT, player_screen_rect())
+
+
+# --- WEAPON_SHOP ---
+
+
+def handle_weapon_shop_event(event):
+    """Walking / interacting / leaving; the open shop menu is an overlay."""
+    global weapon_shop_open, menu_active, weapon_shop_cursor
+
+    if event.key == pygame.K_ESCAPE:
+        # leave via Esc from anywhere
+        exit_building()
+    elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
+        # check door / shopkeeper
+        player_rect = player_screen_rect()
+        if weaponshop_door_rect and player_rect.colliderect(weaponshop_door_rect):
+            exit_building()
+        elif weaponshop_keeper_rect and player_rect.colliderect(
+            weaponshop_keeper_rect.inflate(40, 40)
+        ):
+            # Standing near the counter → open shop UI
+            weapon_shop_open = True
+            menu_active = True
+            weapon_shop_cursor = 0
+
 
-        # Update inn message timer
-        if inn_message_timer > 0:
-            inn_message_timer -= 1
-            if inn_message_timer == 0:
+def draw_weapon_shop_scene(surface):
+    draw_weapon_shop_interior(surface, FONT, player_screen_rect())
+    if weapon_shop_open:
+        draw_weapon_shop_ui(surface)
+
+
+# --- INN ---
+
+
+def handle_inn_event(event):
+    global inn_ui_open, inn_menu_index, inn_message, inn_message_timer
+    global inn_dialog_state, inn_cursor_index
+
+    # New inn UI system
+    if inn_ui_open:
+        if event.key == pygame.K_ESCAPE:
+            # Close inn UI
+            inn_ui_open = False
+            inn_message = ""
+            inn_message_timer = 0
+
+        elif event.key in (pygame.K_UP, pygame.K_DOWN):
+            # Toggle Yes/No
+            inn_menu_index = 1 - inn_menu_index
+
+        elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
+            if inn_menu_index == 0:
+                # YES
+                stay_at_inn()
+            else:
+                # NO
+                inn_ui_open = False
                 inn_message = ""
+                inn_message_timer = 0
+
+    # Legacy dialog system (keeping for backwards compatibility)
+    elif inn_dialog_state == 1:
+        # Yes / No selection
+        if event.key in (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN):
+            inn_cursor_index = 1 - inn_cursor_index  # toggle 0 <-> 1
+        elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
+            if inn_cursor_index == 0:  # Yes
+                if inv.player_gold >= INN_PRICE:
+                    inv.player_gold -= INN_PRICE
+                    msg = "You stay the night. You feel rested."
+                    # later: actually heal party HP/MP here
+                else:
+                    msg = "Not enough gold..."
+                inn_dialog_state = 2
+                draw_inn_interior.last_message = msg
+            else:
+                # No – close dialog
+                inn_dialog_state = 0
+        elif event.key == pygame.K_ESCAPE:
+            inn_dialog_state = 0
+
+    elif inn_dialog_state == 2:
+        # Result message; any key closes
+        if event.key in (pygame.K_RETURN, pygame.K_SPACE, pygame.K_ESCAPE):
+            inn_dialog_state = 0
+
+    # No dialog: walk around / leave / talk to innkeeper
+    elif event.key == pygame.K_ESCAPE:
+        # leave via Esc from anywhere
+        exit_building()
+    elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
+        # check door / innkeeper
+        player_rect = player_screen_rect()
+
+        # Leave if at door
+        door_rect = getattr(draw_inn_interior, "door_rect", None)
+        if door_rect and player_rect.colliderect(door_rect):
+            exit_building()
+        else:
+            # Start dialog if facing innkeeper
+            keeper_rect = getattr(draw_inn_interior, "keeper_rect", None)
+            if keeper_rect and player_rect.colliderect(keeper_rect.inflate(40, 40)):
+                open_inn_ui()
+
+
+def draw_inn_scene(surface):
+    draw_inn_interior(surface, FONT)
+    if inn_ui_open:
+        draw_inn_ui(surface)
+    if inn_message_timer > 0 and inn_message:
+        draw_inn_message(surface)
+
+
+# --- Equipment menus ---
+
+
+def handle_equipment_event(event):
+    global equip_index, equip_slot_index, equip_current_member
+    global current_scene, menu_active
+
+    if event.key == pygame.K_UP:
+        equip_index = (equip_index - 1) % len(party_list)
+    elif event.key == pygame.K_DOWN:
+        equip_index = (equip_index + 1) % len(party_list)
+    elif event.key == pygame.K_RETURN:
+        current_scene = SCENE_EQUIP_MEMBER
+        equip_slot_index = 0
+        equip_current_member = party_list[equip_index]
+    elif event.key == pygame.K_ESCAPE:
+        menu_active = False
+        current_scene = "TOWN"
+
+
+def handle_equip_member_event(event):
+    global equip_slot_index, equip_current_slot, equip_select_index, current_scene
+
+    if event.key == pygame.K_UP:
+        equip_slot_index = (equip_slot_index - 1) % 2
+    elif event.key == pygame.K_DOWN:
+        equip_slot_index = (equip_slot_index + 1) % 2
+    elif event.key == pygame.K_RETURN:
+        equip_current_slot = "weapon" if equip_slot_index == 0 else "armor"
+        equip_select_index = 0
+        current_scene = SCENE_EQUIP_SELECT
+    elif event.key == pygame.K_ESCAPE:
+        current_scene = SCENE_EQUIPMENT
+
+
+def handle_equip_select_event(event):
+    global equip_select_index, current_scene
+
+    member = party_list[equip_index]
+    slot = equip_current_slot
+    equippable = get_equippable_items(member, slot)
+
+    if event.key == pygame.K_ESCAPE:
+        current_scene = SCENE_EQUIP_MEMBER
+    elif not equippable:
+        return
+    elif event.key == pygame.K_UP:
+        equip_select_index = (equip_select_index - 1) % len(equippable)
+    elif event.key == pygame.K_DOWN:
+        equip_select_index = (equip_select_index + 1) % len(equippable)
+    elif event.key == pygame.K_RETURN:
+        item_name, item_data = equippable[equip_select_index]
+
+        # Equip the item using the new system
+        if hasattr(member, "equip_weapon") and slot == "weapon":
+            member.equip_weapon(item_name, item_data)
+        elif hasattr(member, "equip_armor") and slot == "armor":
+            member.equip_armor(item_name, item_data)
+        elif isinstance(member, dict):
+            # Fallback for dict-based party
+            member[f"equipped_{slot}"] = item_name
+            if slot == "weapon":
+                member["attack"] = member.get(
+                    "base_attack", member.get("attack", 0)
+                ) + item_data.get("attack_bonus", 0)
+            elif slot == "armor":
+                member["defense"] = member.get(
+                    "base_defense", member.get("defense", 0)
+                ) + item_data.get("defense_bonus", 0)
+
+        # Return to member equipment screen
+        current_scene = SCENE_EQUIP_MEMBER
+
+
+def draw_equipment_scene(surface):
+    draw_equipment_menu()
+
+
+def draw_equip_member_scene(surface):
+    draw_equip_member(party_list[equip_index])
+
+
+def draw_equip_select_scene(surface):
+    member = party_list[equip_index]
+    slot = equip_current_slot
+    equippable = get_equippable_items(member, slot)
+    draw_equip_select(member, slot, equippable, equip_select_index)
+
+
+def draw_fallback_scene(surface):
+    # TITLE or unknown scenes
+    draw_town()
+
+
+# --- Registry ---
+
+SCENES = scenes.SceneManager()
+SCENES.global_keys = handle_global_keys
+
+SCENES.add_scene("WORLD", handle_world_event, update_world, draw_world)
+SCENES.add_scene("TOWN", handle_town_event, update_town, draw_town_scene)
+SCENES.add_scene(
+    "ITEM_SHOP", handle_item_shop_event, update_player_movement, draw_item_shop_scene
+)
+SCENES.add_scene(
+    "WEAPON_SHOP",
+    handle_weapon_shop_event,
+    update_player_movement,
+    draw_weapon_shop_scene,
+)
+SCENES.add_scene("INN", handle_inn_event, update_player_movement, draw_inn_scene)
+SCENES.add_scene(SCENE_EQUIPMENT, handle_equipment_event, draw=draw_equipment_scene)
+SCENES.add_scene(
+    SCENE_EQUIP_MEMBER, handle_equip_member_event, draw=draw_equip_member_scene
+)
+SCENES.add_scene(
+    SCENE_EQUIP_SELECT, handle_equip_select_event, draw=draw_equip_select_scene
+)
+SCENES.fallback = scenes.Scene("TITLE", draw=draw_fallback_scene)
+
+# Overlays, lowest first (overlays that open on the same frame stack in
+# this order). Modal ones take every event; the others sit under the
+# global keys (ESC, B).
+SCENES.add_overlay(
+    "PAUSE_MENU",
+    lambda: menu_active and not world_menu_open and not weapon_shop_open,
+    handle_event=handle_pause_menu_event,
+)
+SCENES.add_overlay(
+    "WEAPON_SHOP_MENU",
+    lambda: current_scene == "WEAPON_SHOP" and weapon_shop_open,
+    handle_event=handle_weapon_shop_input,
+)
+SCENES.add_overlay(
+    "WORLD_MENU",
+    lambda: world_menu_open,
+    handle_event=handle_world_menu_event,
+    draw=draw_world_menu_overlay,
+)
+SCENES.add_overlay(
+    "DIALOG",
+    lambda: dialog_active,
+    handle_event=handle_dialog_event,
+    modal=False,
+)
+SCENES.add_overlay(
+    "INTERIOR",
+    lambda: CURRENT_INTERIOR is not None,
+    handle_event=handle_interior_event,
+    draw=draw_interior_overlay,
+    modal=False,
+    opaque=True,
+)
+
+
+def update_inn_message_timer():
+    global inn_message, inn_message_timer
+
+    if inn_message_timer > 0:
+        inn_message_timer -= 1
+        if inn_message_timer == 0:
+            inn_message = ""
+
+
+def main():
+    global current_scene
+
+    init_display()
+
+    # Initialize world tile system
+    load_world_tile(current_tile)
+
+    current_scene = "WORLD"  # Start in world tile system
+    while SCENES.running:
+        CLOCK.tick(60)
+
+        # One lookup per event: top overlay or the current scene's handler
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                SCENES.quit()
+            SCENES.handle_event(current_scene, event)
+
+        SCENES.update(current_scene)
+        SCENES.draw(current_scene, SCREEN)
+        update_inn_message_timer()
 
-        # Draw world menu overlay if open
-        if world_menu_open:
-            draw_world_menu(SCREEN)
+        screen_transition.update()
+        screen_transition.draw(SCREEN)
 
         pygame.display.flip()
 
@@ -0,0 +1,429 @@
+# world_tiles.py
+"""
+Overworld tile generation and cache.
+
+Every world tile is decorated from its own seed, derived from the session's
+master seed (rng_streams) and the tile id, so a tile looks the same each
+time the player comes back - trees and rocks no longer move between visits.
+
+Building a tile is split in two:
+
+    generate_layout(tile_id, size)  pure data: colors, texture dots and
+                                    object specs (no pygame, any thread)
+    render_tile(layout)             the background Surface and object list
+                                    (pygame, main thread)
+
+Rendered tiles live in a TileCache: an LRU with a byte budget, so
+revisiting a tile is a dictionary lookup. get_tile() does all of it.
+
+While the player walks a tile, prefetch_neighbors() queues the tiles next
+to it: their layouts are generated on a worker thread and step(), called
+once per frame, draws them on the main thread a couple of milliseconds at
+a time. By the time the player reaches an edge the next tile is usually
+already in the cache.
+"""
+
+import random
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+import game_data as gd
+import rng_streams
+from spatial_hash import SpatialHash
+
+# --- Tile styles ---
+# Background: base color plus `dots` texture circles of one color/radius.
+# objects: which object kind is scattered over the tile (None = nothing).
+TILE_STYLES = {
+    "town": {
+        "color": (180, 150, 100),  # dirt/town color
+        "dots": 50,
+        "dot_color": (170, 140, 90),
+        "dot_radius": 3,
+        "objects": None,
+    },
+    "town_edge": {
+        "color": (170, 130, 90),
+        "dots": 30,  # grass patches
+        "dot_color": (100, 140, 80),
+        "dot_radius": 8,
+        "objects": None,
+    },
+    "forest": {
+        "color": (40, 80, 40),  # dark green
+        "dots": 80,  # darker grass texture
+        "dot_color": (30, 70, 30),
+        "dot_radius": 4,
+        "objects": "tree",
+    },
+    "field": {
+        "color": (90, 180, 90),  # bright green
+        "dots": 60,  # lighter patches
+        "dot_color": (100, 200, 100),
+        "dot_radius": 6,
+        "objects": "boulder",
+    },
+    "mountain": {
+        "color": (100, 100, 120),  # gray rocky
+        "dots": 40,
+        "dot_color": (80, 80, 100),
+        "dot_radius": 5,
+        "objects": "rock",
+    },
+    "lake": {
+        "color": (60, 120, 180),  # blue water
+        "dots": 50,  # water ripples
+        "dot_color": (70, 130, 190),
+        "dot_radius": 7,
+        "objects": "reed",
+    },
+}
+
+# Fallback for unknown tile types
+BLANK_STYLE = {
+    "color": (0, 0, 0),
+    "dots": 0,
+    "dot_color": (0, 0, 0),
+    "dot_radius": 0,
+    "objects": None,
+}
+
+# count, edge margin, size range (None = fixed sprite), solid
+OBJECT_KINDS = {
+    "tree": {"count": 10, "margin": 80, "size": None, "solid": True},
+    "boulder": {"count": 8, "margin": 80, "size": (25, 40), "solid": True},
+    "rock": {"count": 12, "margin": 60, "size": (30, 50), "solid": True},
+    "reed": {"count": 15, "margin": 60, "size": None, "solid": False},
+}
+
+DEFAULT_BUDGET = 32 * 1024 * 1024  # bytes of background pixels
+
+
+def tile_seed(tile_id: str) -> int:
+    """This tile's decoration seed for the current master seed."""
+    master = rng_streams.default.master_seed
+    return rng_streams.derive_seed(master, "tile:" + tile_id)
+
+
+# --- Layout (pure data) ---
+
+
+class TileLayout:
+    """Everything needed to draw one tile, as plain data."""
+
+    __slots__ = ("tile_id", "seed", "size", "style", "dots", "objects")
+
+    def __init__(self, tile_id, seed, size, style, dots, objects):
+        self.tile_id = tile_id
+        self.seed = seed
+        self.size = size
+        self.style = style
+        self.dots = dots  # [(x, y), ...]
+        self.objects = objects  # [(kind, x, y, size), ...]
+
+
+def generate_layout(tile_id: str, size, seed=None) -> TileLayout:
+    """Decorate `tile_id` from its seed. No pygame calls, so any thread can run it."""
+    if seed is None:
+        seed = tile_seed(tile_id)
+    rng = random.Random(seed)
+    width, height = size
+
+    data = gd.WORLD_MAP.get(tile_id)
+    tile_type = data["tile_type"] if data else None
+    style = TILE_STYLES.get(tile_type, BLANK_STYLE)
+
+    dots = [
+        (rng.randint(0, width), rng.randint(0, height)) for _ in range(style["dots"])
+    ]
+
+    objects = []
+    kind = style["objects"]
+    if kind is not None:
+        spec = OBJECT_KINDS[kind]
+        margin = spec["margin"]
+        for _ in range(spec["count"]):
+            x = rng.randint(margin, width - margin)
+            y = rng.randint(margin, height - margin)
+            obj_size = rng.randint(*spec["size"]) if spec["size"] else 0
+            objects.append((kind, x, y, obj_size))
+
+    return TileLayout(tile_id, seed, size, style, dots, objects)
+
+
+# --- Rendering (main thread) ---
+
+# (kind, size) -> Surface; identical objects share one image
+_sprites = {}
+
+
+def _object_sprite(kind: str, size: int):
+    key = (kind, size)
+    surf = _sprites.get(key)
+    if surf is not None:
+        return surf
+
+    if kind == "tree":
+        surf = pygame.Surface((40, 60), pygame.SRCALPHA)
+        pygame.draw.rect(surf, (60, 40, 20), (15, 35, 10, 25))  # trunk
+        pygame.draw.circle(surf, (20, 80, 20), (20, 20), 20)  # leaves
+    elif kind == "boulder":
+        surf = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.circle(surf, (120, 120, 120), (size // 2, size // 2), size // 2)
+        pygame.draw.circle(
+            surf, (100, 100, 100), (size // 2 - 3, size // 2 - 3), size // 2 - 5
+        )
+    elif kind == "rock":
+        surf = pygame.Surface((size, size), pygame.SRCALPHA)
+        points = [(size // 2, 0), (size, size), (0, size)]
+        pygame.draw.polygon(surf, (80, 80, 100), points)
+    else:  # reed
+        surf = pygame.Surface((10, 30), pygame.SRCALPHA)
+        pygame.draw.line(surf, (40, 100, 60), (5, 30), (5, 0), 3)
+
+    _sprites[key] = surf
+    return surf
+
+
+class Tile:
+    """A rendered tile: background Surface, object dicts and their collision hash."""
+
+    __slots__ = ("tile_id", "seed", "background", "objects", "solids", "nbytes")
+
+    def __init__(self, tile_id, seed, background, objects):
+        self.tile_id = tile_id
+        self.seed = seed
+        self.background = background
+        # Same dict format world.py has always used; treat as read-only
+        self.objects = objects
+        # Solid objects bucketed by position; collision only checks nearby ones
+        self.solids = SpatialHash()
+        for obj in objects:
+            if obj["solid"]:
+                self.solids.insert(obj["rect"], obj)
+        self.nbytes = background.get_pitch() * background.get_height()
+
+
+def _draw_dots(surface, layout: TileLayout, start: int, stop: int):
+    style = layout.style
+    color = style["dot_color"]
+    radius = style["dot_radius"]
+    for pos in layout.dots[start:stop]:
+        pygame.draw.circle(surface, color, pos, radius)
+
+
+def _new_background(layout: TileLayout):
+    surface = pygame.Surface(layout.size)
+    surface.fill(layout.style["color"])
+    return surface
+
+
+def _finish_tile(layout: TileLayout, background) -> Tile:
+    if pygame.display.get_surface() is not None:
+        background = background.convert()
+    return Tile(layout.tile_id, layout.seed, background, render_objects(layout))
+
+
+def render_background(layout: TileLayout):
+    surface = _new_background(layout)
+    _draw_dots(surface, layout, 0, len(layout.dots))
+    return surface
+
+
+def render_objects(layout: TileLayout):
+    objects = []
+    for kind, x, y, size in layout.objects:
+        image = _object_sprite(kind, size)
+        solid = OBJECT_KINDS[kind]["solid"]
+        rect = pygame.Rect((x, y), image.get_size()) if solid else None
+        objects.append({"image": image, "pos": (x, y), "rect": rect, "solid": solid})
+    return objects
+
+
+def render_tile(layout: TileLayout) -> Tile:
+    return _finish_tile(layout, render_background(layout))
+
+
+# --- Cache ---
+
+
+class TileCache:
+    """LRU cache of rendered tiles, keyed by (tile_id, seed), with a byte budget."""
+
+    def __init__(self, budget: int = DEFAULT_BUDGET):
+        self.budget = budget
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._tiles = OrderedDict()
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def __contains__(self, key):
+        return key in self._tiles
+
+    def get(self, key):
+        tile = self._tiles.get(key)
+        if tile is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._tiles.move_to_end(key)
+        return tile
+
+    def put(self, key, tile: Tile):
+        old = self._tiles.pop(key, None)
+        if old is not None:
+            self.size -= old.nbytes
+        self._tiles[key] = tile
+        self.size += tile.nbytes
+        # Always keep the newest tile, even if it alone is over budget
+        while self.size > self.budget and len(self._tiles) > 1:
+            _, dropped = self._tiles.popitem(last=False)
+            self.size -= dropped.nbytes
+            self.evictions += 1
+
+    def clear(self):
+        self._tiles.clear()
+        self.size = 0
+
+    def stats(self) -> dict:
+        return {
+            "tiles": len(self._tiles),
+            "bytes": self.size,
+            "budget": self.budget,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+default_cache = TileCache()
+
+
+# --- Neighbor prefetch ---
+
+PREFETCH_SLICE_MS = 2.0  # main-thread drawing per step()
+DOTS_PER_CHECK = 8  # texture dots drawn between clock checks
+NEIGHBOR_KEYS = ("north", "south", "east", "west")
+
+
+class _PendingTile:
+    """A tile being prefetched: layout from the worker, then drawn in slices."""
+
+    __slots__ = ("future", "surface", "next_dot")
+
+    def __init__(self, future):
+        self.future = future
+        self.surface = None
+        self.next_dot = 0
+
+    def advance(self, deadline=None):
+        """Draw until `deadline` (perf_counter; None = to the end). Tile when done."""
+        layout = self.future.result()
+        if self.surface is None:
+            self.surface = _new_background(layout)
+
+        total = len(layout.dots)
+        while self.next_dot < total:
+            stop = min(total, self.next_dot + DOTS_PER_CHECK)
+            _draw_dots(self.surface, layout, self.next_dot, stop)
+            self.next_dot = stop
+            if deadline is not None and time.perf_counter() >= deadline:
+                return None
+        return _finish_tile(layout, self.surface)
+
+
+class TilePrefetcher:
+    """Builds tiles ahead of time into a TileCache."""
+
+    def __init__(self, cache: TileCache):
+        self.cache = cache
+        self._pending = OrderedDict()  # (tile_id, seed) -> _PendingTile
+        self._executor = None  # worker thread, started on first request
+
+    def __len__(self):
+        return len(self._pending)
+
+    def request(self, tile_id: str, size):
+        """Queue `tile_id` unless it is cached or already queued."""
+        seed = tile_seed(tile_id)
+        key = (tile_id, seed)
+        if key in self.cache or key in self._pending:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="tile-prefetch"
+            )
+        future = self._executor.submit(generate_layout, tile_id, size, seed)
+        self._pending[key] = _PendingTile(future)
+
+    def request_neighbors(self, tile_id: str, size):
+        data = gd.WORLD_MAP.get(tile_id)
+        if not data:
+            return
+        for direction in NEIGHBOR_KEYS:
+            neighbor = data.get(direction)
+            if neighbor:
+                self.request(neighbor, size)
+
+    def step(self, budget_ms: float = PREFETCH_SLICE_MS):
+        """Spend up to `budget_ms` drawing queued tiles whose layouts are ready."""
+        if not self._pending:
+            return
+        deadline = time.perf_counter() + budget_ms / 1000.0
+        for key, pending in list(self._pending.items()):
+            if not pending.future.done():
+                continue
+            tile = pending.advance(deadline)
+            if tile is None:
+                return  # out of time; carry on next frame
+            del self._pending[key]
+            self.cache.put(key, tile)
+            if time.perf_counter() >= deadline:
+                return
+
+    def finish(self, key):
+        """Complete a queued tile right now (None if it isn't queued)."""
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return None
+        tile = pending.advance()
+        self.cache.put(key, tile)
+        return tile
+
+    def cancel(self):
+        """Forget everything queued (e.g. after reseeding)."""
+        for pending in self._pending.values():
+            pending.future.cancel()
+        self._pending.clear()
+
+
+prefetcher = TilePrefetcher(default_cache)
+
+
+def get_tile(tile_id: str, size) -> Tile:
+    """The rendered tile: cached, finished from the prefetch queue, or built now."""
+    seed = tile_seed(tile_id)
+    key = (tile_id, seed)
+    tile = default_cache.get(key)
+    if tile is None:
+        tile = prefetcher.finish(key)
+    if tile is None:
+        tile = render_tile(generate_layout(tile_id, size, seed))
+        default_cache.put(key, tile)
+    return tile
+
+
+def prefetch_neighbors(tile_id: str, size):
+    """Queue the tiles next to `tile_id`; call step() every frame to build them."""
+    prefetcher.request_neighbors(tile_id, size)
+
+
+def step(budget_ms: float = PREFETCH_SLICE_MS):
+    prefetcher.step(budget_ms)